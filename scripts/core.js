@@ -1,6 +1,14 @@
 /**
  * Universal Auto-Player & Cookie Accepter
- * Version: 2.2 (Fix: Missing Helper & Error Handling)
+ * Version: 3.0 (Gemeinsame Bibliothek für alle Domains)
+ *
+ * Wird von website_visitor.py mit den Overrides aus scripts/<domain>/overrides.json
+ * (window.__wvDomainOverrides) zu einem Bundle zusammengesetzt, minifiziert und einmal
+ * pro Browser-Session registriert. automatePage(domain) nutzt die Overrides der Domain:
+ *   config            -> überschreibt Schlüssel aus DEFAULT_CONFIG (z.B. clickDelay)
+ *   cookie_selectors  -> werden vor COOKIE_SELECTORS geprüft
+ *   play_selectors    -> werden vor PLAY_SELECTORS geprüft
+ *   cookie_keywords   -> ergänzen COOKIE_KEYWORDS
  */
 
 (function() {
@@ -8,11 +16,12 @@
 
     // --- KONFIGURATION & SELEKTOREN ---
 
-    const CONFIG = {
+    const DEFAULT_CONFIG = {
         scanInterval: 2000,
         clickDelay: [3000, 6000],
         maxAttempts: 20,
-        debug: true
+        debug: true,
+        observerTimeout: 30000
     };
 
     const COOKIE_SELECTORS = [
@@ -61,7 +70,9 @@
         "i agree", "okay", "cookies zulassen", "verstanden"
     ];
 
-    // --- HELFER FUNKTIONEN (Hier fehlte sleepRandomly!) ---
+    // --- HELFER FUNKTIONEN ---
+
+    let CONFIG = DEFAULT_CONFIG;
 
     function updateStatus(msg) {
         if (CONFIG.debug) console.log(`[AutoBot] 🤖 ${msg}`);
@@ -77,7 +88,6 @@
                style.visibility !== 'hidden';
     }
 
-    // WICHTIG: Diese Funktion fehlte vorher!
     function sleepRandomly(min, max) {
         const ms = Math.floor(Math.random() * (max - min + 1) + min);
         return new Promise(resolve => setTimeout(resolve, ms));
@@ -85,10 +95,10 @@
 
     // --- LOGIK: COOKIES ---
 
-    async function handleCookies() {
+    async function handleCookies(domain) {
         updateStatus("Scanne nach Cookie-Bannern...");
 
-        for (let selector of COOKIE_SELECTORS) {
+        for (let selector of domain.cookieSelectors) {
             let btns = document.querySelectorAll(selector);
             for (let btn of btns) {
                  if (isVisible(btn)) {
@@ -102,7 +112,7 @@
         const buttons = document.querySelectorAll('button, a, div[role="button"], input[type="submit"]');
         for (let btn of buttons) {
             const text = btn.innerText.toLowerCase().trim();
-            if (COOKIE_KEYWORDS.some(keyword => text === keyword) && isVisible(btn)) {
+            if (domain.cookieKeywords.some(keyword => text === keyword) && isVisible(btn)) {
                 updateStatus(`Cookie-Button gefunden via Textanalyse: "${text}"`);
                 btn.click();
                 return true;
@@ -113,7 +123,7 @@
 
     // --- LOGIK: PLAYER ---
 
-    async function handlePlay() {
+    async function handlePlay(domain) {
         updateStatus("Suche nach Play-Button...");
 
         const mediaElements = document.querySelectorAll('video, audio');
@@ -124,7 +134,7 @@
             }
         }
 
-        for (let selector of PLAY_SELECTORS) {
+        for (let selector of domain.playSelectors) {
             let btns = document.querySelectorAll(selector);
             for (let btn of btns) {
                 if (isVisible(btn)) {
@@ -149,7 +159,19 @@
 
     // --- HAUPTSTEUERUNG ---
 
-    async function runOrchestrator() {
+    function domainSettings(name) {
+        const overrides = (window.__wvDomainOverrides || {})[name] || {};
+        return {
+            config: Object.assign({}, DEFAULT_CONFIG, overrides.config || {}),
+            cookieSelectors: (overrides.cookie_selectors || []).concat(COOKIE_SELECTORS),
+            playSelectors: (overrides.play_selectors || []).concat(PLAY_SELECTORS),
+            cookieKeywords: COOKIE_KEYWORDS.concat(overrides.cookie_keywords || [])
+        };
+    }
+
+    async function runOrchestrator(name) {
+        const domain = domainSettings(name || window.location.hostname);
+        CONFIG = domain.config;
         // Wir wrappen alles in einen Try/Catch Block, damit Fehler nicht zum Timeout führen
         return new Promise(async (resolve) => {
             try {
@@ -159,13 +181,13 @@
                 await sleepRandomly(CONFIG.clickDelay[0], CONFIG.clickDelay[1]);
 
                 // Schritt 2: Cookies
-                await handleCookies();
+                await handleCookies(domain);
 
                 // Schritt 3: Pause nach Cookie
                 await sleepRandomly(2000, 5000); // Zeit etwas reduziert für schnelleren Test
 
                 // Schritt 4: Play Versuch 1
-                let played = await handlePlay();
+                let played = await handlePlay(domain);
 
                 if (played) {
                     updateStatus("Erfolg: Play geklickt oder Musik läuft.");
@@ -183,7 +205,7 @@
                     // Wir prüfen nicht bei jeder Mutation sofort (Performance), sondern entkoppelt? 
                     // Nein, direkt prüfen ist okay, aber handlePlay ist async.
                     // Einfacher Check:
-                    const success = await handlePlay();
+                    const success = await handlePlay(domain);
                     if (success) {
                         updateStatus("Play-Button dynamisch gefunden!");
                         obs.disconnect();
@@ -194,7 +216,7 @@
 
                 observer.observe(document.body, { childList: true, subtree: true });
 
-                // Timeout für den Observer (Max 30s warten)
+                // Timeout für den Observer (CONFIG.observerTimeout, Standard 30s)
                 const timeoutId = setTimeout(() => {
                     timeoutTriggered = true;
                     observer.disconnect();
@@ -203,7 +225,7 @@
                     // Oder 'restart', wenn du willst, dass er die Seite neu lädt. 
                     // Hier: restart, da ohne Musik der Besuch sinnlos ist?
                     resolve('success'); 
-                }, 30000);
+                }, CONFIG.observerTimeout);
 
             } catch (error) {
                 console.error("[AutoBot] Kritischer Fehler:", error);
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+"""
+website_visitor.py liest seine Argumente beim Import; die Tests importieren es
+einmal mit einer leeren URL-Liste und einem Log im temporären Verzeichnis.
+"""
+
+import os
+import sys
+import types
+
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture(scope="session")
+def wv(tmp_path_factory):
+    tmp_dir = tmp_path_factory.mktemp("website_visitor")
+    url_list = tmp_dir / "urls.txt"
+    url_list.write_text("https://example.org/\n", encoding="utf-8")
+    argv = sys.argv
+    sys.argv = [
+        "website_visitor.py",
+        "--url_list", str(url_list),
+        "--script_folder", os.path.join(BASE_DIR, "scripts"),
+        "--log_file", str(tmp_dir / "website_visitor.log"),
+        "--quiet",
+    ]
+    sys.path.insert(0, BASE_DIR)
+    try:
+        import website_visitor
+    finally:
+        sys.argv = argv
+    return website_visitor
+
+class TabDriver:
+    """
+    Browser-Attrappe mit Tabs für TabSession. Nach crashed = True schlägt jede
+    Navigation fehl wie bei einem abgestürzten Chrome.
+    """
+    def __init__(self):
+        self.window_handles = ["tab-1"]
+        self.current_window_handle = "tab-1"
+        self.switch_to = types.SimpleNamespace(new_window=self._new_window, window=self._window)
+        self.crashed = False
+
+    def _new_window(self, kind):
+        self.current_window_handle = f"tab-{len(self.window_handles) + 1}"
+        self.window_handles.append(self.current_window_handle)
+
+    def _window(self, handle):
+        self.current_window_handle = handle
+
+    def get(self, url):
+        if self.crashed:
+            raise ConnectionError("chrome not reachable")
+
+    def close(self):
+        pass
+
+@pytest.fixture
+def tab_session(wv, monkeypatch):
+    """
+    Stellt --tabs 2 ohne Verweildauer und Playback-Proben ein.
+
+    Returns:
+      Die Klasse TabDriver.
+    """
+    monkeypatch.setattr(wv.args, "tabs", 2)
+    monkeypatch.setattr(wv.args, "sleep_seconds", 0)
+    monkeypatch.setattr(wv.args, "playback_probes", 0)
+    monkeypatch.setattr(wv.args, "retry_backoff", 0.0)
+    return TabDriver
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Gescripteter DevTools-Endpunkt für test_cdp_backend.py. Verhält sich wie ein startendes
+Chrome mit --remote-debugging-port=0: schreibt DevToolsActivePort ins Profil, nimmt
+aber erst nach FAKE_CHROME_STARTUP_DELAY Sekunden Verbindungen an. Jeder empfangene
+Befehl wird in <user-data-dir>/devtools_methods.txt protokolliert. Runtime.evaluate
+mit "crash" im Ausdruck beantwortet es nicht, sondern meldet Inspector.targetCrashed
+(wie Chrome nur nach Inspector.enable).
+"""
+
+import base64
+import hashlib
+import json
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+def recv_exact(conn, size):
+    data = b""
+    while len(data) < size:
+        chunk = conn.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("closed")
+        data += chunk
+    return data
+
+def read_message(conn):
+    first, second = recv_exact(conn, 2)
+    length = second & 0x7F
+    if length == 126:
+        length = struct.unpack(">H", recv_exact(conn, 2))[0]
+    elif length == 127:
+        length = struct.unpack(">Q", recv_exact(conn, 8))[0]
+    mask = recv_exact(conn, 4)
+    payload = bytes(byte ^ mask[index % 4] for index, byte in enumerate(recv_exact(conn, length)))
+    return first & 0x0F, payload
+
+def send_message(conn, message):
+    payload = json.dumps(message).encode("utf-8")
+    header = bytearray([0x81])
+    if len(payload) < 126:
+        header.append(len(payload))
+    elif len(payload) < 65536:
+        header.append(126)
+        header += struct.pack(">H", len(payload))
+    else:
+        header.append(127)
+        header += struct.pack(">Q", len(payload))
+    conn.sendall(bytes(header) + payload)
+
+def serve_websocket(conn, headers, log_path):
+    accept = base64.b64encode(hashlib.sha1((headers["sec-websocket-key"] + WEBSOCKET_GUID).encode("ascii")).digest())
+    conn.sendall(b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                 b"Sec-WebSocket-Accept: " + accept + b"\r\n\r\n")
+    inspector_enabled = False
+    while True:
+        opcode, payload = read_message(conn)
+        if opcode == 0x8:
+            return
+        command = json.loads(payload)
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write(command["method"] + "\n")
+        if command["method"] == "Inspector.enable":
+            inspector_enabled = True
+        if command["method"] == "Runtime.evaluate":
+            if "crash" in command["params"]["expression"]:
+                if inspector_enabled:
+                    send_message(conn, {"method": "Inspector.targetCrashed", "params": {}})
+                continue
+            send_message(conn, {"id": command["id"], "result": {"result": {"type": "number", "value": 1}}})
+            continue
+        send_message(conn, {"id": command["id"], "result": {}})
+
+def handle(conn, port, log_path):
+    try:
+        request = b""
+        while b"\r\n\r\n" not in request:
+            chunk = conn.recv(4096)
+            if not chunk:
+                return
+            request += chunk
+        lines = request.split(b"\r\n\r\n")[0].decode("latin-1").split("\r\n")
+        path = lines[0].split()[1]
+        headers = {key.strip().lower(): value.strip() for key, _, value in (line.partition(":") for line in lines[1:])}
+        if headers.get("upgrade", "").lower() == "websocket":
+            serve_websocket(conn, headers, log_path)
+        elif path == "/json/list":
+            body = json.dumps([{
+                "id": "page-1",
+                "type": "page",
+                "url": "about:blank",
+                "webSocketDebuggerUrl": f"ws://127.0.0.1:{port}/devtools/page/page-1",
+            }]).encode("utf-8")
+            conn.sendall(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                         b"Content-Length: " + str(len(body)).encode("ascii") + b"\r\nConnection: close\r\n\r\n" + body)
+    except (OSError, ValueError):
+        pass
+    finally:
+        conn.close()
+
+def main():
+    profile_dir = next(arg.split("=", 1)[1] for arg in sys.argv[1:] if arg.startswith("--user-data-dir="))
+    log_path = os.path.join(profile_dir, "devtools_methods.txt")
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    port = server.getsockname()[1]
+    with open(os.path.join(profile_dir, "DevToolsActivePort"), "w", encoding="utf-8") as f:
+        f.write(f"{port}\n/devtools/browser/fake\n")
+    # Port steht schon in der Datei, Verbindungen werden aber noch abgewiesen
+    time.sleep(float(os.environ.get("FAKE_CHROME_STARTUP_DELAY", "0.5")))
+    server.listen()
+    while True:
+        conn, _ = server.accept()
+        threading.Thread(target=handle, args=(conn, port, log_path), daemon=True).start()
+
+if __name__ == "__main__":
+    main()
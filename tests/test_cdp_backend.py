@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import time
+
+import pytest
+
+FAKE_CHROME = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_chrome.py")
+
+@pytest.fixture
+def fake_chrome(wv, tmp_path, monkeypatch):
+    if os.name == "nt":
+        pytest.skip("fake Chrome is started through a shell script")
+    pytest.importorskip("selenium")
+    wv.load_browser_modules()
+    monkeypatch.setenv("FAKE_CHROME_STARTUP_DELAY", "0.5")
+    chrome = tmp_path / "chrome"
+    chrome.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{FAKE_CHROME}" "$@"\n', encoding="utf-8")
+    chrome.chmod(0o755)
+    return str(chrome)
+
+def sent_methods(driver):
+    with open(os.path.join(driver.profile_dir, "devtools_methods.txt"), encoding="utf-8") as f:
+        return f.read().split()
+
+def test_driver_waits_for_devtools_and_enables_inspector(wv, fake_chrome):
+    driver = wv.CdpDriver(fake_chrome, [], startup_timeout=10)
+    try:
+        assert driver.execute_script("return 1;") == 1
+        assert "Inspector.enable" in sent_methods(driver)
+    finally:
+        driver.quit()
+
+def test_crashed_page_fails_the_running_command(wv, fake_chrome):
+    driver = wv.CdpDriver(fake_chrome, [], startup_timeout=10)
+    try:
+        started = time.time()
+        with pytest.raises(wv.WebDriverException, match="page crashed"):
+            driver.execute_script("return 'crash';")
+        assert time.time() - started < 5
+    finally:
+        driver.quit()
+
+def test_stale_port_file_from_the_profile_is_ignored(wv, fake_chrome, tmp_path):
+    profile_dir = tmp_path / "profile"
+    profile_dir.mkdir()
+    (profile_dir / "DevToolsActivePort").write_text("1\n/devtools/browser/stale\n", encoding="utf-8")
+    driver = wv.CdpDriver(fake_chrome, [], startup_timeout=10, profile_dir=str(profile_dir))
+    try:
+        assert driver.execute_script("return 1;") == 1
+    finally:
+        driver.quit()
+
+def test_scroll_keys_are_sent_as_input_events(wv, fake_chrome):
+    driver = wv.CdpDriver(fake_chrome, [], startup_timeout=10)
+    try:
+        wv.perform_interaction_batch(driver, [(0, 1), (50, -1)])
+        assert sent_methods(driver).count("Input.dispatchKeyEvent") == 4
+    finally:
+        driver.quit()
+
+def test_arguments_that_look_like_placeholders_are_passed_unchanged(wv, fake_chrome):
+    driver = wv.CdpDriver(fake_chrome, [], startup_timeout=10)
+    expressions = []
+    call = driver.connection.call
+
+    def record(method, params=None, **kwargs):
+        if method == "Runtime.evaluate":
+            expressions.append(params["expression"])
+        return call(method, params, **kwargs)
+
+    driver.connection.call = record
+    try:
+        driver.execute_script("return arguments[0];", "__SCRIPT__ __TIMEOUT__")
+    finally:
+        driver.quit()
+
+    assert expressions[0].rstrip().endswith('})(["__SCRIPT__ __TIMEOUT__"], false, %d)' % int(driver.script_timeout * 1000))
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+import time
+
+def park(breaker, domain):
+    for _ in range(breaker.threshold):
+        breaker.record_failure(domain, "timeout")
+
+def test_unreported_trial_expires_after_the_cooldown(wv, monkeypatch):
+    breaker = wv.CircuitBreaker(2, 60)
+    now = [time.time()]
+    monkeypatch.setattr(wv.time, "time", lambda: now[0])
+    park(breaker, "example.org")
+
+    now[0] += 61
+    assert breaker.allow("example.org")
+    assert not breaker.allow("example.org")
+
+    # Der Probebesuch meldet sich nie zurück
+    now[0] += 61
+    assert breaker.allow("example.org")
+    assert not breaker.allow("example.org")
+
+def test_failed_trial_parks_the_domain_again(wv, monkeypatch):
+    breaker = wv.CircuitBreaker(2, 60)
+    now = [time.time()]
+    monkeypatch.setattr(wv.time, "time", lambda: now[0])
+    park(breaker, "example.org")
+    now[0] += 61
+    assert breaker.allow("example.org")
+
+    assert breaker.record_failure("example.org", "timeout")
+    assert not breaker.allow("example.org")
+    now[0] += 61
+    assert breaker.allow("example.org")
+    breaker.record_success("example.org")
+    assert breaker.allow("example.org") and breaker.allow("example.org")
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+def start_coordinator(wv, token=None):
+    coordinator = wv.WorkCoordinator(lease_timeout=60, heartbeat_interval=1, token=token)
+    host, port = coordinator.serve("0")
+    return coordinator, f"http://{host}:{port}"
+
+def start_round(coordinator, items):
+    thread = threading.Thread(target=coordinator.run_round, args=(iter(items), len(items)), daemon=True)
+    thread.start()
+    return thread
+
+def test_coordinator_listens_on_loopback_by_default(wv):
+    coordinator, base_url = start_coordinator(wv)
+    try:
+        assert coordinator.server.server_address[0] == "127.0.0.1"
+    finally:
+        coordinator.server.shutdown()
+
+def test_coordinator_rejects_requests_without_token(wv):
+    coordinator, base_url = start_coordinator(wv, token="secret")
+    try:
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(base_url + "/status", timeout=10)
+        assert error.value.code == 403
+
+        request = urllib.request.Request(base_url + "/status", headers={"X-Coordinator-Token": "secret"})
+        with urllib.request.urlopen(request, timeout=10) as response:
+            assert "leases" in json.loads(response.read())
+    finally:
+        coordinator.server.shutdown()
+
+def test_round_finishes_when_every_lease_is_reported(wv):
+    coordinator, base_url = start_coordinator(wv, token="secret")
+    client = wv.WorkQueueClient(base_url, "node-1", token="secret")
+    items = [(1, "https://a.example/"), (2, "https://b.example/")]
+    try:
+        thread = start_round(coordinator, items)
+        leased = []
+        for _ in items:
+            leased.append(client.get())
+            client.report(leased[-1][1], "success")
+        assert sorted(leased) == items
+        # Erst die nächste Anfrage nach dem letzten Lease stellt das Ende des Stroms fest
+        assert "lease" not in client._post("/lease", {})
+        thread.join(timeout=10)
+        assert not thread.is_alive()
+        assert coordinator.stats.counts["success"] == 2
+    finally:
+        coordinator.server.shutdown()
+
+def test_leases_held_at_once_are_reported_by_url(wv):
+    # Wie eine TabSession: ein Thread hält mehrere Leases und meldet sie in anderer Reihenfolge
+    coordinator, base_url = start_coordinator(wv)
+    client = wv.WorkQueueClient(base_url, "node-1")
+    items = [(1, "https://a.example/"), (2, "https://b.example/")]
+    try:
+        thread = start_round(coordinator, items)
+        leased = [client.get(), client.get()]
+        assert sorted(leased) == items
+        client.report("https://b.example/", "failed")
+        client.report("https://a.example/", "success")
+        assert not client.leases
+        assert "lease" not in client._post("/lease", {})
+        thread.join(timeout=10)
+        assert not thread.is_alive()
+        assert coordinator.stats.counts["success"] == 1
+        assert coordinator.stats.counts["failed"] == 1
+    finally:
+        coordinator.server.shutdown()
+
+def test_tab_session_against_coordinator_finishes_the_round(wv, monkeypatch, tab_session):
+    coordinator, base_url = start_coordinator(wv)
+    client = wv.WorkQueueClient(base_url, "node-1")
+    monkeypatch.setattr(wv, "work_client", client)
+    monkeypatch.setattr(wv, "prepare_page", lambda driver, url: None)
+    # Beide Tabs halten ihre Leases gleichzeitig
+    monkeypatch.setattr(wv.args, "sleep_seconds", 1)
+    items = [(1, "https://a.example/"), (2, "https://b.example/"), (3, "https://c.example/")]
+    stats = wv.VisitStats()
+    try:
+        thread = start_round(coordinator, items)
+        session = threading.Thread(target=wv.TabSession(tab_session(), client.get, None, stats).run, daemon=True)
+        session.start()
+        thread.join(timeout=20)
+        assert not thread.is_alive()
+        assert coordinator.stats.counts["success"] == 3
+        assert not client.leases
+
+        with coordinator.lock:
+            coordinator.finished = True
+        session.join(timeout=10)
+        assert not session.is_alive()
+    finally:
+        coordinator.server.shutdown()
+
+def test_asyncio_remote_worker_finishes_the_round(wv, monkeypatch):
+    coordinator, base_url = start_coordinator(wv)
+    client = wv.WorkQueueClient(base_url, "node-1")
+    monkeypatch.setattr(wv, "work_client", client)
+    monkeypatch.setattr(wv.args, "engine", "asyncio")
+    visited = []
+
+    async def process_url_async(driver, url):
+        visited.append(url)
+
+    monkeypatch.setattr(wv, "process_url_async", process_url_async)
+    monkeypatch.setattr(wv.browser_pool, "acquire", object)
+    monkeypatch.setattr(wv.browser_pool, "release", lambda driver: None)
+    monkeypatch.setattr(wv.browser_pool, "record_visit", lambda driver: driver)
+    items = [(1, "https://a.example/"), (2, "https://b.example/"), (3, "https://c.example/")]
+    try:
+        thread = start_round(coordinator, items)
+        worker = threading.Thread(target=wv.run_remote_worker, args=(2,), daemon=True)
+        worker.start()
+        thread.join(timeout=20)
+        assert not thread.is_alive()
+        assert sorted(visited) == [url for _, url in items]
+        assert coordinator.stats.counts["success"] == 3
+
+        with coordinator.lock:
+            coordinator.finished = True
+        worker.join(timeout=10)
+        assert not worker.is_alive()
+    finally:
+        coordinator.server.shutdown()
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import time
+
+import pytest
+
+def test_zero_pauses_still_end_the_plan(wv, monkeypatch):
+    monkeypatch.setattr(wv.args, "scroll_min_random_time", 0.0)
+    monkeypatch.setattr(wv.args, "scroll_max_random_time", 0.0)
+
+    batches = wv.plan_interaction(10, scroll_chance=1.0)
+
+    steps = sum(len(batch_steps) for offset, batch_steps in batches)
+    assert 0 < steps <= 10 / wv.MIN_INTERACTION_PAUSE + 1
+    assert all(offset < 10 for offset, batch_steps in batches)
+
+def blocking_batches(wv, monkeypatch):
+    pressed = []
+
+    def perform(driver, steps):
+        pressed.append(steps)
+        time.sleep(steps[-1][0] / 1000.0)
+
+    monkeypatch.setattr(wv, "perform_interaction_batch", perform)
+    return pressed
+
+def test_blocking_batch_does_not_stretch_the_dwell(wv, monkeypatch):
+    monkeypatch.setattr(wv.args, "playback_probes", 0)
+    monkeypatch.setattr(wv, "plan_dwell", lambda duration, scroll_chance, url: [(0.0, [(0, 1), (400, 1)]), (0.1, None)])
+    blocking_batches(wv, monkeypatch)
+
+    started = time.monotonic()
+    wv.realistic_user_interaction(None, 0.5)
+
+    assert time.monotonic() - started < 0.7
+
+def test_tab_batch_stops_before_the_next_tab_event(wv, monkeypatch, tab_session):
+    pressed = blocking_batches(wv, monkeypatch)
+    session = wv.TabSession(tab_session(), None, None, None)
+    session._open_tabs()
+    scrolling, waiting = session.tabs
+    now = time.time()
+    scrolling.item, scrolling.dwell_started, scrolling.deadline = (1, "https://a.example/", 1), now, now + 10
+    scrolling.plan = collections.deque([(0.0, [(0, 1), (2000, -1)])])
+    waiting.item, waiting.deadline = (2, "https://b.example/", 1), now + 0.3
+    waiting.next_action = waiting.deadline
+
+    session._interact(scrolling)
+
+    assert pressed == [[(0, 1)]]
+    assert time.time() - now < 0.3
+    assert list(scrolling.plan) == [(pytest.approx(2.0, abs=0.1), [(0, -1)])]
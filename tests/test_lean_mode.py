@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+
+import fnmatch
+import json
+
+def blocked(patterns, url):
+    # Network.setBlockedURLs: "*" passt auf beliebige Zeichen, sonst exakter Vergleich
+    return any(fnmatch.fnmatchcase(url, pattern) for pattern in patterns)
+
+def test_resource_types_also_block_urls_with_query_strings(wv):
+    patterns = wv.LeanMode(True).blocked_patterns("example.org")
+
+    assert blocked(patterns, "https://cdn.example.org/logo.png")
+    assert blocked(patterns, "https://cdn.example.org/logo.png?v=3")
+    assert not blocked(patterns, "https://cdn.example.org/player.js?v=3")
+
+def test_allow_patterns_remove_identical_block_patterns(wv, tmp_path):
+    config = tmp_path / "lean.json"
+    config.write_text(json.dumps({"example.org": {"allow_patterns": ["*.svg", "*hotjar.com*"]}}), encoding="utf-8")
+    lean = wv.LeanMode(True, str(config))
+
+    patterns = lean.blocked_patterns("example.org")
+
+    assert not blocked(patterns, "https://example.org/icon.svg")
+    assert not blocked(patterns, "https://example.org/icon.svg?v=2")
+    assert not blocked(patterns, "https://static.hotjar.com/c.js")
+    assert blocked(patterns, "https://example.org/icon.png")
+    assert blocked(lean.blocked_patterns("other.org"), "https://other.org/icon.svg")
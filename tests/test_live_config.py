@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+import pytest
+
+def test_domain_sections_reject_global_only_settings(wv):
+    config = wv.LiveConfig(None)
+    assert config._parse({"default": {"retry_backoff": 2}, "example.org": {"sleep_seconds": 5}}) == {
+        "default": {"retry_backoff": 2.0},
+        "example.org": {"sleep_seconds": 5},
+    }
+    for name in wv.GLOBAL_ONLY_SETTINGS:
+        with pytest.raises(ValueError, match="only allowed in 'default'"):
+            config._parse({"example.org": {name: 1}})
+
+@pytest.fixture
+def live_args(wv, monkeypatch):
+    # load() schreibt in args, monkeypatch stellt die Werte danach wieder her
+    for name in wv.LIVE_SETTINGS:
+        monkeypatch.setattr(wv.args, name, getattr(wv.args, name))
+    return wv.args
+
+def write_config(path, sections):
+    path.write_text(json.dumps(sections), encoding="utf-8")
+
+def test_out_of_range_values_are_rejected(wv):
+    config = wv.LiveConfig(None)
+    for values in ({"sleep_seconds": -1}, {"max_retries": -1}, {"scroll_max_random_time": 0},
+                   {"scroll_chance": 1.5}, {"scroll_min_random_time": 3, "scroll_max_random_time": 2}):
+        with pytest.raises(ValueError):
+            config._parse({"default": values})
+
+def test_file_takes_over_a_command_line_value_once_it_changes(wv, live_args, tmp_path):
+    path = tmp_path / "live.json"
+    write_config(path, {"default": {"sleep_seconds": 20, "max_retries": 4}})
+    live_args.sleep_seconds = 7
+
+    config = wv.LiveConfig(str(path))
+    assert (live_args.sleep_seconds, live_args.max_retries) == (7, 4)
+
+    write_config(path, {"default": {"sleep_seconds": 20, "max_retries": 5}})
+    config.reload()
+    assert (live_args.sleep_seconds, live_args.max_retries) == (7, 5)
+
+    write_config(path, {"default": {"sleep_seconds": 30, "max_retries": 5}})
+    config.reload()
+    assert live_args.sleep_seconds == 30
+
+def test_rejected_reload_keeps_the_previous_settings(wv, live_args, tmp_path):
+    path = tmp_path / "live.json"
+    write_config(path, {"default": {"max_retries": 4}, "example.org": {"sleep_seconds": 9}})
+    config = wv.LiveConfig(str(path))
+
+    write_config(path, {"default": {"max_retries": -1}, "example.org": {"sleep_seconds": 1}})
+    config.reload()
+
+    assert live_args.max_retries == 4
+    assert config.get("sleep_seconds", "https://www.example.org/") == 9
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+import gzip
+import json
+import logging
+import os
+import threading
+
+import pytest
+
+def record(message, **extra):
+    entry = logging.LogRecord("website_visitor", logging.INFO, __file__, 1, message, None, None)
+    entry.__dict__.update(extra)
+    return entry
+
+@pytest.fixture
+def log_file(wv, monkeypatch, tmp_path):
+    path = tmp_path / "website_visitor.log"
+    monkeypatch.setattr(wv.args, "log_file", str(path))
+    monkeypatch.setattr(wv.args, "log_rotate_when", None)
+    monkeypatch.setattr(wv.args, "log_backups", 2)
+    return path
+
+def read_gzip(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return f.read()
+
+def test_size_rotation_keeps_gzip_backups(wv, monkeypatch, log_file):
+    monkeypatch.setattr(wv.args, "log_max_mb", 100 / (1024 * 1024))
+    handler = wv.log_file_handler()
+    try:
+        for number in range(4):
+            handler.emit(record(f"line {number} " + "x" * 80))
+    finally:
+        handler.close()
+
+    assert sorted(os.listdir(log_file.parent)) == ["website_visitor.log", "website_visitor.log.1.gz", "website_visitor.log.2.gz"]
+    assert read_gzip(f"{log_file}.1.gz").startswith("line 2")
+
+def test_time_rotation_names_backups_with_gz(wv, monkeypatch, log_file):
+    monkeypatch.setattr(wv.args, "log_rotate_when", "S")
+    handler = wv.log_file_handler()
+    try:
+        handler.emit(record("before"))
+        handler.rolloverAt = 0
+        handler.emit(record("after"))
+    finally:
+        handler.close()
+
+    backups = [name for name in os.listdir(log_file.parent) if name != "website_visitor.log"]
+    assert len(backups) == 1 and backups[0].endswith(".gz")
+    assert read_gzip(log_file.parent / backups[0]).strip() == "before"
+    assert log_file.read_text(encoding="utf-8").strip() == "after"
+
+def test_json_lines_carry_the_visit_url(wv):
+    line = wv.JsonLinesFormatter().format(record("Loaded", visit_url="https://a.example/", threadName="worker-1"))
+    entry = json.loads(line)
+    assert entry["message"] == "Loaded"
+    assert entry["url"] == "https://a.example/"
+    assert entry["thread"] == "worker-1"
+    assert "url" not in json.loads(wv.JsonLinesFormatter().format(record("Idle", visit_url=None)))
+
+def test_quiet_drops_say_and_late_worker_logs_stay_off_stderr(wv, monkeypatch, log_file, capsys):
+    monkeypatch.setattr(wv.args, "log_max_mb", 0)
+    monkeypatch.setattr(wv.args, "log_format", "text")
+    monkeypatch.setattr(wv.args, "quiet", True)
+    monkeypatch.setattr(wv, "log_listener", None)
+    monkeypatch.setattr(wv.logger, "handlers", [])
+    monkeypatch.setattr(wv.console, "handlers", [])
+    # Wie außerhalb von pytest: der Root-Logger hat keine Handler
+    monkeypatch.setattr(wv.logger, "propagate", False)
+
+    wv.setup_logging()
+    wv.say("🌍 Lade URL")
+    wv.logger.info("Loading URL")
+    wv.stop_logging()
+
+    # Ein Daemon-Worker loggt noch, nachdem der Listener beendet ist
+    worker = threading.Thread(target=wv.logger.warning, args=("late worker message",))
+    worker.start()
+    worker.join()
+
+    out, err = capsys.readouterr()
+    assert "Lade URL" not in out
+    assert "Loading URL" in out
+    assert "late worker message" not in err
+    assert "Loading URL" in log_file.read_text(encoding="utf-8")
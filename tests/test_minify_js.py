@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+
+def test_regex_after_keyword_keeps_its_slashes(wv):
+    source = "function f(s) {\n    return /^https?:\\/\\//.test(s); // Kommentar\n}\n"
+    assert wv.minify_js(source) == "function f(s) {\nreturn /^https?:\\/\\//.test(s);\n}"
+
+def test_division_after_value_still_strips_comments(wv):
+    assert wv.minify_js("var x = total / count; // Schnitt\nvar y = returned / 2;") == "var x = total / count;\nvar y = returned / 2;"
+
+def test_division_after_postfix_increment_strips_the_comment(wv):
+    assert wv.minify_js("x = a++ / 2; // c\ny = b-- / 2; // 'd\nz = 1;") == "x = a++ / 2;\ny = b-- / 2;\nz = 1;"
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+class ProbeDriver:
+    """
+    Liefert nacheinander die vorgegebenen Ergebnisse von PLAYBACK_PROBE_JS.
+    """
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+
+    def execute_script(self, script, *args):
+        self.calls += 1
+        return self.results.pop(0) if self.results else self.last
+
+    @property
+    def last(self):
+        return {"media": 1, "playing": 0, "played": 0}
+
+    def get(self, url):
+        pass
+
+@pytest.fixture
+def probes(wv, monkeypatch):
+    monkeypatch.setattr(wv.args, "playback_probes", 2)
+    monkeypatch.setattr(wv.args, "no_playback", "retry")
+    return wv.PlaybackProbe("https://radio.example/")
+
+def test_silent_media_requeues_after_the_last_probe(probes):
+    driver = ProbeDriver()
+    assert probes.sample(driver) is None
+    assert probes.sample(driver) == "requeue"
+
+def test_skip_policy_skips(wv, monkeypatch, probes):
+    monkeypatch.setattr(wv.args, "no_playback", "skip")
+    driver = ProbeDriver()
+    probes.sample(driver)
+    assert probes.sample(driver) == "skip"
+
+def test_playing_media_stops_probing(probes):
+    driver = ProbeDriver({"media": 1, "playing": 1, "played": 0.5})
+    assert probes.sample(driver) is None
+    assert probes.sample(driver) is None
+    assert driver.calls == 1
+
+def test_pages_without_media_are_never_cut_short(probes):
+    driver = ProbeDriver({"media": 0, "playing": 0, "played": 0}, {"media": 0, "playing": 0, "played": 0})
+    assert probes.sample(driver) is None
+    assert probes.sample(driver) is None
+
+def test_finish_records_the_played_seconds(wv, probes):
+    driver = ProbeDriver({"media": 1, "playing": 1, "played": 12.34})
+    trace = wv.VisitTrace("https://radio.example/")
+    token = wv.current_visit.set(trace)
+    try:
+        probes.finish(driver)
+    finally:
+        wv.current_visit.reset(token)
+    assert trace.playback_seconds == 12.3
+
+def test_requeue_keeps_the_browser_and_the_breaker(wv, monkeypatch):
+    actions = iter(["requeue", None])
+    monkeypatch.setattr(wv, "process_url", lambda driver, url: next(actions))
+    monkeypatch.setattr(wv.browser_pool, "restart", pytest.fail)
+    monkeypatch.setattr(wv.browser_pool, "record_visit", lambda driver: driver)
+    monkeypatch.setattr(wv.circuit_breaker, "record_failure", pytest.fail)
+    monkeypatch.setattr(wv.args, "max_retries", 1)
+    monkeypatch.setattr(wv.args, "retry_backoff", 0.0)
+    driver = ProbeDriver()
+    stats = wv.VisitStats()
+    retries = wv.RetryQueue()
+
+    for position, url, attempt in wv.with_requeued([(1, "https://radio.example/")], retries):
+        assert wv.visit_url_with_retries(driver, url, position, 1, stats, attempt, retries) is driver
+
+    assert stats.counts["success"] == 1
+    assert stats.restarts == 0
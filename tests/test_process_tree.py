@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+
+import os
+import signal
+import subprocess
+import time
+
+import pytest
+
+@pytest.fixture
+def proc_tree(wv, monkeypatch):
+    if wv.psutil is not None or not os.path.isdir("/proc"):
+        pytest.skip("needs /proc without psutil")
+    scans = []
+    read_all = wv._proc_stat_fields
+    monkeypatch.setattr(wv, "_proc_stat_fields", lambda: scans.append(1) or read_all())
+    process = subprocess.Popen(["sh", "-c", "sleep 30 & sleep 30 & wait"])
+    time.sleep(0.3)
+    yield wv.ProcessTree(process.pid), scans
+    process.kill()
+    process.wait()
+
+def test_known_processes_are_measured_without_rescanning(proc_tree):
+    tree, scans = proc_tree
+    usages = [tree.usage() for _ in range(5)]
+    assert all(usage[2] == 3 for usage in usages)
+    assert len(scans) == 1
+
+def test_vanished_process_triggers_a_rescan(proc_tree):
+    tree, scans = proc_tree
+    assert tree.usage()[2] == 3
+    child = next(pid for pid in tree.members if pid != tree.root_pid)
+    os.kill(child, signal.SIGKILL)
+    time.sleep(0.3)
+    assert tree.usage()[2] == 2
+    assert len(scans) == 2
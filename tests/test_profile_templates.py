@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+import os
+import time
+
+class CookieDriver:
+    """
+    Browser-Attrappe, die nur die Cookie-Befehle über CDP kennt.
+    """
+    def __init__(self):
+        self.cookies = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        if cmd == "Network.setCookies":
+            self.cookies.extend(params["cookies"])
+            return {}
+        if cmd == "Network.getCookies":
+            return {"cookies": list(self.cookies)}
+        raise AssertionError(cmd)
+
+def consent_click(templates, driver, url, cookie):
+    templates.consent_clicked(driver, templates.cookie_snapshot(driver))
+    driver.cookies.append(cookie)
+    templates.remember_consent(driver, url)
+
+def test_consent_reaches_browsers_started_earlier(wv, tmp_path):
+    templates = wv.ProfileTemplates(str(tmp_path), "copy", 64, 60)
+    first, second = CookieDriver(), CookieDriver()
+    templates.seed_cookies(first)
+    templates.seed_cookies(second)
+
+    url = "https://www.example.org/page"
+    consent_click(templates, first, url, {"name": "consent", "domain": ".example.org", "value": "yes", "expires": time.time() + 3600})
+
+    assert templates.ensure_consent(second, url)
+    assert [c["name"] for c in second.cookies] == ["consent"]
+    assert templates.ensure_consent(second, url)
+    assert len(second.cookies) == 1
+
+def test_expired_consent_shows_the_banner_again(wv, tmp_path):
+    templates = wv.ProfileTemplates(str(tmp_path), "copy", 64, 60)
+    driver = CookieDriver()
+    url = "https://example.org/"
+    consent_click(templates, driver, url, {"name": "consent", "domain": ".example.org", "value": "yes", "expires": time.time() - 1})
+
+    assert not templates.ensure_consent(CookieDriver(), url)
+    assert not templates.ensure_consent(driver, url)
+
+class BannerDriver(CookieDriver):
+    """
+    Zeigt einen Cookie-Button, der sich nicht klicken lässt.
+    """
+    def execute_script(self, script, *args):
+        return {"legacy": 1, "candidates": [("button", "akzeptieren", "Alle akzeptieren")]}
+
+def test_failed_consent_click_stores_no_cookies(wv, tmp_path, monkeypatch):
+    templates = wv.ProfileTemplates(str(tmp_path), "copy", 64, 60)
+    monkeypatch.setattr(wv, "profile_templates", templates)
+    driver = BannerDriver()
+
+    def click_fails(driver, elem, label):
+        # die Seite setzt währenddessen ein Analytics-Cookie
+        driver.cookies.append({"name": "_ga", "domain": ".example.org", "value": "GA1"})
+        return False
+    monkeypatch.setattr(wv, "click_element_safely", click_fails)
+
+    wv.handle_cookies(driver)
+    templates.remember_consent(driver, "https://example.org/")
+
+    assert templates.consent == {}
+    assert not templates.ensure_consent(CookieDriver(), "https://example.org/")
+
+def write_entry(root, name, data, mtime=None):
+    path = os.path.join(root, "Default", "Cache", "Cache_Data", name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+def test_clones_are_independent_copies(wv, tmp_path):
+    templates = wv.ProfileTemplates(str(tmp_path / "template"), wv.parser.get_default("profile_clone"), 64, 60)
+    source = write_entry(templates.path, "abc_0", b"template")
+
+    clone = templates.clone()
+    try:
+        with open(os.path.join(clone, os.path.relpath(source, templates.path)), "r+b") as f:
+            f.write(b"rewrite!")
+    finally:
+        templates.release(object())
+
+    with open(source, "rb") as f:
+        assert f.read() == b"template"
+
+def test_release_moves_new_entries_into_the_template(wv, tmp_path):
+    templates = wv.ProfileTemplates(str(tmp_path / "template"), "copy", 64, 60)
+    write_entry(templates.path, "old_0", b"template")
+    driver = CookieDriver()
+    clone = templates.clone()
+    templates.attach(driver, clone)
+    write_entry(clone, "old_0", b"changed")
+    write_entry(clone, "new_0", b"new")
+
+    templates.release(driver)
+
+    assert not os.path.exists(clone)
+    assert sorted(os.path.basename(rel) for rel in wv.profile_cache_files(templates.path)) == ["new_0", "old_0"]
+    with open(os.path.join(templates.path, "Default", "Cache", "Cache_Data", "old_0"), "rb") as f:
+        assert f.read() == b"template"
+
+def test_prune_drops_the_oldest_entries_first(wv, tmp_path):
+    templates = wv.ProfileTemplates(str(tmp_path / "template"), "copy", 2.5 / 1024, 0)
+    now = time.time()
+    for age, key in enumerate(("newest", "middle", "oldest")):
+        write_entry(templates.path, f"{key}_0", b"x" * 1024, now - age * 60)
+    write_entry(templates.path, "oldest_s", b"x" * 10, now - 120)
+
+    templates.prune()
+
+    assert sorted(os.path.basename(rel) for rel in wv.profile_cache_files(templates.path)) == ["middle_0", "newest_0"]
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+
+class CdpRecorder:
+    def __init__(self):
+        self.commands = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.commands.append(cmd)
+        return {"identifier": str(len(self.commands))}
+
+def test_preloaded_script_is_removed_on_a_domain_without_script(wv, monkeypatch):
+    entry = wv.DomainScript("radio.example", "main.js", 0, "window.visited = true;")
+    monkeypatch.setattr(wv.script_registry, "get", lambda domain: entry if domain == wv.get_root_domain("https://radio.example/") else None)
+    driver = CdpRecorder()
+
+    wv.preload_domain_script(driver, "https://radio.example/")
+    wv.preload_domain_script(driver, "https://other.test/")
+    wv.preload_domain_script(driver, "https://other.test/next")
+
+    assert driver.commands == ["Page.addScriptToEvaluateOnNewDocument", "Page.removeScriptToEvaluateOnNewDocument"]
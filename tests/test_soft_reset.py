@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+
+import types
+
+class HungDriver:
+    """
+    Zeichnet die Befehle eines Soft-Resets auf; ein Seitenaufruf würde so lange hängen
+    wie der gerade gesetzte Page-Load-Timeout.
+    """
+    def __init__(self):
+        self.window_handles = ["tab-1"]
+        self.switch_to = types.SimpleNamespace(window=lambda handle: None)
+        self.page_load_timeout = 300
+        self.commands = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.commands.append(cmd)
+        return {}
+
+    def set_page_load_timeout(self, seconds):
+        self.page_load_timeout = seconds
+
+    def delete_all_cookies(self):
+        self.commands.append("delete_all_cookies")
+
+    def execute_script(self, script, *args):
+        self.commands.append("execute_script")
+
+    def get(self, url):
+        self.commands.append(f"get {url} ({self.page_load_timeout}s)")
+
+def test_soft_reset_stops_loading_and_bounds_about_blank(wv):
+    driver = HungDriver()
+
+    assert wv.soft_reset_driver(driver)
+
+    assert driver.commands[0] == "Page.stopLoading"
+    assert f"get about:blank ({wv.BLANK_PAGE_TIMEOUT}s)" in driver.commands
+    assert driver.page_load_timeout == wv.WEBDRIVER_PAGE_LOAD_TIMEOUT
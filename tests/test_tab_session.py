@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+import queue
+import threading
+import time
+
+def test_failed_browser_restart_keeps_queued_retries(wv, monkeypatch, tab_session):
+    driver = tab_session()
+
+    def prepare_page(page_driver, url):
+        if "crash" in url:
+            page_driver.crashed = True
+            return "restart"
+        return None
+
+    def restart(old_driver):
+        raise RuntimeError("Chrome cannot start")
+
+    monkeypatch.setattr(wv, "prepare_page", prepare_page)
+    monkeypatch.setattr(wv.browser_pool, "restart", restart)
+    monkeypatch.setattr(wv.args, "max_retries", 1)
+    items = iter([(1, "https://crash.example/"), (2, "https://ok.example/")])
+    stats = wv.VisitStats()
+
+    wv.TabSession(driver, lambda timeout=None: next(items, None), 2, stats).run()
+
+    assert sum(stats.counts.values()) == 2
+    assert stats.counts["success"] == 1
+
+def test_waiting_for_the_next_url_does_not_stretch_other_tabs(wv, monkeypatch, tab_session):
+    monkeypatch.setattr(wv, "prepare_page", lambda driver, url: None)
+    monkeypatch.setattr(wv.args, "sleep_seconds", 1)
+    url_queue = queue.Queue()
+    url_queue.put((1, "https://a.example/"))
+    finished = {}
+    finish_url = wv.finish_url
+
+    def record_finish(stats, url, outcome):
+        finished[url] = time.time()
+        finish_url(stats, url, outcome)
+
+    monkeypatch.setattr(wv, "finish_url", record_finish)
+    # Die zweite URL kommt erst lange nach dem Ende der ersten Verweildauer
+    threading.Timer(3.0, url_queue.put, args=(None,)).start()
+
+    started = time.time()
+    wv.TabSession(tab_session(), url_queue.get, None, wv.VisitStats()).run()
+
+    assert finished["https://a.example/"] - started < 2.0
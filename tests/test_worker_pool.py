@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+
+import queue
+
+def test_feeder_ends_every_worker_when_the_list_fails(wv):
+    def items():
+        yield (1, "https://a.example/")
+        raise OSError("stale file handle")
+
+    url_queue = queue.Queue()
+    wv.feed_url_queue(items(), url_queue, 2)
+
+    assert [url_queue.get_nowait() for _ in range(3)] == [(1, "https://a.example/"), None, None]
@@ -1,56 +1,182 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import time
+# Referenzpunkt für die gemessene Startzeit (siehe report_startup_time())
+STARTUP_STARTED = time.perf_counter()
+
 import sys
 import argparse
-import time
 import os
 import re
 import subprocess
 import random
-import tldextract
-import urllib3
 import socket
 import logging
+import logging.handlers
+import atexit
+import signal
+import gzip
 import traceback
+import threading
+import queue
+import asyncio
+import functools
+import concurrent.futures
+import hashlib
+import hmac
+import weakref
+import contextlib
+import collections
+import sqlite3
+import itertools
+import heapq
+import contextvars
+import json
+import http.server
+import urllib.request
+import urllib.error
+import base64
+import struct
+import shutil
+import tempfile
+import types
+
+try:
+    # Optional: genauere Prozess-Statistiken, ohne psutil wird /proc gelesen
+    import psutil
+except ImportError:
+    psutil = None
 
 from urllib.parse import urlparse
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.common.keys import Keys
-from selenium.common.exceptions import (
-    TimeoutException,
-    WebDriverException,
-    JavascriptException,
-    NoSuchElementException,
-    MoveTargetOutOfBoundsException,
-    ElementClickInterceptedException
-)
+
+# selenium und urllib3 werden erst geladen, wenn ein Browser gebraucht wird
+# (load_browser_modules()), damit z.B. --dry_run oder --coordinator ohne sie starten.
+urllib3 = None
+webdriver = None
+Options = WebDriverWait = By = ActionChains = Keys = None
+TimeoutException = WebDriverException = JavascriptException = None
+NoSuchElementException = MoveTargetOutOfBoundsException = ElementClickInterceptedException = None
+# Mehrere Worker starten ihre Browser gleichzeitig; die Namen werden einzeln gesetzt
+browser_modules_lock = threading.Lock()
+
+def load_browser_modules():
+    """
+    Importiert selenium/urllib3 beim ersten Bedarf und macht die Namen modulweit verfügbar.
+    """
+    global urllib3, webdriver, Options, WebDriverWait, By, ActionChains, Keys
+    global TimeoutException, WebDriverException, JavascriptException
+    global NoSuchElementException, MoveTargetOutOfBoundsException, ElementClickInterceptedException
+    with browser_modules_lock:
+        if webdriver is not None:
+            return
+        started = time.perf_counter()
+        import urllib3
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.common.action_chains import ActionChains
+        from selenium.webdriver.common.keys import Keys
+        from selenium.common.exceptions import (
+            TimeoutException,
+            WebDriverException,
+            JavascriptException,
+            NoSuchElementException,
+            MoveTargetOutOfBoundsException,
+            ElementClickInterceptedException
+        )
+        logger.info("Imported selenium/urllib3 in %.0f ms", (time.perf_counter() - started) * 1000)
 
 # ----------------------------
 # Argument parsing
 # ----------------------------
 parser = argparse.ArgumentParser(description="Load URLs and execute JS with Selenium (robust edition).")
-parser.add_argument("--url_list", required=True, help="Text file with URLs (one per line).")
-parser.add_argument("--script_folder", required=True, help="Folder with per-domain main.js scripts.")
+parser.add_argument("--dry_run", "--dry-run", "--validate", dest="dry_run", action="store_true", help="Resolve the root domain and script of every URL in --url_list without starting Chrome, then exit.")
+parser.add_argument("--suffix_list", help="Local public_suffix_list.dat for domain parsing (default: the snapshot bundled with tldextract). The list is never fetched from the network.")
+parser.add_argument("--url_list", help="Text file with URLs (one per line), a directory of *.txt URL lists, or '-' for stdin. Required unless --join is used.")
+parser.add_argument("--script_folder", required=True, help="Folder with the shared core.js and one subfolder per domain (overrides.json, or a complete main.js).")
 parser.add_argument("--sleep_seconds", type=int, default=300, help="Sleep time (seconds) spent on page for interaction.")
 parser.add_argument("--loop", action="store_true", help="Loop through the URL list endlessly.")
 parser.add_argument("--loop_sleep", type=int, default=60, help="Sleep between loops (only with --loop).")
 parser.add_argument("--show_browser", action="store_true", help="Show browser window (disable headless mode).")
+parser.add_argument("--backend", choices=["selenium", "cdp"], default="selenium", help="Browser control: 'selenium' (chromedriver) or 'cdp' (Chrome DevTools Protocol websocket, no chromedriver).")
+parser.add_argument("--chrome_binary", help="Chrome executable for --backend cdp (default: first of chrome-headless-shell/google-chrome/chromium found in PATH).")
 parser.add_argument("--url_shuffle", action="store_true", help="Activate URL shuffling.")
 parser.add_argument("--max_visit_time", type=int, default=300, help="Max time to stay on a page in seconds.")
 parser.add_argument("--mute", action="store_true", help="Mute browser audio.")
 parser.add_argument("--scroll_chance", type=float, default=0.1, help="Chance (0 to 1) that scrolling happens randomly.")
 parser.add_argument("--scroll_min_random_time", type=float, default=0.3, help="Min random time for random scrolling.")
 parser.add_argument("--scroll_max_random_time", type=float, default=5, help="Max random time for random scrolling.")
+parser.add_argument("--interaction_seed", type=int, help="Seed for the precomputed scroll schedule of each visit (combined with the URL, reproducible runs).")
+parser.add_argument("--interaction_batch_window", type=float, default=5.0, help="Scroll key presses within this many seconds are sent as one action sequence whose pauses run in the browser; the call blocks for that span, with --tabs at most until another tab is due (0 = one call per key press).")
+parser.add_argument("--playback_probes", type=int, default=3, help="How often the page is checked for playing audio/video early in the dwell (0 = off).")
+parser.add_argument("--playback_probe_window", type=float, default=20.0, help="Seconds at the start of the dwell over which the playback probes are spread.")
+parser.add_argument("--no_playback", choices=["continue", "skip", "retry"], default="retry", help="What to do when media elements exist but none plays after the last probe (retry = visit the URL again later in the same browser, without a restart and without counting toward the circuit breaker).")
+parser.add_argument("--page_load_timeout", type=float, default=30.0, help="Seconds to wait for a page to become ready after driver.get().")
+parser.add_argument("--script_timeout", type=float, default=120.0, help="WebDriver timeout in seconds for the asynchronous domain script.")
 parser.add_argument("--max_retries", type=int, default=3, help="Max retries per URL before skipping.")
-parser.add_argument("--retry_backoff", type=float, default=3.0, help="Seconds to wait before retrying after a failure.")
+parser.add_argument("--retry_backoff", type=float, default=3.0, help="Base seconds to wait before retrying after a failure (doubled per attempt).")
+parser.add_argument("--retry_backoff_max", type=float, default=60.0, help="Upper bound for the exponential retry backoff in seconds.")
+parser.add_argument("--retry_jitter", type=float, default=0.5, help="Fraction of the backoff that is randomized (0 = fixed, 1 = full jitter).")
+parser.add_argument("--breaker_threshold", type=int, default=5, help="Consecutive failed attempts after which a domain is parked (0 = disable the circuit breaker).")
+parser.add_argument("--breaker_cooldown", type=float, default=900.0, help="Seconds a parked domain is skipped before one trial visit is allowed again.")
+parser.add_argument("--tabs", type=int, default=1, help="Concurrent visits per browser, each in its own tab with its own dwell deadline (threads engine).")
+parser.add_argument("--workers", type=int, default=1, help="Number of parallel browser workers pulling URLs from a shared queue.")
+parser.add_argument("--engine", choices=["threads", "asyncio"], default="threads", help="Execution engine: one thread per browser or an asyncio event loop multiplexing all sessions.")
+parser.add_argument("--async_threads", type=int, default=0, help="Executor threads for blocking WebDriver calls in the asyncio engine (0 = one per session).")
+parser.add_argument("--warm_spares", type=int, default=0, help="Number of pre-started spare browsers kept ready for restarts (0 = off).")
+parser.add_argument("--profile_template", help="Directory of a shared profile template (disk cache + accepted consent cookies) that every browser starts from; created on first use.")
+parser.add_argument("--profile_clone", choices=["copy", "hardlink"], default="copy", help="How browsers get the template cache: independent copies (default) or hardlinks. Hardlinks avoid copying, but Chrome rewrites cache entries in place, so a running browser also changes the template and the caches of the other browsers.")
+parser.add_argument("--profile_cache_mb", type=float, default=500.0, help="Size limit of the template cache and of each browser's disk cache in MB.")
+parser.add_argument("--profile_prune_interval", type=float, default=3600.0, help="Minimum seconds between two prunes of the template cache.")
+parser.add_argument("--soft_reset", action="store_true", help="Try a cheap soft reset (cookies, storage, tabs, about:blank) before a hard browser restart.")
+parser.add_argument("--recycle_after_visits", type=int, default=0, help="Replace a browser after this many successful visits (0 = never).")
+parser.add_argument("--recycle_js_heap_mb", "--recycle_memory_mb", dest="recycle_js_heap_mb", type=float, default=0, help="Replace a browser when the JS heap of its current page (performance.memory.usedJSHeapSize) exceeds this many MB (0 = off). This is not the browser's memory; use --recycle_rss_mb for that. --recycle_memory_mb is the old name.")
+parser.add_argument("--recycle_rss_mb", type=float, default=0, help="Replace a browser between visits when the RSS of its chromedriver/Chrome process tree exceeds this many MB (0 = off).")
+parser.add_argument("--script_poll_interval", type=float, default=5.0, help="Seconds between checks of --script_folder for changed core.js/overrides.json/main.js files.")
+parser.add_argument("--trace_file", help="Append one JSON line with phase timings per visit to this file.")
+parser.add_argument("--metrics_port", type=int, default=0, help="Serve Prometheus-style metrics on http://127.0.0.1:PORT/metrics (0 = off).")
+parser.add_argument("--stats_file", help="Periodically write per-domain visit statistics as JSON to this file.")
+parser.add_argument("--stats_interval", type=float, default=60, help="Seconds between --stats_file updates.")
+parser.add_argument("--lean", action="store_true", help="Block images, fonts and ad/tracker URLs and treat the page as ready once a player element exists.")
+parser.add_argument("--lean_config", help="JSON file with per-domain block lists and ready selectors for --lean. allow_patterns removes block patterns written exactly the same way; it does not allow individual URLs.")
+parser.add_argument("--page_load_strategy", choices=["normal", "eager"], default="normal", help="Selenium page load strategy ('eager' returns after DOMContentLoaded).")
+parser.add_argument("--ready_mode", choices=["event", "poll"], default="event", help="Page readiness detection: one in-page event hook or polling document.readyState.")
+parser.add_argument("--ready_conditions", help="Comma-separated readiness conditions for --ready_mode event (complete, selector, media). Default: complete, plus selector and media in --lean mode.")
+parser.add_argument("--shuffle_window", type=int, default=10000, help="Buffer size for --url_shuffle (lists up to this size are shuffled completely).")
+parser.add_argument("--url_cache_max", type=int, default=1000000, help="Keep parsed URL lists up to this many entries in memory between loops.")
+parser.add_argument("--state_db", help="SQLite file recording per-URL visits; interrupted runs resume and skip URLs already done in the current cycle.")
+parser.add_argument("--state_report", action="store_true", help="Print a per-domain summary of --state_db and exit.")
+parser.add_argument("--fair_schedule", action="store_true", help="Interleave URLs round-robin across root domains instead of list order.")
+parser.add_argument("--domain_rate", type=float, default=0, help="Max visits per minute per root domain (token bucket, 0 = unlimited). Implies --fair_schedule.")
+parser.add_argument("--domain_burst", type=int, default=1, help="Token bucket size for --domain_rate.")
+parser.add_argument("--min_revisit", type=float, default=0, help="Minimum seconds between two visits of the same URL (0 = off). Implies --fair_schedule.")
+parser.add_argument("--schedule_window", type=int, default=1000, help="How many URLs the fair scheduler reads ahead.")
+parser.add_argument("--coordinator", metavar="[HOST:]PORT", help="Run as coordinator: own the URL queue and lease URLs to remote workers over HTTP instead of visiting them. Without HOST it only listens on 127.0.0.1; give e.g. 0.0.0.0:8765 (ideally with --coordinator_token) to accept other hosts.")
+parser.add_argument("--join", metavar="URL", help="Run as remote worker: lease URLs from the coordinator at URL (e.g. http://127.0.0.1:8765). Honors --workers, --tabs and --engine.")
+parser.add_argument("--coordinator_token", default=os.environ.get("WEBSITE_VISITOR_TOKEN"), help="Shared secret the coordinator requires from every request and --join workers send (default: $WEBSITE_VISITOR_TOKEN).")
+parser.add_argument("--node_id", default=f"{socket.gethostname()}-{os.getpid()}", help="Name of this worker node as reported to the coordinator.")
+parser.add_argument("--lease_timeout", type=float, default=600.0, help="Seconds without heartbeat after which a leased URL is handed to another worker.")
+parser.add_argument("--heartbeat_interval", type=float, default=30.0, help="Seconds between worker heartbeats for running leases.")
+parser.add_argument("--log_format", choices=["text", "json"], default="text", help="Format of the log file: plain text or one JSON object per line.")
+parser.add_argument("--log_max_mb", type=float, default=100.0, help="Rotate the log file when it exceeds this size in MB (0 = never rotate by size).")
+parser.add_argument("--log_rotate_when", help="Rotate the log file by time instead of size, e.g. 'midnight' or 'H' (see TimedRotatingFileHandler).")
+parser.add_argument("--log_backups", type=int, default=5, help="Number of gzip-compressed rotated log files to keep.")
+parser.add_argument("--quiet", action="store_true", help="Suppress the emoji progress output on the console (log messages are still shown).")
+parser.add_argument("--config", help="JSON file with live settings: {\"default\": {...}, \"<root-domain>\": {...}}. Reloaded on SIGHUP or when the file changes, without restarting browsers. loop_sleep, interaction_batch_window, retry_* and recycle_* are only allowed in \"default\". A value given on the command line overrides \"default\" until that key is changed in the file.")
+parser.add_argument("--config_poll_interval", type=float, default=5.0, help="Seconds between checks of --config for changes.")
 parser.add_argument("--log_file", default="website_visitor.log", help="Path to log file.")
 
 args = parser.parse_args()
+if not args.url_list and not args.join:
+    parser.error("the following arguments are required: --url_list (or --join)")
+if args.state_report and not args.state_db:
+    parser.error("--state_report requires --state_db")
+if args.shuffle_window < 1:
+    parser.error("--shuffle_window must be at least 1")
+if not 0 <= args.scroll_min_random_time <= args.scroll_max_random_time or args.scroll_max_random_time <= 0:
+    parser.error("--scroll_min_random_time/--scroll_max_random_time need 0 <= min <= max and max > 0")
 
 # ----------------------------
 # Logging setup
@@ -59,472 +185,4782 @@ logger = logging.getLogger("website_visitor")
 logger.setLevel(logging.DEBUG)
 formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s", "%Y-%m-%d %H:%M:%S")
 
-# console
-ch = logging.StreamHandler(sys.stdout)
-ch.setFormatter(formatter)
-ch.setLevel(logging.INFO)
-logger.addHandler(ch)
+# Emoji-Fortschrittsausgabe auf der Konsole (say()), läuft über dieselbe Queue wie das Logging
+console = logging.getLogger("website_visitor.console")
+console.setLevel(logging.INFO)
+console.propagate = False
 
-# file
-fh = logging.FileHandler(args.log_file)
-fh.setFormatter(formatter)
-fh.setLevel(logging.DEBUG)
-logger.addHandler(fh)
+# Schreibt die Handler im Hintergrund-Thread; wird in setup_logging() gestartet
+log_listener = None
 
-# ----------------------------
-# Utility functions
-# ----------------------------
-def read_urls_from_file():
-    if not os.path.exists(args.url_list):
-        print(f"❌ Datei nicht gefunden: {args.url_list}")
-        return []
-    with open(args.url_list, 'r', encoding='utf-8') as f:
-        # Filtert leere Zeilen und Kommentare, entfernt Whitespace
-        lines = [line.strip() for line in f if line.strip() and not line.strip().startswith('#') and not line.strip().startswith('[source')]
-    
-    logger.debug("Loaded %d URLs from %s", len(lines), args.url_list)
-    return lines
+class JsonLinesFormatter(logging.Formatter):
+    """
+    Ein JSON-Objekt pro Zeile mit Zeit, Level, Thread, Nachricht und (falls gesetzt) Besuchs-URL.
+    """
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "visit_url", None):
+            entry["url"] = record.visit_url
+        return json.dumps(entry, ensure_ascii=False)
 
-def get_root_domain(url):
-    ext = tldextract.extract(url)
-    if not ext.suffix:
-        # fallback to hostname parser
-        parsed = urlparse(url if "://" in url else "https://" + url)
-        hostname = parsed.hostname or ""
-        if hostname.startswith("www."):
-            hostname = hostname[4:]
-        return hostname
-    return f"{ext.domain}.{ext.suffix}"
+def tag_log_record(record):
+    # Läuft noch im aufrufenden Thread, dort ist current_visit gesetzt
+    trace = current_visit.get()
+    record.visit_url = trace.url if trace is not None else None
+    return True
 
-def get_hostname(url):
-    parsed = urlparse(url if "://" in url else "https://" + url)
-    hostname = parsed.hostname or ""
-    if hostname.startswith("www."):
-        hostname = hostname[4:]
-    return hostname
+def gzip_rotator(source, dest):
+    with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
 
-def get_script_for_url(url):
-    hostname = get_root_domain(url)
-    # Sucht die Haupt-main.js im domain-spezifischen Unterordner
-    script_path = os.path.join(args.script_folder, hostname, "main.js")
-    if not os.path.isfile(script_path):
-        logger.warning("Script not found for %s: %s", hostname, script_path)
-        return None
-    try:
-        with open(script_path, "r", encoding="utf-8") as f:
-            contents = f.read()
-            return contents
-    except Exception as e:
-        logger.exception("Failed to read script for %s: %s", hostname, e)
-        return None
+def log_file_handler():
+    """
+    Returns:
+      Datei-Handler für --log_file: zeit- oder größenbasiert rotierend (Backups als .gz)
+      oder ein einfacher FileHandler bei --log_max_mb 0.
+    """
+    if args.log_rotate_when:
+        handler = logging.handlers.TimedRotatingFileHandler(args.log_file, when=args.log_rotate_when, backupCount=args.log_backups, encoding="utf-8")
+    elif args.log_max_mb > 0:
+        handler = logging.handlers.RotatingFileHandler(args.log_file, maxBytes=int(args.log_max_mb * 1024 * 1024), backupCount=args.log_backups, encoding="utf-8")
+    else:
+        return logging.FileHandler(args.log_file, encoding="utf-8")
+    handler.namer = lambda name: name + ".gz"
+    handler.rotator = gzip_rotator
+    return handler
 
-# ----------------------------
-# Browser creation and helpers
-# ----------------------------
-def create_browser_attempt(attempt=1, max_attempts=4):
-    logger.info("Creating Chrome WebDriver (attempt %d/%d)...", attempt, max_attempts)
-    
-    options = Options()
-    
-    # 1. Entfernen des "Chrome wird von automatisierter Software gesteuert" Balkens
-    options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    options.add_experimental_option('useAutomationExtension', False)
-    options.add_argument("--disable-blink-features=AutomationControlled")
+def setup_logging():
+    """
+    Hängt Konsolen- und Datei-Handler an (erst beim Start, nicht schon beim Import).
+    Logger und Konsole schreiben nur in eine Queue, Formatierung, Datei-I/O und
+    Rotation laufen im Thread des QueueListener.
+    """
+    global log_listener
+    if log_listener is not None:
+        return
 
-    if not args.show_browser:
-        options.add_argument("--headless=new") # Modernes Headless
-    
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--start-maximized")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--disable-background-networking")
-    options.add_argument("--disable-sync")
-    options.add_argument("--ignore-certificate-errors")
-    options.add_argument("--ignore-certificate-errors-spki-list")
-    options.add_argument("--ignore-ssl-errors")
-    options.add_argument("--log-level=3")
-
-    options.add_argument("--autoplay-policy=no-user-gesture-required")
+    def from_logger(record):
+        return record.name != console.name
 
-    if args.mute:
-        options.add_argument("--mute-audio")
+    # console
+    ch = logging.StreamHandler(sys.stdout)
+    ch.setFormatter(formatter)
+    ch.setLevel(logging.INFO)
+    ch.addFilter(from_logger)
 
-    # User Agent Spoofing (optional, macht es "menschlicher")
-    options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36")
+    # emoji output
+    eh = logging.StreamHandler(sys.stdout)
+    eh.setFormatter(logging.Formatter("%(message)s"))
+    eh.addFilter(logging.Filter(console.name))
 
-    try:
-        driver = webdriver.Chrome(options=options)
-        return driver
-    except Exception as e:
-        logger.exception("Failed to create WebDriver on attempt %d: %s", attempt, e)
-        # small backoff before reattempting
-        if attempt < max_attempts:
-            wait = 1 + attempt * 2
-            logger.info("Waiting %s seconds before retrying WebDriver creation...", wait)
-            time.sleep(wait)
-            return create_browser_attempt(attempt + 1, max_attempts)
-        raise
+    # file
+    fh = log_file_handler()
+    fh.setFormatter(JsonLinesFormatter() if args.log_format == "json" else formatter)
+    fh.setLevel(logging.DEBUG)
+    fh.addFilter(from_logger)
 
-# ----------------------------
-# Wait for page load helper (resilient)
-# ----------------------------
-def wait_for_page_load(driver, timeout=30):
-    try:
-        WebDriverWait(driver, timeout).until(
-            lambda d: d.execute_script("return document.readyState") == "complete"
-        )
-    except TimeoutException:
-        print("⚠️  Zeitüberschreitung beim Laden der Seite (document.readyState).")
-    except WebDriverException as e:
-        logger.debug("WebDriverException while waiting for page load: %s", e)
+    log_queue = queue.SimpleQueue()
+    qh = logging.handlers.QueueHandler(log_queue)
+    qh.addFilter(tag_log_record)
+    logger.addHandler(qh)
+    if not args.quiet:
+        console.addHandler(qh)
 
-# Alias
-wait_for_page_load_complete = wait_for_page_load 
+    log_listener = logging.handlers.QueueListener(log_queue, ch, eh, fh, respect_handler_level=True)
+    log_listener.start()
+    atexit.register(stop_logging)
 
-# ----------------------------
-# Kurze Pause Helper
-# ----------------------------
-def random_sleep(min_s=0.1, max_s=0.5):
-    time.sleep(random.uniform(min_s, max_s))
+def stop_logging():
+    """
+    Wartet, bis alle Zeilen aus der Queue geschrieben sind, und beendet den Listener-Thread.
+    Daemon-Worker, die danach noch loggen, landen in einem NullHandler statt über
+    logging.lastResort auf stderr.
+    """
+    global log_listener
+    if log_listener is None:
+        return
+    for target in (logger, console):
+        if not any(isinstance(handler, logging.NullHandler) for handler in target.handlers):
+            target.addHandler(logging.NullHandler())
+        for handler in list(target.handlers):
+            if isinstance(handler, logging.handlers.QueueHandler):
+                target.removeHandler(handler)
+    log_listener.stop()
+    for handler in log_listener.handlers:
+        handler.close()
+    log_listener = None
+
+def say(message=""):
+    """
+    Emoji-Fortschrittsausgabe auf der Konsole; blockiert nicht und entfällt mit --quiet.
+    """
+    console.info(message)
 
 # ----------------------------
-# KORRIGIERTE FUNKTION: Ausführung der asynchronen main.js
+# Live-Konfiguration (--config, Neuladen per SIGHUP oder Dateiänderung)
 # ----------------------------
-def execute_async_js_script(driver, js_script, url):
+def choice_of(*choices):
+    def convert(value):
+        if value not in choices:
+            raise ValueError(f"{value!r} is not one of {', '.join(choices)}")
+        return value
+    return convert
+
+def number(kind, minimum=0, maximum=None, positive=False):
+    def convert(value):
+        value = kind(value)
+        if positive and value <= 0:
+            raise ValueError(f"{value} must be greater than 0")
+        if value < minimum or (maximum is not None and value > maximum):
+            raise ValueError(f"{value} is not between {minimum} and {maximum}" if maximum is not None else f"{value} must be at least {minimum}")
+        return value
+    return convert
+
+# Einstellungen, die --config setzen und zur Laufzeit ändern darf (Name -> Konvertierung)
+LIVE_SETTINGS = {
+    "sleep_seconds": number(int),
+    "loop_sleep": number(int),
+    "scroll_chance": number(float, maximum=1),
+    "scroll_min_random_time": number(float),
+    "scroll_max_random_time": number(float, positive=True),
+    "interaction_batch_window": number(float),
+    "playback_probes": number(int),
+    "playback_probe_window": number(float),
+    "no_playback": choice_of("continue", "skip", "retry"),
+    "page_load_timeout": number(float, positive=True),
+    "script_timeout": number(float, positive=True),
+    "max_retries": number(int),
+    "retry_backoff": number(float),
+    "retry_backoff_max": number(float),
+    "retry_jitter": number(float, maximum=1),
+    "recycle_after_visits": number(int),
+    "recycle_js_heap_mb": number(float),
+    "recycle_rss_mb": number(float),
+}
+
+# Werden nur global (args) gelesen, nicht pro URL -> nur in "default" erlaubt
+GLOBAL_ONLY_SETTINGS = {
+    "loop_sleep", "interaction_batch_window", "retry_backoff", "retry_backoff_max", "retry_jitter",
+    "recycle_after_visits", "recycle_js_heap_mb", "recycle_rss_mb",
+}
+
+class LiveConfig:
     """
-    Führt das asynchrone JS-Skript aus (window.automatePage()) und wartet auf den Status.
-    
-    Returns:
-      action_string ('success', 'restart') oder None bei Fehler.
+    Schichten (spätere gewinnen): argparse-Defaults, "default" aus --config, Werte von der
+    Kommandozeile (die vom Default abweichen), "<root-domain>" aus --config. Überdeckt die
+    Kommandozeile einen Wert aus "default", gibt es bei jedem Laden eine Warnung; wird er
+    in der Datei geändert, übernimmt ab dann die Datei.
+
+    Globale Werte werden direkt in args geschrieben, jeder Lesezugriff sieht also den
+    aktuellen Stand; Domain-Overrides liefert get(name, url). Neu geladen wird per SIGHUP
+    oder wenn sich die mtime der Datei ändert. Ist die Datei ungültig, bleibt der alte Stand.
     """
-    domain = get_root_domain(url)
-    try:
-        # 1. Injiziere den gesamten JS-Code, um window.automatePage zu definieren.
-        driver.execute_script(js_script)
-        
-        # 2. Rufe die definierte Funktion asynchron auf und warte auf den Callback.
-        # Wir wickeln den Aufruf in einen Wrapper, der den Selenium-Callback nutzt.
-        async_wrapper = """
-        var done = arguments[arguments.length - 1]; // Selenium Callback
-        if (typeof window.automatePage === 'function') {
-            window.automatePage()
-                .then(function(res) { done(res); })
-                .catch(function(err) { done('error: ' + err); });
-        } else {
-            done('error: automatePage not defined');
-        }
+    def __init__(self, path, poll_interval=5.0):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.wakeup = threading.Event()
+        self.mtime = None
+        self.domains = {}
+        self.defaults = None
+        self.thread = None
+        self.cli = {name: getattr(args, name) for name in LIVE_SETTINGS if getattr(args, name) != parser.get_default(name)}
+        if path:
+            self.load()
+
+    def _parse(self, raw):
         """
-        
-        # execute_async_script wartet, bis 'done()' im JS aufgerufen wird
-        action = driver.execute_async_script(async_wrapper)
-        
-        # Sicherheitsprüfung für den Rückgabewert
-        if not isinstance(action, str):
-            logger.warning(f"[{domain}] JS-Skript gab keinen String zurück: {action}. Behandele als Fehler.")
+        Returns:
+          {"default" / "<root-domain>": {name: konvertierter Wert}}; ValueError bei Fehlern.
+        """
+        if not isinstance(raw, dict):
+            raise ValueError("top level must be an object")
+        sections = {}
+        for section, values in raw.items():
+            if not isinstance(values, dict):
+                raise ValueError(f"section {section!r} must be an object")
+            sections[section] = {}
+            for name, value in values.items():
+                if name not in LIVE_SETTINGS:
+                    raise ValueError(f"unknown setting {name!r} in section {section!r}")
+                if name in GLOBAL_ONLY_SETTINGS and section != "default":
+                    raise ValueError(f"setting {name!r} is only allowed in 'default', not in section {section!r}")
+                try:
+                    sections[section][name] = LIVE_SETTINGS[name](value)
+                except (TypeError, ValueError) as e:
+                    raise ValueError(f"{section}.{name}: {e}")
+            values = sections[section]
+            if values.get("scroll_min_random_time", 0) > values.get("scroll_max_random_time", float("inf")):
+                raise ValueError(f"{section}: scroll_min_random_time is larger than scroll_max_random_time")
+        return sections
+
+    def load(self):
+        mtime = os.stat(self.path).st_mtime
+        with open(self.path, "r", encoding="utf-8") as f:
+            sections = self._parse(json.load(f))
+        defaults = sections.pop("default", {})
+        changes = []
+        for name in LIVE_SETTINGS:
+            if name in self.cli and name in defaults:
+                if self.defaults is not None and defaults[name] != self.defaults.get(name):
+                    logger.info("%s was changed in %s, it now replaces the command line value %s", name, self.path, self.cli[name])
+                    del self.cli[name]
+                else:
+                    logger.warning("Command line value %s=%s overrides %s=%s from %s until it is changed there", name, self.cli[name], name, defaults[name], self.path)
+            value = self.cli.get(name, defaults.get(name, parser.get_default(name)))
+            if getattr(args, name) != value:
+                changes.append(f"{name}={value}")
+                setattr(args, name, value)
+        self.domains = sections
+        self.defaults = defaults
+        self.mtime = mtime
+        return changes
+
+    def reload(self):
+        try:
+            changes = self.load()
+        except (OSError, ValueError) as e:
+            # Nicht bei jedem Poll erneut melden, erst nach der nächsten Änderung
+            self.mtime = self._stat()
+            logger.error("Could not reload %s, keeping the previous settings: %s", self.path, e)
+            return
+        logger.info("Reloaded %s: %s, overrides for %d domains", self.path, ", ".join(changes) or "no global changes", len(self.domains))
+
+    def get(self, name, url=None):
+        if url is not None and self.domains:
+            overrides = self.domains.get(get_root_domain(url))
+            if overrides and name in overrides:
+                return overrides[name]
+        return getattr(args, name)
+
+    def start(self):
+        """
+        Startet die Überwachung der Datei; SIGHUP (falls vorhanden) lädt sofort neu.
+        """
+        if not self.path or self.thread is not None:
+            return
+        if hasattr(signal, "SIGHUP") and threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGHUP, lambda signum, frame: self.wakeup.set())
+        self.thread = threading.Thread(target=self._watch, name="config-watch", daemon=True)
+        self.thread.start()
+        logger.info("Using live settings from %s (overrides for %d domains), reloading on change or SIGHUP.", self.path, len(self.domains))
+
+    def _stat(self):
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
             return None
-        
-        # Gib nur erlaubte Aktionen zurück
-        action = action.lower()
-        if 'error' in action:
-             logger.warning(f"[{domain}] JS Fehler gemeldet: {action}")
-             return None
 
-        return action if action in ['success', 'restart'] else None
-            
-    except JavascriptException as e:
-        logger.warning(f"[{domain}] JavaScript Fehler bei asynchroner Ausführung: {e}")
-        return None
-    except Exception as e:
-        logger.warning(f"[{domain}] Unerwarteter Fehler bei asynchroner JS-Ausführung: {e}")
-        return None
+    def _watch(self):
+        while True:
+            signalled = self.wakeup.wait(self.poll_interval)
+            self.wakeup.clear()
+            mtime = self._stat()
+            if mtime is None:
+                continue
+            if signalled or mtime != self.mtime:
+                self.reload()
 
-# ----------------------------
-# Lange Pause Helper
-# ----------------------------
-def random_long_sleep(min_s=1.0, max_s=3.0):
-    time.sleep(random.uniform(min_s, max_s))
+try:
+    live_config = LiveConfig(args.config, args.config_poll_interval)
+except (OSError, ValueError) as e:
+    parser.error(f"--config {args.config}: {e}")
+
+def setting(name, url=None):
+    """
+    Aktueller Wert einer Live-Einstellung, mit Domain-Override für url (falls angegeben).
+    """
+    return live_config.get(name, url)
 
 # ----------------------------
-# Cookie und Play Button Handling
+# Visit-Metriken (Spans, JSON-Lines, Prometheus-Text, Stats-Datei)
 # ----------------------------
-def attempt_cleanup_actions(driver):
+PHASE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, float("inf"))
+
+current_visit = contextvars.ContextVar("current_visit", default=None)
+last_visit = contextvars.ContextVar("last_visit", default=None)
+
+class VisitTrace:
     """
-    Versucht nacheinander, Pop-ups oder Banner zu schließen/akzeptieren.
+    Zeitspannen (Sekunden) eines einzelnen Besuchs, z.B. driver_get, ready_wait, script_run.
     """
-    # KONSOLIDIERTER XPATH für Schließen/Ablehnen
-    # (Syntaktisch korrigiert, damit das Skript ausführbar ist)
-    try:
-        close_xpath_combined = (
-            "//button[.='x' or .='X' or @aria-label='Close' or @title='Close' or @aria-label='Anmelden' or @title='Anmelden' or @aria-label='Cookie Hinweis' or @title='Cookie Hinweis']"
-            + "| //*[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'schlie') or contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'abbrechen') or contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'spaeter') or contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'not now') or contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'later')]"
-            + "| //*[contains(@class, 'modal-close') or contains(@class, 'close-button') or contains(@class, 'dismiss') or contains(@class, 'fancybox-close') or contains(@class, 'lightbox-close')]"
-        )
-        # Hier könnte Logik stehen, um diesen XPath zu klicken, aber im Original fehlte der Codeblock.
-        # Wir lassen es als Platzhalter stehen, falls später Logik ergänzt wird.
-        pass
-    except Exception:
-        pass
+    def __init__(self, url):
+        self.url = url
+        self.domain = get_root_domain(url)
+        self.started = time.time()
+        self.spans = {}
+        self.failure = None
+        self.playback_seconds = None
 
-def click_element_safely(driver, element, name="Element"):
-    try:
-        driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", element)
-        time.sleep(0.5)
-        # Versuch 1: Normaler Klick
-        element.click()
-        print(f"✅ Klick auf '{name}' erfolgreich.")
-        return True
-    except (ElementClickInterceptedException, Exception):
-        try:
-            # Versuch 2: JS Klick (erzwungen)
-            driver.execute_script("arguments[0].click();", element)
-            print(f"✅ Klick auf '{name}' per JS erzwungen.")
-            return True
-        except Exception as e:
-            print(f"❌ Konnte '{name}' nicht klicken: {e}")
-    return False
+    def add(self, phase, seconds):
+        self.spans[phase] = self.spans.get(phase, 0.0) + seconds
 
-def handle_cookies(driver):
+def mark_visit_failure(kind):
     """
-    Sucht nach Cookie-Bannern basierend auf Text-Keywords.
+    Klassifiziert den Fehlschlag des laufenden Besuchs ("timeout", "webdriver",
+    "js_restart", "no_playback" oder "unexpected") für Retry-Backoff und Circuit-Breaker.
     """
-    print("🍪 [Fallback] Prüfe auf Cookie-Banner...")
-    
-    # Liste der Suchbegriffe (Case-Insensitive Logik via XPath)
-    keywords = [
-        "akzeptieren", "alle akzeptieren", "annehmen", "alle annehmen", "zulassen", "alle zulassen", "einverstanden", "erlauben", "alle cookies erlauben", "accept", "accept all", "allow all", "i agree"
-    ]
-    
-    found = False
-    for keyword in keywords:
-        if found: break
-        try:
-            xpath = f"//button[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '{keyword}')] | " \
-                    f"//a[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '{keyword}')] | " \
-                    f"//div[@role='button' and contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '{keyword}')]"
-            
-            elements = driver.find_elements(By.XPATH, xpath)
-            
-            for elem in elements:
-                if elem.is_displayed():
-                    print(f"   -> Möglicher Cookie-Button gefunden: '{elem.text.strip()}'")
-                    if click_element_safely(driver, elem, f"Cookie: {keyword}"):
-                        found = True
-                        break
-        except Exception:
-            continue
-    
-    if not found:
-        print("   -> Kein offensichtlicher Cookie-Banner gefunden (oder bereits akzeptiert).")
+    trace = current_visit.get()
+    if trace is not None and trace.failure is None:
+        trace.failure = kind
 
-def handle_play_buttons(driver):
+def last_visit_failure():
     """
-    Sucht nach Play-Buttons basierend auf Text und gängigen Klassen.
+    Returns:
+      Die Fehlerklasse des zuletzt in diesem Kontext beendeten Besuchs oder None.
     """
-    print("▶️  [Fallback] Suche nach Play/Hörprobe/Shuffle Buttons...")
-    
-    # 1. Textbasierte Suche
-    text_keywords = ["Hoerprobe", "Abspielen", "Play", "Shuffle", "Listen"]
-    clicked = False
-    
-    for keyword in text_keywords:
-        if clicked: break
-        try:
-            xpath = f"//*[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '{keyword.lower()}')]"
-            elements = driver.find_elements(By.XPATH, xpath)
-            for elem in elements:
-                if elem.is_displayed() and elem.tag_name in ['button', 'a', 'span', 'div']:
-                    if click_element_safely(driver, elem, f"Play-Text: {keyword}"):
-                        clicked = True
-                        break
-        except Exception:
-            pass
-
-    # 2. Suche nach Symbolen/Klassen
-    if not clicked:
-        css_selectors = [
-            ".playbutton", ".play-button", ".playControl", # Bandcamp / Soundcloud
-            "button[aria-label*='Play']", "button[title*='Play']",
-            ".ytp-play-button", # Youtube
-            ".audio-player-play"
-        ]
-        
-        for selector in css_selectors:
-            if clicked: break
-            try:
-                elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                for elem in elements:
-                    if elem.is_displayed():
-                        if click_element_safely(driver, elem, f"Play-Icon: {selector}"):
-                            clicked = True
-                            break
-            except Exception:
-                pass
-    
-    if not clicked:
-        print("   -> Keinen Play-Button gefunden.")
-        
-# ----------------------------
-# Realistic interaction (resilient)
-# ----------------------------
-def realistic_user_interaction(driver, duration_seconds, scroll_chance=None):
-    if scroll_chance is None:
-        scroll_chance = args.scroll_chance
-    end_time = time.time() + duration_seconds
-    
-    print(f"⏱️  Verweile auf der Seite für ca. {duration_seconds} Sekunden...")
+    trace = last_visit.get()
+    return trace.failure if trace is not None else None
 
+@contextlib.contextmanager
+def visit_phase(phase):
+    trace = current_visit.get()
+    start = time.perf_counter()
     try:
-        actions = ActionChains(driver)
-        # get body element for safe move_to_element_with_offset
-        try:
-            body = driver.find_element(By.TAG_NAME, "body")
-        except Exception:
-            body = None
+        yield
+    finally:
+        if trace is not None:
+            trace.add(phase, time.perf_counter() - start)
 
-        while time.time() < end_time:
-            if random.random() < scroll_chance:
-                try:
-                    key = random.choice([Keys.PAGE_DOWN, Keys.PAGE_UP])
-                    # use actions on body if available, else send_keys directly
-                    if body is not None:
-                        actions.move_to_element_with_offset(body, 1, 1).send_keys(key).perform()
-                    else:
-                        actions.send_keys(key).perform()
-                    logger.debug("Pressed %s during interaction", "PAGE_DOWN" if key == Keys.PAGE_DOWN else "PAGE_UP")
-                except MoveTargetOutOfBoundsException:
-                    try:
-                        actions = ActionChains(driver)  # reset and try direct send
-                        actions.send_keys(key).perform()
-                        logger.debug("Fallback: direct send_keys after MoveTargetOutOfBoundsException")
-                    except Exception as e:
-                        logger.debug("Failed to send key during realistic interaction: %s", e)
-            # random short sleep
-            try:
-                time.sleep(random.uniform(args.scroll_min_random_time, args.scroll_max_random_time))
-            except Exception:
-                # guard against weird interruptions
-                time.sleep(0.5)
-    except Exception as e:
-        # don't crash the main flow if interactions fail
-        logger.debug("realistic_user_interaction error: %s", e)
+def timed_phase(phase):
+    """
+    Decorator: rechnet die Laufzeit der Funktion dem laufenden Besuch als Phase an.
+    """
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*func_args, **func_kwargs):
+                with visit_phase(phase):
+                    return await func(*func_args, **func_kwargs)
+            return async_wrapper
 
-# Alias
-run_interaction = realistic_user_interaction
+        @functools.wraps(func)
+        def wrapper(*func_args, **func_kwargs):
+            with visit_phase(phase):
+                return func(*func_args, **func_kwargs)
+        return wrapper
+    return decorator
 
-# ----------------------------
-# Process single URL with retries and safe failure modes
-# ----------------------------
-def process_url(driver, url):
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * len(PHASE_BUCKETS)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(PHASE_BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.total += value
+        self.count += 1
+
+class VisitMetrics:
     """
-    Returns:
-      None -> success (visit complete)
-      "restart" -> caller should restart the browser (driver has been quit)
-      "skip" -> skip this URL (non-recoverable or file missing)
+    Sammelt Besuchs-Spans pro Domain, schreibt sie optional als JSON-Lines (--trace_file)
+    und stellt Zähler/Histogramme als Prometheus-Text (--metrics_port) bzw. als
+    periodische Stats-Datei (--stats_file) bereit.
     """
-    logger.info("Loading URL: %s", url)
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.visits = {}
+        self.failures = {}
+        self.phases = {}
+        self.drivers = {}
+        self.playback = {}
+        self.trace_stream = None
 
-    print(f"\n{'='*60}")
-    print(f"🌍 Lade URL: {url}")
-    print(f"{'='*60}")
+    def open_trace_file(self, path):
+        if path:
+            self.trace_stream = open(path, "a", encoding="utf-8")
 
-    try:
-        # 1. Seite laden
-        if not url.startswith("http"):
-            url = "https://" + url
-        
-        driver.get(url)
+    def _emit(self, record):
+        if self.trace_stream is not None:
+            self.trace_stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.trace_stream.flush()
 
-        # 2. Warten bis vollständig geladen
-        wait_for_page_load_complete(driver)
-        print("✅ Seite geladen.")
+    def _observe(self, phase, domain, seconds):
+        key = (phase, domain)
+        if key not in self.phases:
+            self.phases[key] = Histogram()
+        self.phases[key].observe(seconds)
 
-        # 3. Kurze Pause
-        print("⏳ Kurze Pause (Init)...")
-        random_long_sleep(1, 3)
-        
-        # 4. JavaScript aus Ordner laden (falls vorhanden)
-        hostname = get_root_domain(url)
-        script_path = os.path.join(args.script_folder, hostname, "main.js")
-        
-        # Flag um zu speichern, ob JS erfolgreich war
-        js_was_successful = False
+    def finish_visit(self, trace, outcome):
+        duration = time.time() - trace.started
+        with self.lock:
+            key = (trace.domain, outcome)
+            self.visits[key] = self.visits.get(key, 0) + 1
+            if trace.failure:
+                failure_key = (trace.domain, trace.failure)
+                self.failures[failure_key] = self.failures.get(failure_key, 0) + 1
+            if trace.playback_seconds:
+                self.playback[trace.domain] = self.playback.get(trace.domain, 0.0) + trace.playback_seconds
+            self._observe("total", trace.domain, duration)
+            for phase, seconds in trace.spans.items():
+                self._observe(phase, trace.domain, seconds)
+            self._emit({
+                "ts": round(trace.started, 3),
+                "event": "visit",
+                "url": trace.url,
+                "domain": trace.domain,
+                "outcome": outcome,
+                "failure": trace.failure,
+                "duration": round(duration, 3),
+                "playback_seconds": trace.playback_seconds,
+                "spans": {phase: round(seconds, 3) for phase, seconds in trace.spans.items()},
+            })
 
-        # HIER WIRD DIE LOGIK FÜR DIE ASYNCHRONE main.js INTEGRIERT
-        if os.path.isfile(script_path):
-            try:
-                with open(script_path, 'r', encoding='utf-8') as f:
-                    js_content = f.read()
-                    print(f"📜 Führe benutzerdefiniertes ASYNCHRONES JS für {hostname} aus...")
-                    
-                    # Führt die neue main.js aus und wartet auf das Ergebnis
-                    action = execute_async_js_script(driver, js_content, url)
-                    
-                    if action == 'success':
-                        print(f"✅ ASYNCHRONES JS erfolgreich (Play gedrückt oder läuft bereits).")
-                        # WICHTIG: KEIN Return hier! Wir wollen auf der Seite bleiben.
-                        js_was_successful = True 
-                    elif action == 'restart':
-                        print(f"♻️ ASYNCHRONES JS fordert Browser-Neustart an (Timeout).")
-                        return "restart" 
-                    else:
-                        print(f"⚠️ ASYNCHRONES JS beendet ohne 'success'. Nutze Python-Fallbacks.")
-            except Exception as e:
-                print(f"⚠️  Fehler beim Laden/Ausführen des benutzerdefinierten JS: {e}")
+    def playback_total(self):
+        """
+        Returns:
+          Summe der effektiven Wiedergabesekunden aller bisherigen Besuche.
+        """
+        with self.lock:
+            return sum(self.playback.values())
+
+    def observe_restart(self, url, seconds):
+        domain = get_root_domain(url)
+        with self.lock:
+            self._observe("restart", domain, seconds)
+            self._emit({"ts": round(time.time(), 3), "event": "restart", "url": url, "domain": domain, "duration": round(seconds, 3)})
+
+    def observe_driver(self, state, record):
+        """
+        Ressourcen eines Browsers ("sample" zwischen zwei Besuchen, "retired" beim Beenden).
+        """
+        with self.lock:
+            if state == "retired":
+                self.drivers.pop(record["label"], None)
+            else:
+                self.drivers[record["label"]] = record
+            self._emit(dict(record, ts=round(time.time(), 3), event="driver", state=state))
+
+    def render_prometheus(self):
+        lines = [
+            "# HELP website_visitor_visits_total Finished visits by domain and outcome.",
+            "# TYPE website_visitor_visits_total counter",
+        ]
+        with self.lock:
+            for (domain, outcome), count in sorted(self.visits.items()):
+                lines.append(f'website_visitor_visits_total{{domain="{domain}",outcome="{outcome}"}} {count}')
+            lines.append("# HELP website_visitor_failures_total Failed visit attempts by domain and failure class.")
+            lines.append("# TYPE website_visitor_failures_total counter")
+            for (domain, kind), count in sorted(self.failures.items()):
+                lines.append(f'website_visitor_failures_total{{domain="{domain}",kind="{kind}"}} {count}')
+            lines.append("# HELP website_visitor_playback_seconds_total Effective audio/video playback seconds measured by the playback probe.")
+            lines.append("# TYPE website_visitor_playback_seconds_total counter")
+            for domain, seconds in sorted(self.playback.items()):
+                lines.append(f'website_visitor_playback_seconds_total{{domain="{domain}"}} {seconds:.1f}')
+            lines.append("# HELP website_visitor_phase_seconds Time spent per visit phase.")
+            lines.append("# TYPE website_visitor_phase_seconds histogram")
+            for (phase, domain), hist in sorted(self.phases.items()):
+                labels = f'phase="{phase}",domain="{domain}"'
+                cumulative = 0
+                for bound, count in zip(PHASE_BUCKETS, hist.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(float(bound))
+                    lines.append(f'website_visitor_phase_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+                lines.append(f"website_visitor_phase_seconds_sum{{{labels}}} {hist.total:.6f}")
+                lines.append(f"website_visitor_phase_seconds_count{{{labels}}} {hist.count}")
+            lines.append("# HELP website_visitor_driver_rss_bytes RSS of each browser's chromedriver/Chrome process tree.")
+            lines.append("# TYPE website_visitor_driver_rss_bytes gauge")
+            for label, record in sorted(self.drivers.items()):
+                lines.append(f'website_visitor_driver_rss_bytes{{driver="{label}"}} {int(record["rss_mb"] * 1024 * 1024)}')
+            lines.append("# HELP website_visitor_driver_cpu_percent CPU usage of each browser's process tree since the previous visit.")
+            lines.append("# TYPE website_visitor_driver_cpu_percent gauge")
+            for label, record in sorted(self.drivers.items()):
+                lines.append(f'website_visitor_driver_cpu_percent{{driver="{label}"}} {record["cpu_percent"]:.1f}')
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        """
+        Per-Domain-Übersicht für die Stats-Datei.
+        """
+        domains = {}
+        with self.lock:
+            for (domain, outcome), count in self.visits.items():
+                domains.setdefault(domain, {"visits": {}, "failures": {}, "phases": {}})["visits"][outcome] = count
+            for (domain, kind), count in self.failures.items():
+                domains.setdefault(domain, {"visits": {}, "failures": {}, "phases": {}})["failures"][kind] = count
+            for (phase, domain), hist in self.phases.items():
+                domains.setdefault(domain, {"visits": {}, "failures": {}, "phases": {}})["phases"][phase] = {
+                    "count": hist.count,
+                    "sum": round(hist.total, 3),
+                    "mean": round(hist.total / hist.count, 3) if hist.count else 0.0,
+                }
+            for domain, seconds in self.playback.items():
+                domains.setdefault(domain, {"visits": {}, "failures": {}, "phases": {}})["playback_seconds"] = round(seconds, 1)
+            drivers = {label: dict(record) for label, record in self.drivers.items()}
+        return {"ts": round(time.time(), 3), "domains": domains, "drivers": drivers}
+
+    def write_stats_file(self, path):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def start_exporters(self, port=0, stats_file=None, stats_interval=60):
+        if port:
+            metrics = self
+
+            class MetricsHandler(http.server.BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.split("?")[0] != "/metrics":
+                        self.send_error(404)
+                        return
+                    body = metrics.render_prometheus().encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, format, *log_args):
+                    pass
+
+            server = http.server.ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+            threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+            logger.info("Metrics available at http://127.0.0.1:%d/metrics", port)
+
+        if stats_file:
+            def stats_loop():
+                while True:
+                    time.sleep(stats_interval)
+                    try:
+                        self.write_stats_file(stats_file)
+                    except Exception as e:
+                        logger.warning("Could not write stats file %s: %s", stats_file, e)
+            threading.Thread(target=stats_loop, name="stats-file", daemon=True).start()
+
+visit_metrics = VisitMetrics()
+
+def finish_trace(trace, outcome):
+    """
+    Meldet einen beendeten Besuch an visit_metrics und den Status-Store.
+    """
+    visit_metrics.finish_visit(trace, outcome)
+    visit_state.record_attempt(trace.url, outcome, time.time() - trace.started)
+
+def traced_visit(func):
+    """
+    Decorator für process_url()/process_url_async(): legt einen VisitTrace an und
+    meldet ihn nach dem Besuch mit dem Ergebnis an visit_metrics.
+    """
+    def finish(trace, token, action, failed):
+        current_visit.reset(token)
+        finish_trace(trace, "error" if failed else (action or "success"))
+
+    if asyncio.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(driver, url):
+            trace = VisitTrace(url)
+            token = current_visit.set(trace)
+            last_visit.set(trace)
+            action, failed = None, True
+            try:
+                action = await func(driver, url)
+                failed = False
+                return action
+            finally:
+                finish(trace, token, action, failed)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(driver, url):
+        trace = VisitTrace(url)
+        token = current_visit.set(trace)
+        last_visit.set(trace)
+        action, failed = None, True
+        try:
+            action = func(driver, url)
+            failed = False
+            return action
+        finally:
+            finish(trace, token, action, failed)
+    return wrapper
+
+# ----------------------------
+# Utility functions
+# ----------------------------
+def parse_url_line(line):
+    # Filtert leere Zeilen und Kommentare, entfernt Whitespace
+    line = line.strip()
+    if not line or line.startswith('#') or line.startswith('[source'):
+        return None
+    return line
+
+def read_urls_from_file():
+    if not os.path.exists(args.url_list):
+        print(f"❌ Datei nicht gefunden: {args.url_list}")
+        return []
+    lines = list(url_source.iter_urls())
+    logger.debug("Loaded %d URLs from %s", len(lines), args.url_list)
+    return lines
+
+def windowed_shuffle(items, window):
+    """
+    Mischt einen Strom mit einem Puffer fester Größe: jedes neue Element verdrängt ein
+    zufälliges aus dem Puffer. Listen bis zur Fenstergröße werden vollständig gemischt.
+    """
+    buffer = []
+    for item in items:
+        if len(buffer) < window:
+            buffer.append(item)
+            continue
+        index = random.randrange(window)
+        yield buffer[index]
+        buffer[index] = item
+    random.shuffle(buffer)
+    yield from buffer
+
+class UrlListCache:
+    def __init__(self):
+        self.size = -1
+        self.mtime = None
+        self.urls = None
+        self.signature = b""
+        self.ends_with_newline = True
+
+SIGNATURE_BYTES = 4096
+
+class UrlSource:
+    """
+    Liefert URLs als Strom aus einer Datei, einem Ordner mit *.txt-Listen oder stdin ("-").
+
+    Pro Datei wird die geparste Liste (bis --url_cache_max Einträge) zwischen den Runden
+    gehalten: unveränderte Dateien werden nicht neu geparst, bei reinem Anhängen werden
+    nur die neuen Bytes gelesen. Größere Listen werden jede Runde direkt von der Platte gestreamt.
+    """
+    def __init__(self, spec, cache_max=1000000):
+        self.spec = spec
+        self.cache_max = cache_max
+        self.caches = {}
+
+    def exists(self):
+        return self.spec == "-" or os.path.exists(self.spec)
+
+    def files(self):
+        if os.path.isdir(self.spec):
+            return sorted(
+                os.path.join(self.spec, name) for name in os.listdir(self.spec)
+                if name.endswith(".txt") and os.path.isfile(os.path.join(self.spec, name))
+            )
+        return [self.spec]
+
+    def known_total(self):
+        """
+        Anzahl URLs, falls alle Dateien unverändert im Cache liegen, sonst None.
+        """
+        if self.spec == "-":
+            return None
+        total = 0
+        for path in self.files():
+            cache = self.caches.get(path)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return None
+            if cache is None or cache.urls is None or (stat.st_size, stat.st_mtime) != (cache.size, cache.mtime):
+                return None
+            total += len(cache.urls)
+        return total
+
+    def iter_urls(self):
+        if self.spec == "-":
+            for line in sys.stdin:
+                url = parse_url_line(line)
+                if url is not None:
+                    yield url
+            return
+        for path in self.files():
+            yield from self._iter_file(path)
+
+    def _read_signature(self, f, end):
+        start = max(0, end - SIGNATURE_BYTES)
+        f.seek(start)
+        return f.read(end - start)
+
+    def _iter_file(self, path):
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            logger.warning("Could not read URL list %s: %s", path, e)
+            return
+        cache = self.caches.get(path)
+
+        if cache is not None and cache.urls is not None:
+            if (stat.st_size, stat.st_mtime) == (cache.size, cache.mtime):
+                yield from list(cache.urls)
+                return
+            if stat.st_size > cache.size and cache.ends_with_newline:
+                with open(path, "rb") as f:
+                    if self._read_signature(f, cache.size) == cache.signature:
+                        f.seek(cache.size)
+                        appended = f.read()
+                        new_urls = [url for url in (parse_url_line(line) for line in appended.decode("utf-8", errors="replace").splitlines()) if url]
+                        cache.urls.extend(new_urls)
+                        cache.size = cache.size + len(appended)
+                        cache.mtime = stat.st_mtime
+                        cache.signature = self._read_signature(f, cache.size)
+                        cache.ends_with_newline = appended.endswith(b"\n")
+                        logger.info("Picked up %d appended URLs from %s", len(new_urls), path)
+                        if len(cache.urls) > self.cache_max:
+                            cache.urls = None
+                        else:
+                            yield from list(cache.urls)
+                            return
+
+        # Vollständig (neu) lesen, dabei streamen
+        cache = UrlListCache()
+        urls = []
+        size = 0
+        last_line = b"\n"
+        with open(path, "rb") as f:
+            for raw in f:
+                size += len(raw)
+                last_line = raw
+                url = parse_url_line(raw.decode("utf-8", errors="replace"))
+                if url is None:
+                    continue
+                if urls is not None:
+                    urls.append(url)
+                    if len(urls) > self.cache_max:
+                        urls = None
+                yield url
+            cache.signature = self._read_signature(f, size)
+        cache.size = size
+        cache.mtime = stat.st_mtime
+        cache.urls = urls
+        cache.ends_with_newline = last_line.endswith(b"\n")
+        self.caches[path] = cache
+
+    def round(self):
+        """
+        Returns:
+          (Iterator über (Position, URL), Gesamtzahl oder None wenn unbekannt).
+          Leerer Iterator -> None statt Iterator.
+        """
+        total = self.known_total()
+        urls = self.iter_urls()
+        if args.url_shuffle:
+            say("mj🎲 Mische URLs...")
+            urls = windowed_shuffle(urls, args.shuffle_window)
+        items = enumerate(urls, start=1)
+        first = next(items, None)
+        if first is None:
+            return None, 0
+        return itertools.chain([first], items), total
+
+url_source = UrlSource(args.url_list, args.url_cache_max)
+
+@functools.lru_cache(maxsize=1)
+def domain_extractor():
+    """
+    Lädt tldextract beim ersten Aufruf. Die Suffix-Liste kommt nie aus dem Netz, sondern aus
+    --suffix_list oder dem mit tldextract gebündelten Snapshot; geparst wird sie nur einmal.
+    """
+    started = time.perf_counter()
+    import tldextract
+    if args.suffix_list:
+        suffix_list_urls = ("file://" + urllib.request.pathname2url(os.path.abspath(args.suffix_list)),)
+    else:
+        suffix_list_urls = ()
+    extractor = tldextract.TLDExtract(suffix_list_urls=suffix_list_urls)
+    extractor("example.com")
+    logger.info("Loaded public suffix list in %.0f ms", (time.perf_counter() - started) * 1000)
+    return extractor
+
+@functools.lru_cache(maxsize=4096)
+def get_root_domain(url):
+    ext = domain_extractor()(url)
+    if not ext.suffix:
+        # fallback to hostname parser
+        parsed = urlparse(url if "://" in url else "https://" + url)
+        hostname = parsed.hostname or ""
+        if hostname.startswith("www."):
+            hostname = hostname[4:]
+        return hostname
+    return f"{ext.domain}.{ext.suffix}"
+
+def get_hostname(url):
+    parsed = urlparse(url if "://" in url else "https://" + url)
+    hostname = parsed.hostname or ""
+    if hostname.startswith("www."):
+        hostname = hostname[4:]
+    return hostname
+
+def get_script_for_url(url):
+    hostname = get_root_domain(url)
+    # Bundle (core.js + overrides.json) oder eigenständige main.js der Domain
+    entry = script_registry.get(hostname)
+    if entry is None:
+        logger.warning("Script not found for %s: %s", hostname, os.path.join(args.script_folder, hostname))
+        return None
+    return entry.source
+
+# ----------------------------
+# Script-Registry (einmal laden, per mtime-Polling neu laden)
+# ----------------------------
+# Nach diesen Schlüsselwörtern beginnt mit "/" ein Regex-Literal, keine Division
+JS_REGEX_KEYWORDS = {"return", "typeof", "instanceof", "in", "of", "new", "delete", "void",
+                     "throw", "case", "do", "else", "yield", "await"}
+JS_TRAILING_WORD = re.compile(r"(?<![\w$.])([A-Za-z_$][\w$]*)\s*$")
+
+def _js_regex_allowed(out, last):
+    """
+    Returns:
+      True, wenn ein "/" an dieser Stelle ein Regex-Literal beginnt (nach einem Operator
+      oder Schlüsselwort wie return), False bei einer Division (nach einem Wert, auch
+      nach Postfix-++/--).
+    """
+    tail = "".join(out[-32:])
+    if last in "+-" and tail.rstrip().endswith(("++", "--")):
+        return False
+    if not last or last in "(,=:[!&|?{};+-*%<>~^":
+        return True
+    match = JS_TRAILING_WORD.search(tail)
+    return match is not None and match.group(1) in JS_REGEX_KEYWORDS
+
+def minify_js(source):
+    """
+    Entfernt Kommentare, Einrückung und Leerzeilen. Zeilenumbrüche bleiben erhalten
+    (automatische Semikolons), String-, Template- und Regex-Literale bleiben unverändert.
+    """
+    out = []
+    i, n = 0, len(source)
+    last = ""
+    while i < n:
+        c = source[i]
+        if c in "\"'`":
+            j = i + 1
+            while j < n and source[j] != c:
+                j += 2 if source[j] == "\\" else 1
+            out.append(source[i:j + 1])
+            last = c
+            i = j + 1
+        elif source.startswith("//", i):
+            j = source.find("\n", i)
+            i = n if j < 0 else j
+        elif source.startswith("/*", i):
+            j = source.find("*/", i + 2)
+            i = n if j < 0 else j + 2
+            while out and out[-1] == "\n" and i < n and source[i] in " \t":
+                i += 1
+        elif c == "/" and _js_regex_allowed(out, last):
+            # Regex-Literal (nach einem Operator oder Schlüsselwort, nicht nach einem Wert)
+            j, in_class = i + 1, False
+            while j < n and source[j] != "\n" and (source[j] != "/" or in_class):
+                if source[j] == "\\":
+                    j += 1
+                elif source[j] in "[]":
+                    in_class = source[j] == "["
+                j += 1
+            out.append(source[i:j + 1])
+            last = "/"
+            i = j + 1
+        elif c in "\r\n":
+            while out and out[-1] in (" ", "\t"):
+                out.pop()
+            if out and out[-1] != "\n":
+                out.append("\n")
+            i += 1
+            while i < n and source[i] in " \t":
+                i += 1
+        else:
+            out.append(c)
+            if not c.isspace():
+                last = c
+            i += 1
+    return "".join(out).strip()
+
+def build_script_bundle(core_source, overrides):
+    """
+    Setzt die Overrides aller Domains und die minifizierte core.js zu einem Bundle zusammen.
+
+    Returns:
+      (source, fingerprint) – der Fingerprint (sha1-Präfix) benennt das Bundle in DevTools.
+    """
+    body = "window.__wvDomainOverrides = " + json.dumps(overrides, sort_keys=True, ensure_ascii=False) + ";\n" + minify_js(core_source)
+    fingerprint = hashlib.sha1(body.encode("utf-8")).hexdigest()[:12]
+    return f"{body}\n//# sourceURL=wv-scripts-{fingerprint}.js", fingerprint
+
+class DomainScript:
+    def __init__(self, domain, path, mtime, source, digest=None):
+        self.domain = domain
+        self.path = path
+        self.mtime = mtime
+        self.source = source
+        self.digest = digest or hashlib.sha1(source.encode("utf-8")).hexdigest()
+
+class ScriptRegistry:
+    """
+    Indexiert --script_folder einmalig und lädt geänderte Dateien höchstens alle
+    poll_interval Sekunden nach. Domains mit <domain>/overrides.json teilen sich ein
+    Bundle aus core.js und allen Overrides, das pro Browser nur einmal per CDP für neue
+    Dokumente registriert wird; <domain>/main.js ist ein eigenständiges Skript und hat
+    Vorrang. Merkt sich pro Browser, welches Skript vorgeladen ist.
+    """
+    def __init__(self, folder, poll_interval=5.0):
+        self.folder = folder
+        self.poll_interval = poll_interval
+        self.lock = threading.Lock()
+        self.scripts = {}
+        self.files = {}
+        self.bundle = None
+        self.bundle_key = None
+        self.last_poll = None
+        self.preloaded = weakref.WeakKeyDictionary()
+
+    def _read(self, path, parse=None):
+        """
+        Liest eine Datei nur neu, wenn sich ihre mtime geändert hat.
+
+        Returns:
+          (mtime, Inhalt) oder None, wenn die Datei fehlt oder ungültig ist.
+        """
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return None
+        known = self.files.get(path)
+        if known is not None and known[0] == mtime:
+            return known
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                content = f.read()
+            if parse is not None:
+                content = parse(content)
+        except Exception as e:
+            logger.warning("Failed to read script file %s: %s", path, e)
+            return None
+        if known is not None:
+            logger.info("Reloaded changed script file %s.", path)
+        self.files[path] = (mtime, content)
+        return self.files[path]
+
+    def _scan(self):
+        try:
+            entries = sorted(os.scandir(self.folder), key=lambda entry: entry.name)
+        except OSError as e:
+            logger.warning("Could not read script folder %s: %s", self.folder, e)
+            return
+        found = {}
+        overrides = {}
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            path = os.path.join(entry.path, "main.js")
+            script = self._read(path)
+            if script is not None:
+                found[entry.name] = DomainScript(entry.name, path, script[0], script[1])
+                continue
+            path = os.path.join(entry.path, "overrides.json")
+            override = self._read(path, json.loads)
+            if override is not None:
+                overrides[entry.name] = (path, override[1])
+
+        core_path = os.path.join(self.folder, "core.js")
+        core = self._read(core_path) if overrides else None
+        if core is not None:
+            key = (core[0], tuple((domain, self.files[path][0]) for domain, (path, _) in sorted(overrides.items())))
+            if key != self.bundle_key:
+                source, fingerprint = build_script_bundle(core[1], {domain: override for domain, (_, override) in overrides.items()})
+                self.bundle = (source, fingerprint)
+                self.bundle_key = key
+                logger.info("Built script bundle %s: core.js %.1f KB -> %.1f KB with overrides for %d domains",
+                            fingerprint, len(core[1]) / 1024, len(source) / 1024, len(overrides))
+            source, fingerprint = self.bundle
+            for domain, (path, _) in overrides.items():
+                found[domain] = DomainScript(domain, path, self.files[path][0], source, fingerprint)
+        elif overrides:
+            logger.warning("%s is missing, ignoring overrides.json of %d domains", core_path, len(overrides))
+
+        if self.last_poll is None:
+            logger.debug("Indexed %d domain scripts in %s", len(found), self.folder)
+        self.scripts = found
+
+    def get(self, domain):
+        with self.lock:
+            now = time.monotonic()
+            if self.last_poll is None or now - self.last_poll >= self.poll_interval:
+                self._scan()
+                self.last_poll = now
+            return self.scripts.get(domain)
+
+    def preload(self, driver, entry):
+        """
+        Registriert das Skript per Page.addScriptToEvaluateOnNewDocument, damit es in jedem
+        neuen Dokument schon vorhanden ist. Gibt False zurück, wenn CDP nicht verfügbar ist.
+        """
+        with self.lock:
+            current = self.preloaded.get(driver)
+        if current is not None and current[0] == entry.digest:
+            return True
+        try:
+            if current is not None:
+                driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": current[1]})
+            result = driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": entry.source})
+        except Exception as e:
+            logger.debug("Could not preload script for %s via CDP: %s", entry.domain, e)
+            with self.lock:
+                self.preloaded.pop(driver, None)
+            return False
+        with self.lock:
+            self.preloaded[driver] = (entry.digest, result.get("identifier"))
+        return True
+
+    def unload(self, driver):
+        """
+        Entfernt das per preload() registrierte Skript, wenn die nächste Seite keines hat,
+        damit es nicht auf fremden Seiten weiterläuft.
+        """
+        with self.lock:
+            current = self.preloaded.pop(driver, None)
+        if current is None:
+            return
+        try:
+            driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": current[1]})
+        except Exception as e:
+            logger.debug("Could not remove preloaded script via CDP: %s", e)
+
+script_registry = ScriptRegistry(args.script_folder, args.script_poll_interval)
+
+@timed_phase("script_preload")
+def preload_domain_script(driver, url):
+    """
+    Vor driver.get(): Domain-Skript für das nächste Dokument vorladen (falls vorhanden)
+    und im Lean-Modus die Blockliste der Domain setzen.
+    """
+    lean_mode.apply(driver, url)
+    entry = script_registry.get(get_root_domain(url))
+    if entry is not None:
+        script_registry.preload(driver, entry)
+    else:
+        script_registry.unload(driver)
+
+# ----------------------------
+# Lean-Modus (Ressourcen blockieren, schnellere Bereitschaft)
+# ----------------------------
+# Ressourcentypen werden über Dateiendungen auf Network.setBlockedURLs-Muster abgebildet
+# (jeweils mit und ohne Query-String), weil Selenium keine CDP-Events (Fetch.requestPaused)
+# empfangen kann.
+LEAN_RESOURCE_TYPES = {
+    "image": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico"],
+    "font": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "stylesheet": ["*.css"],
+}
+
+LEAN_DEFAULTS = {
+    "block_types": ["image", "font"],
+    "block_patterns": [
+        "*doubleclick.net*", "*googlesyndication.com*", "*google-analytics.com*", "*googletagmanager.com*",
+        "*googleadservices.com*", "*facebook.net*", "*connect.facebook.com*", "*scorecardresearch.com*",
+        "*quantserve.com*", "*adnxs.com*", "*criteo.com*", "*hotjar.com*", "*taboola.com*", "*outbrain.com*",
+    ],
+    # Keine echte Allow-Liste: entfernt nur die exakt gleich geschriebenen Muster aus der Blockliste
+    "allow_patterns": [],
+    # Seite gilt als bereit, sobald das DOM steht und einer dieser Selektoren existiert
+    "ready_selector": "video, audio, .playbutton, .play-button, .playControl, .heroPlayButton, .ytp-play-button, [data-testid=\"play-button\"]",
+}
+
+class LeanMode:
+    """
+    Per-Domain Block-/Allow-Listen für Ressourcen (--lean, --lean_config).
+
+    Die Konfigurationsdatei ist JSON: {"default": {...}, "<root-domain>": {...}} mit den
+    Schlüsseln aus LEAN_DEFAULTS. Domain-Einträge überschreiben die Defaults schlüsselweise.
+    allow_patterns ist keine Allow-Liste für URLs: es entfernt Block-Muster, die exakt gleich
+    geschrieben sind (z.B. "*.svg" oder "*hotjar.com*"), aus der Blockliste der Domain.
+    Network.setBlockedURLs kennt keine Ausnahmen, einzelne URLs lassen sich also nicht
+    gegen ein breiteres Block-Muster freigeben.
+    """
+    def __init__(self, enabled, config_path=None):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.applied = weakref.WeakKeyDictionary()
+        self.config = {"default": dict(LEAN_DEFAULTS)}
+        if config_path:
+            with open(config_path, "r", encoding="utf-8") as f:
+                user_config = json.load(f)
+            self.config["default"].update(user_config.pop("default", {}))
+            self.config.update(user_config)
+
+    def settings_for(self, domain):
+        settings = dict(self.config["default"])
+        settings.update(self.config.get(domain, {}))
+        return settings
+
+    def blocked_patterns(self, domain):
+        settings = self.settings_for(domain)
+        patterns = list(settings.get("block_patterns", []))
+        for resource_type in settings.get("block_types", []):
+            for pattern in LEAN_RESOURCE_TYPES.get(resource_type.lower(), []):
+                patterns += [pattern, pattern + "?*"]
+        allowed = set(settings.get("allow_patterns", []))
+        # "*.svg" gibt auch die Variante mit Query-String frei
+        return [pattern for pattern in patterns if pattern not in allowed and not (pattern.endswith("?*") and pattern[:-2] in allowed)]
+
+    def ready_selector(self, url):
+        if not self.enabled:
+            return None
+        return self.settings_for(get_root_domain(url)).get("ready_selector") or None
+
+    def apply(self, driver, url):
+        """
+        Setzt die Blockliste für die Domain der nächsten Seite (nur wenn sie sich geändert hat).
+        """
+        if not self.enabled:
+            return
+        patterns = self.blocked_patterns(get_root_domain(url))
+        with self.lock:
+            if self.applied.get(driver) == patterns:
+                return
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        except Exception as e:
+            logger.debug("Could not set blocked URLs: %s", e)
+            return
+        with self.lock:
+            self.applied[driver] = patterns
+
+lean_mode = LeanMode(args.lean, args.lean_config)
+
+# ----------------------------
+# Profil-Vorlage (--profile_template)
+# ----------------------------
+# Cache-Verzeichnisse im user-data-dir, die zwischen Vorlage und Browsern geteilt werden.
+# index-dir wird nie übernommen, Chrome baut den Index beim Start aus den Einträgen neu auf.
+PROFILE_CACHE_DIRS = (os.path.join("Default", "Cache"), os.path.join("Default", "Code Cache"))
+PROFILE_CONSENT_FILE = "consent_cookies.json"
+PROFILE_COOKIE_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires")
+
+def profile_cache_files(root):
+    """
+    Returns:
+      Relative Pfade aller Cache-Einträge unter root (ohne Index-Dateien).
+    """
+    files = []
+    for cache_dir in PROFILE_CACHE_DIRS:
+        for dirpath, dirnames, filenames in os.walk(os.path.join(root, cache_dir)):
+            dirnames[:] = [name for name in dirnames if name != "index-dir"]
+            for name in filenames:
+                if name != "index" and not name.startswith("todelete_"):
+                    files.append(os.path.relpath(os.path.join(dirpath, name), root))
+    return files
+
+def browser_cookies(driver):
+    """
+    Returns:
+      Cookies der aktuellen Seite über CDP (Network.getCookies), None wenn nicht verfügbar.
+    """
+    try:
+        return driver.execute_cdp_cmd("Network.getCookies", {}).get("cookies", [])
+    except Exception as e:
+        logger.debug("Could not read cookies: %s", e)
+        return None
+
+class ProfileTemplates:
+    """
+    Gemeinsame Vorlage aus Chrome-Disk-Cache und akzeptierten Consent-Cookies pro Domain.
+    Jeder Browser startet mit einem Klon des Caches (Hardlinks oder Kopien) und bekommt die
+    Consent-Cookies per Network.setCookies. Nach dem Beenden wandern neue Cache-Einträge in
+    die Vorlage zurück, die regelmäßig auf --profile_cache_mb beschnitten wird.
+
+    Standard sind Kopien. Mit --profile_clone hardlink teilen sich Vorlage und Browser die
+    Einträge; da Chrome Einträge an Ort und Stelle umschreibt, ändert dann jeder laufende
+    Browser auch die Vorlage und die Caches der anderen.
+    """
+    def __init__(self, path, mode, cache_mb, prune_interval):
+        self.path = path
+        self.mode = mode
+        self.cache_bytes = int(cache_mb * 1024 * 1024)
+        self.prune_interval = prune_interval
+        self.lock = threading.Lock()
+        self.clones = {}
+        self.pending = {}
+        self.consent = {}
+        # Stand der Consent-Cookies pro Domain und welcher Stand in welchem Browser gesetzt ist
+        self.versions = {}
+        self.version_ids = itertools.count(1)
+        self.seeded = {}
+        self.last_prune = 0.0
+        if path:
+            os.makedirs(path, exist_ok=True)
+            self.consent = self._load_consent()
+            self.versions = {domain: 0 for domain in self.consent}
+
+    def _load_consent(self):
+        try:
+            with open(os.path.join(self.path, PROFILE_CONSENT_FILE), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_consent(self):
+        target = os.path.join(self.path, PROFILE_CONSENT_FILE)
+        with open(target + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self.consent, f, indent=2)
+        os.replace(target + ".tmp", target)
+
+    def _clone_file(self, source, target):
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        if self.mode == "hardlink":
+            try:
+                os.link(source, target)
+                return
+            except FileExistsError:
+                return
+            except OSError:
+                # z.B. anderes Dateisystem -> kopieren
+                pass
+        shutil.copy2(source, target)
+
+    def clone(self):
+        """
+        Returns:
+          Ein neues user-data-dir mit dem Cache der Vorlage oder None ohne --profile_template.
+        """
+        if not self.path:
+            return None
+        started = time.perf_counter()
+        target = tempfile.mkdtemp(prefix="wv_profile_")
+        files = profile_cache_files(self.path)
+        for rel in files:
+            try:
+                self._clone_file(os.path.join(self.path, rel), os.path.join(target, rel))
+            except OSError:
+                # Eintrag wurde gerade beschnitten
+                pass
+        logger.info("Cloned profile template (%d cache entries, %s) in %.0f ms",
+                    len(files), self.mode, (time.perf_counter() - started) * 1000)
+        return target
+
+    def attach(self, driver, profile_dir):
+        if profile_dir is not None:
+            with self.lock:
+                self.clones[id(driver)] = profile_dir
+
+    @staticmethod
+    def _valid_cookies(cookies, now):
+        # Session-Cookies (ohne expires) gelten, bis der Browser beendet wird
+        return [c for c in cookies if c.get("expires", now + 1) > now]
+
+    def _set_cookies(self, driver, cookies):
+        try:
+            driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+            logger.debug("Seeded %d consent cookies from profile template", len(cookies))
+            return True
+        except Exception as e:
+            logger.debug("Could not seed consent cookies: %s", e)
+            return False
+
+    def seed_cookies(self, driver):
+        """
+        Setzt alle gespeicherten Consent-Cookies mit einem einzigen CDP-Aufruf
+        (nach dem Start und nach einem Soft-Reset, der alle Cookies löscht).
+        """
+        now = time.time()
+        with self.lock:
+            versions = dict(self.versions)
+            cookies = [c for domain_cookies in self.consent.values() for c in self._valid_cookies(domain_cookies, now)]
+            self.seeded[id(driver)] = {}
+        if cookies and self._set_cookies(driver, cookies):
+            with self.lock:
+                self.seeded[id(driver)] = versions
+
+    def ensure_consent(self, driver, url):
+        """
+        Vor driver.get(): setzt die Consent-Cookies der Domain von url, falls dieser Browser
+        den aktuellen Stand noch nicht hat (z.B. weil ein anderer Browser sie erst nach
+        dessen Start gespeichert hat).
+
+        Returns:
+          True, wenn der Browser gültige Consent-Cookies der Domain hat und das Banner
+          übersprungen werden kann.
+        """
+        if not self.path:
+            return False
+        domain = get_root_domain(url)
+        now = time.time()
+        with self.lock:
+            cookies = self._valid_cookies(self.consent.get(domain, []), now)
+            version = self.versions.get(domain)
+            seeded = self.seeded.get(id(driver), {})
+            current = domain in seeded and seeded[domain] == version
+        if not cookies:
+            return False
+        if current:
+            return True
+        if not self._set_cookies(driver, cookies):
+            return False
+        with self.lock:
+            self.seeded.setdefault(id(driver), {})[domain] = version
+        return True
+
+    def cookie_snapshot(self, driver):
+        """
+        Returns:
+          Die Cookies vor einem Klick auf einen Cookie-Button (für consent_clicked()),
+          None ohne --profile_template oder wenn sie nicht lesbar sind.
+        """
+        if not self.path:
+            return None
+        cookies = browser_cookies(driver)
+        if cookies is None:
+            return None
+        return {(c.get("name"), c.get("domain"), c.get("value")) for c in cookies}
+
+    def consent_clicked(self, driver, before):
+        """
+        Nach einem erfolgreichen Klick auf einen Cookie-Button: remember_consent() speichert
+        dann die gegenüber before neuen Cookies. Ohne Klick bleibt nichts vorgemerkt, sonst
+        würden z.B. Analytics-Cookies als Consent gespeichert.
+        """
+        if before is not None:
+            with self.lock:
+                self.pending[id(driver)] = before
+
+    def remember_consent(self, driver, url):
+        """
+        Speichert die seit consent_clicked() neuen Cookies als Consent der Domain von url.
+        """
+        with self.lock:
+            before = self.pending.pop(id(driver), None)
+        if before is None:
+            return
+        cookies = [c for c in browser_cookies(driver) or [] if (c.get("name"), c.get("domain"), c.get("value")) not in before]
+        if not cookies:
+            return
+        stored = []
+        for cookie in cookies:
+            entry = {key: cookie[key] for key in PROFILE_COOKIE_FIELDS if key in cookie}
+            if cookie.get("session") or entry.get("expires", -1) <= 0:
+                entry.pop("expires", None)
+            stored.append(entry)
+        domain = get_root_domain(url)
+        with self.lock:
+            self.consent[domain] = stored
+            self.versions[domain] = next(self.version_ids)
+            self.seeded.setdefault(id(driver), {})[domain] = self.versions[domain]
+            self._save_consent()
+        logger.info("Stored %d consent cookies for %s in the profile template", len(stored), domain)
+
+    def release(self, driver):
+        """
+        Nach driver.quit(): neue Cache-Einträge in die Vorlage übernehmen, Klon löschen.
+        """
+        with self.lock:
+            profile_dir = self.clones.pop(id(driver), None)
+            self.pending.pop(id(driver), None)
+            self.seeded.pop(id(driver), None)
+        if profile_dir is None:
+            return
+        added = 0
+        try:
+            for rel in profile_cache_files(profile_dir):
+                target = os.path.join(self.path, rel)
+                if os.path.exists(target):
+                    continue
+                try:
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    shutil.move(os.path.join(profile_dir, rel), target)
+                    added += 1
+                except OSError as e:
+                    logger.debug("Could not move cache entry %s into the template: %s", rel, e)
+        finally:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+        if added:
+            logger.info("Added %d cache entries to profile template", added)
+        self.prune()
+
+    def prune(self):
+        """
+        Löscht die ältesten Cache-Einträge, bis die Vorlage unter 90% von --profile_cache_mb liegt.
+        """
+        now = time.time()
+        with self.lock:
+            if now - self.last_prune < self.prune_interval:
+                return
+            self.last_prune = now
+        # Einträge eines Schlüssels (<hash>_0, <hash>_1, <hash>_s) gemeinsam löschen
+        entries = collections.defaultdict(lambda: [0.0, 0, []])
+        total = 0
+        for rel in profile_cache_files(self.path):
+            try:
+                st = os.stat(os.path.join(self.path, rel))
+            except OSError:
+                continue
+            entry = entries[rel.rsplit("_", 1)[0]]
+            entry[0] = max(entry[0], st.st_mtime)
+            entry[1] += st.st_size
+            entry[2].append(rel)
+            total += st.st_size
+        if total <= self.cache_bytes:
+            return
+        removed = 0
+        for mtime, size, rels in sorted(entries.values()):
+            if total <= self.cache_bytes * 0.9:
+                break
+            for rel in rels:
+                try:
+                    os.remove(os.path.join(self.path, rel))
+                except OSError:
+                    pass
+            total -= size
+            removed += 1
+        logger.info("Pruned %d cache entries from profile template, %.0f MB left", removed, total / (1024 * 1024))
+
+profile_templates = ProfileTemplates(args.profile_template, args.profile_clone, args.profile_cache_mb, args.profile_prune_interval)
+
+# ----------------------------
+# Browser creation and helpers
+# ----------------------------
+def chrome_arguments():
+    """
+    Chrome-Kommandozeile, gemeinsam für das Selenium- und das CDP-Backend.
+    """
+    arguments = ["--disable-blink-features=AutomationControlled"]
+
+    if not args.show_browser:
+        arguments.append("--headless=new") # Modernes Headless
+
+    arguments += [
+        "--disable-gpu",
+        "--no-sandbox",
+        "--start-maximized",
+        "--disable-dev-shm-usage",
+        "--disable-background-networking",
+        "--disable-sync",
+        "--ignore-certificate-errors",
+        "--ignore-certificate-errors-spki-list",
+        "--ignore-ssl-errors",
+        "--log-level=3",
+        "--autoplay-policy=no-user-gesture-required",
+    ]
+
+    if args.mute:
+        arguments.append("--mute-audio")
+
+    if args.profile_template:
+        arguments.append(f"--disk-cache-size={profile_templates.cache_bytes}")
+
+    # User Agent Spoofing (optional, macht es "menschlicher")
+    arguments.append("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36")
+    return arguments
+
+def create_browser_attempt(attempt=1, max_attempts=4, profile_dir=None):
+    logger.info("Creating Chrome WebDriver (attempt %d/%d)...", attempt, max_attempts)
+    
+    load_browser_modules()
+
+    try:
+        if args.backend == "cdp":
+            return CdpDriver(chrome_binary(), chrome_arguments(), profile_dir=profile_dir)
+
+        options = Options()
+
+        # 1. Entfernen des "Chrome wird von automatisierter Software gesteuert" Balkens
+        options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        options.add_experimental_option('useAutomationExtension', False)
+
+        # "eager": driver.get() kehrt zurück, sobald das DOM steht (nicht erst nach allen Bildern/iframes)
+        options.page_load_strategy = args.page_load_strategy
+
+        for argument in chrome_arguments():
+            options.add_argument(argument)
+        if profile_dir is not None:
+            options.add_argument(f"--user-data-dir={profile_dir}")
+
+        driver = webdriver.Chrome(options=options)
+        return driver
+    except Exception as e:
+        logger.exception("Failed to create WebDriver on attempt %d: %s", attempt, e)
+        # small backoff before reattempting
+        if attempt < max_attempts:
+            wait = 1 + attempt * 2
+            logger.info("Waiting %s seconds before retrying WebDriver creation...", wait)
+            time.sleep(wait)
+            return create_browser_attempt(attempt + 1, max_attempts, profile_dir)
+        raise
+
+# ----------------------------
+# CDP-Backend (--backend cdp)
+# ----------------------------
+# Treiber-Schnittstelle, die process_url(), handle_cookies(), realistic_user_interaction()
+# und BrowserPool benutzen: get(url), execute_script(js, *args), execute_async_script(js, *args),
+# execute_cdp_cmd(cmd, params), find_element(by, value) mit click()/text/tag_name,
+# delete_all_cookies(), window_handles, switch_to.window(), close(), set_script_timeout(),
+# set_page_load_timeout(), quit() und service.process.pid. webdriver.Chrome erfüllt sie
+# über chromedriver, CdpDriver direkt über eine DevTools-Websocket-Verbindung.
+# Page-Load-Timeout von chromedriver (und CdpDriver), solange nichts anderes gesetzt ist
+WEBDRIVER_PAGE_LOAD_TIMEOUT = 300
+# about:blank beim Zurücksetzen darf nicht so lange hängen wie ein echter Seitenaufruf
+BLANK_PAGE_TIMEOUT = 10
+
+CDP_CHROME_CANDIDATES = ("chrome-headless-shell", "google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+
+# Führt ein Selenium-artiges Skript (Funktionsrumpf mit arguments[]) per Runtime.evaluate aus.
+# DOM-Knoten werden in window.__wvNodes abgelegt und als {__wv_node__: id} übertragen.
+# Platzhalter in CDP_SCRIPT_WRAPPER_JS, in einem Durchgang ersetzt (Argumente oder Skript
+# dürfen selbst wie Platzhalter aussehen)
+CDP_SCRIPT_WRAPPER_TOKENS = re.compile(r"__(ARGS|ASYNC|TIMEOUT|SCRIPT)__")
+
+CDP_SCRIPT_WRAPPER_JS = """
+(function(scriptArgs, isAsync, timeoutMs) {
+    var registry = window.__wvNodes || (window.__wvNodes = {next: 1, nodes: {}});
+    function isPlain(value) {
+        var proto = Object.getPrototypeOf(value);
+        return proto === Object.prototype || proto === null;
+    }
+    function unwrap(value) {
+        if (Array.isArray(value)) return value.map(unwrap);
+        if (value && typeof value === 'object') {
+            if (value.__wv_node__) return registry.nodes[value.__wv_node__];
+            var out = {};
+            for (var key in value) out[key] = unwrap(value[key]);
+            return out;
+        }
+        return value;
+    }
+    function wrap(value, depth) {
+        if (depth > 20) return null;
+        if (value instanceof Node) {
+            var id = registry.next++;
+            registry.nodes[id] = value;
+            return {__wv_node__: id};
+        }
+        if (Array.isArray(value) || value instanceof NodeList || value instanceof HTMLCollection) {
+            return Array.prototype.map.call(value, function(item) { return wrap(item, depth + 1); });
+        }
+        if (value && typeof value === 'object' && isPlain(value)) {
+            var out = {};
+            for (var key in value) out[key] = wrap(value[key], depth + 1);
+            return out;
+        }
+        return value;
+    }
+    var callArgs = unwrap(scriptArgs);
+    var script = function() {
+__SCRIPT__
+    };
+    if (!isAsync) return wrap(script.apply(window, callArgs), 0);
+    return new Promise(function(resolve, reject) {
+        var timer = setTimeout(function() { resolve({__wv_timeout__: true}); }, timeoutMs);
+        callArgs.push(function(value) { clearTimeout(timer); resolve(wrap(value, 0)); });
+        try { script.apply(window, callArgs); } catch (e) { clearTimeout(timer); reject(e); }
+    });
+})(__ARGS__, __ASYNC__, __TIMEOUT__)
+"""
+
+def chrome_binary():
+    """
+    Returns:
+      --chrome_binary oder das erste gefundene Chrome (headless-shell bevorzugt, wenn kein Fenster gezeigt wird).
+    """
+    if args.chrome_binary:
+        return args.chrome_binary
+    candidates = CDP_CHROME_CANDIDATES if not args.show_browser else CDP_CHROME_CANDIDATES[1:]
+    for name in candidates:
+        path = shutil.which(name)
+        if path:
+            return path
+    raise WebDriverException("No Chrome executable found for --backend cdp, use --chrome_binary.")
+
+# Scroll-Richtung -> (key/code, windowsVirtualKeyCode) für Input.dispatchKeyEvent
+CDP_SCROLL_KEYS = {
+    1: ("PageDown", 34),
+    -1: ("PageUp", 33),
+}
+
+def _websocket_mask(data, mask):
+    repeated = (mask * (len(data) // 4 + 1))[:len(data)]
+    return (int.from_bytes(data, "big") ^ int.from_bytes(repeated, "big")).to_bytes(len(data), "big")
+
+class CdpConnection:
+    """
+    Minimaler Websocket-Client (RFC 6455) für eine DevTools-Verbindung. Befehle werden
+    gesendet, ohne auf vorherige Antworten zu warten (Pipelining); ein Lese-Thread ordnet
+    Antworten über ihre id zu und verteilt Events an die Abonnenten.
+    """
+    def __init__(self, ws_url, timeout=30):
+        parsed = urlparse(ws_url)
+        self.sock = socket.create_connection((parsed.hostname, parsed.port or 80), timeout=timeout)
+        key = base64.b64encode(os.urandom(16)).decode("ascii")
+        self.sock.sendall((
+            f"GET {parsed.path} HTTP/1.1\r\n"
+            f"Host: {parsed.hostname}:{parsed.port}\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n\r\n"
+        ).encode("ascii"))
+        response = b""
+        while b"\r\n\r\n" not in response:
+            chunk = self.sock.recv(4096)
+            if not chunk:
+                raise ConnectionError("DevTools websocket closed during handshake")
+            response += chunk
+        header, _, rest = response.partition(b"\r\n\r\n")
+        status_line = header.split(b"\r\n")[0]
+        if b" 101 " not in status_line + b" ":
+            raise ConnectionError(f"DevTools websocket handshake failed: {status_line.decode('latin-1')}")
+        self.sock.settimeout(None)
+        self.buffer = bytearray(rest)
+        self.lock = threading.Lock()
+        self.send_lock = threading.Lock()
+        self.ids = itertools.count(1)
+        self.pending = {}
+        self.listeners = collections.defaultdict(list)
+        self.closed = False
+        self.commands = 0
+        self.command_seconds = 0.0
+        threading.Thread(target=self._read_loop, name="cdp-reader", daemon=True).start()
+
+    def _recv_exact(self, size):
+        while len(self.buffer) < size:
+            chunk = self.sock.recv(max(65536, size - len(self.buffer)))
+            if not chunk:
+                raise ConnectionError("DevTools websocket closed")
+            self.buffer += chunk
+        data = bytes(self.buffer[:size])
+        del self.buffer[:size]
+        return data
+
+    def _read_frame(self):
+        first, second = self._recv_exact(2)
+        length = second & 0x7F
+        if length == 126:
+            length = struct.unpack(">H", self._recv_exact(2))[0]
+        elif length == 127:
+            length = struct.unpack(">Q", self._recv_exact(8))[0]
+        mask = self._recv_exact(4) if second & 0x80 else None
+        payload = self._recv_exact(length)
+        if mask:
+            payload = _websocket_mask(payload, mask)
+        return bool(first & 0x80), first & 0x0F, payload
+
+    def _send_frame(self, opcode, payload):
+        header = bytearray([0x80 | opcode])
+        length = len(payload)
+        if length < 126:
+            header.append(0x80 | length)
+        elif length < 65536:
+            header.append(0x80 | 126)
+            header += struct.pack(">H", length)
+        else:
+            header.append(0x80 | 127)
+            header += struct.pack(">Q", length)
+        mask = os.urandom(4)
+        with self.send_lock:
+            self.sock.sendall(bytes(header) + mask + _websocket_mask(payload, mask))
+
+    def _read_loop(self):
+        message = bytearray()
+        try:
+            while True:
+                fin, opcode, payload = self._read_frame()
+                if opcode == 0x8:
+                    break
+                if opcode == 0x9:
+                    self._send_frame(0xA, payload)
+                    continue
+                if opcode not in (0x0, 0x1, 0x2):
+                    continue
+                message += payload
+                if fin:
+                    self._dispatch(json.loads(message.decode("utf-8")))
+                    message = bytearray()
+        except (OSError, ValueError) as e:
+            if not self.closed:
+                logger.debug("DevTools connection lost: %s", e)
+        finally:
+            self.abort("DevTools connection closed")
+
+    def _dispatch(self, message):
+        if "id" in message:
+            with self.lock:
+                future, method = self.pending.pop(message["id"], (None, None))
+            if future is None:
+                return
+            if "error" in message:
+                future.set_exception(WebDriverException(f"{method}: {message['error'].get('message')}"))
+            else:
+                future.set_result(message.get("result", {}))
+            return
+        with self.lock:
+            callbacks = list(self.listeners.get(message.get("method"), ()))
+        for callback in callbacks:
+            try:
+                callback(message.get("params", {}))
+            except Exception as e:
+                logger.debug("DevTools event handler for %s failed: %s", message.get("method"), e)
+
+    def send(self, method, params=None):
+        """
+        Sendet einen Befehl, ohne auf die Antwort zu warten.
+
+        Returns:
+          concurrent.futures.Future mit dem result-Objekt der Antwort.
+        """
+        future = concurrent.futures.Future()
+        with self.lock:
+            if self.closed:
+                raise WebDriverException(f"{method}: DevTools connection closed")
+            command_id = next(self.ids)
+            self.pending[command_id] = (future, method)
+        payload = json.dumps({"id": command_id, "method": method, "params": params or {}}).encode("utf-8")
+        try:
+            self._send_frame(0x1, payload)
+        except OSError as e:
+            self.abort(f"DevTools connection closed: {e}")
+        return future
+
+    def call(self, method, params=None, timeout=30):
+        started = time.perf_counter()
+        try:
+            return self.send(method, params).result(timeout)
+        except concurrent.futures.TimeoutError:
+            raise TimeoutException(f"{method} timed out after {timeout:.0f}s")
+        finally:
+            self.commands += 1
+            self.command_seconds += time.perf_counter() - started
+
+    def expect(self, method):
+        """
+        Returns:
+          Future, das mit den Parametern des nächsten Events `method` erfüllt wird
+          (future.cancel() meldet das Abo wieder ab).
+        """
+        future = concurrent.futures.Future()
+
+        def callback(params):
+            if not future.done():
+                future.set_result(params)
+
+        def unsubscribe(_):
+            with self.lock:
+                if callback in self.listeners[method]:
+                    self.listeners[method].remove(callback)
+
+        with self.lock:
+            self.listeners[method].append(callback)
+        future.add_done_callback(unsubscribe)
+        return future
+
+    def on(self, method, callback):
+        with self.lock:
+            self.listeners[method].append(callback)
+
+    def abort(self, reason):
+        with self.lock:
+            self.closed = True
+            pending, self.pending = self.pending, {}
+        for future, method in pending.values():
+            if not future.done():
+                future.set_exception(WebDriverException(f"{method}: {reason}"))
+
+    def close(self):
+        self.abort("DevTools connection closed")
+        try:
+            self._send_frame(0x8, b"")
+        except OSError:
+            pass
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+class CdpElement:
+    """
+    DOM-Knoten einer CdpDriver-Seite (Gegenstück zu Seleniums WebElement).
+    """
+    def __init__(self, driver, node_id):
+        self.driver = driver
+        self.id = node_id
+
+    @property
+    def text(self):
+        return self.driver.execute_script("return arguments[0].innerText || arguments[0].textContent || '';", self)
+
+    @property
+    def tag_name(self):
+        return self.driver.execute_script("return arguments[0].tagName.toLowerCase();", self)
+
+    def is_displayed(self):
+        return bool(self.driver.execute_script("return arguments[0].getClientRects().length > 0;", self))
+
+    def click(self):
+        # Echter Mausklick in die Elementmitte (zählt für Chrome als Nutzergeste)
+        x, y, width, height = self.driver.execute_script(
+            "var r = arguments[0].getBoundingClientRect(); return [r.left + r.width / 2, r.top + r.height / 2, r.width, r.height];", self)
+        if width <= 0 or height <= 0:
+            raise WebDriverException("element not interactable: element has no size")
+        self.driver.dispatch_click(x, y)
+
+class CdpDriver:
+    """
+    Startet ein eigenes Chrome mit --remote-debugging-port und steuert dessen Tab über eine
+    einzige persistente DevTools-Verbindung, ohne chromedriver und dessen HTTP-Umweg.
+    """
+    def __init__(self, binary, chrome_args, startup_timeout=30, profile_dir=None):
+        # Ein Klon der Profil-Vorlage gehört ProfileTemplates und wird dort aufgeräumt
+        self.owns_profile = profile_dir is None
+        self.profile_dir = profile_dir or tempfile.mkdtemp(prefix="wv_cdp_")
+        self.connection = None
+        self.script_timeout = 30
+        self.page_load_timeout = WEBDRIVER_PAGE_LOAD_TIMEOUT
+        command = [
+            binary,
+            "--remote-debugging-port=0",
+            f"--user-data-dir={self.profile_dir}",
+            "--no-first-run",
+            "--no-default-browser-check",
+        ] + chrome_args + ["about:blank"]
+        # Eine aus der Profil-Vorlage mitkopierte Portdatei gehört zu einem anderen Chrome
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(os.path.join(self.profile_dir, "DevToolsActivePort"))
+        self.process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self.service = types.SimpleNamespace(process=self.process)
+        self.switch_to = types.SimpleNamespace(window=lambda handle: None)
+        try:
+            port = self._wait_for_devtools_port(startup_timeout)
+            target, self.connection = self._connect(port, startup_timeout)
+            self.target_id = target["id"]
+            # Dialoge blockieren jede Skriptausführung -> sofort schließen
+            self.connection.on("Page.javascriptDialogOpening", self._dismiss_dialog)
+            self.connection.on("Inspector.targetCrashed", lambda params: self.connection.abort("page crashed"))
+            self.connection.call("Page.enable")
+            # Ohne Inspector.enable meldet Chrome kein Inspector.targetCrashed
+            self.connection.call("Inspector.enable")
+        except Exception:
+            self.quit()
+            raise
+        logger.info("Started Chrome (pid %d) with DevTools backend: %s", self.process.pid, binary)
+
+    def _wait_for_devtools_port(self, timeout):
+        port_file = os.path.join(self.profile_dir, "DevToolsActivePort")
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if self.process.poll() is not None:
+                raise WebDriverException(f"Chrome exited with code {self.process.returncode} during startup")
+            try:
+                with open(port_file, encoding="utf-8") as f:
+                    lines = f.read().split()
+                if lines:
+                    return int(lines[0])
+            except (OSError, ValueError):
+                pass
+            time.sleep(0.05)
+        raise TimeoutException(f"Chrome did not open a DevTools port within {timeout}s")
+
+    def _connect(self, port, timeout):
+        """
+        Verbindet sich mit dem ersten Seiten-Target. Solange Chrome noch startet, werden
+        Verbindungsfehler bis timeout wiederholt.
+
+        Returns:
+          (target, CdpConnection)
+        """
+        deadline = time.time() + timeout
+        error = "no page target"
+        while True:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/json/list", timeout=10) as response:
+                    targets = json.loads(response.read().decode("utf-8"))
+                for target in targets:
+                    if target.get("type") == "page" and target.get("webSocketDebuggerUrl"):
+                        return target, CdpConnection(target["webSocketDebuggerUrl"])
+            except (OSError, ValueError) as e:
+                error = e
+            if self.process.poll() is not None:
+                raise WebDriverException(f"Chrome exited with code {self.process.returncode} during startup")
+            if time.time() >= deadline:
+                raise TimeoutException(f"Chrome did not expose a page target within {timeout}s: {error}")
+            time.sleep(0.05)
+
+    def _dismiss_dialog(self, params):
+        logger.debug("Dismissing JavaScript %s dialog: %s", params.get("type"), params.get("message"))
+        self.connection.send("Page.handleJavaScriptDialog", {"accept": params.get("type") != "beforeunload"})
+
+    @property
+    def window_handles(self):
+        return [self.target_id]
+
+    def close(self):
+        pass
+
+    def set_script_timeout(self, seconds):
+        self.script_timeout = seconds
+
+    def set_page_load_timeout(self, seconds):
+        self.page_load_timeout = seconds
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        return self.connection.call(cmd, cmd_args)
+
+    def get(self, url):
+        event = "Page.domContentEventFired" if args.page_load_strategy == "eager" else "Page.loadEventFired"
+        loaded = self.connection.expect(event)
+        try:
+            result = self.connection.call("Page.navigate", {"url": url}, timeout=self.page_load_timeout)
+            if result.get("errorText"):
+                raise WebDriverException(f"unknown error: {result['errorText']} ({url})")
+            # Navigation innerhalb des Dokuments (#anker) liefert keinen loaderId und kein Load-Event
+            if result.get("loaderId"):
+                try:
+                    loaded.result(self.page_load_timeout)
+                except concurrent.futures.TimeoutError:
+                    raise TimeoutException(f"timeout: page load of {url} exceeded {self.page_load_timeout}s")
+        finally:
+            loaded.cancel()
+
+    def _evaluate(self, script, script_args, is_async):
+        values = {
+            "ARGS": json.dumps(list(script_args), default=self._encode_arg),
+            "ASYNC": "true" if is_async else "false",
+            "TIMEOUT": str(int(self.script_timeout * 1000)),
+            "SCRIPT": script,
+        }
+        expression = CDP_SCRIPT_WRAPPER_TOKENS.sub(lambda match: values[match.group(1)], CDP_SCRIPT_WRAPPER_JS)
+        result = self.connection.call("Runtime.evaluate", {
+            "expression": expression,
+            "returnByValue": True,
+            "awaitPromise": is_async,
+            "userGesture": True,
+        }, timeout=self.script_timeout + 10)
+        details = result.get("exceptionDetails")
+        if details:
+            exception = details.get("exception") or {}
+            raise JavascriptException(f"javascript error: {exception.get('description') or details.get('text')}")
+        value = result.get("result", {}).get("value")
+        if isinstance(value, dict) and value.get("__wv_timeout__"):
+            raise TimeoutException(f"script timeout: result was not received in {self.script_timeout} seconds")
+        return self._decode_value(value)
+
+    @staticmethod
+    def _encode_arg(value):
+        if isinstance(value, CdpElement):
+            return {"__wv_node__": value.id}
+        raise TypeError(f"Cannot pass {type(value).__name__} to the browser")
+
+    def _decode_value(self, value):
+        if isinstance(value, list):
+            return [self._decode_value(item) for item in value]
+        if isinstance(value, dict):
+            if "__wv_node__" in value:
+                return CdpElement(self, value["__wv_node__"])
+            return {key: self._decode_value(item) for key, item in value.items()}
+        return value
+
+    def execute_script(self, script, *script_args):
+        return self._evaluate(script, script_args, False)
+
+    def execute_async_script(self, script, *script_args):
+        return self._evaluate(script, script_args, True)
+
+    def find_elements(self, by, value):
+        scripts = {
+            "tag name": "return document.getElementsByTagName(arguments[0]);",
+            "css selector": "return document.querySelectorAll(arguments[0]);",
+            "xpath": ("var result = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);"
+                      "var nodes = []; for (var i = 0; i < result.snapshotLength; i++) nodes.push(result.snapshotItem(i)); return nodes;"),
+        }
+        if by not in scripts:
+            raise WebDriverException(f"invalid argument: unsupported locator strategy {by!r}")
+        return self.execute_script(scripts[by], value)
+
+    def find_element(self, by, value):
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"no such element: {by}={value}")
+        return elements[0]
+
+    def dispatch_click(self, x, y):
+        # Alle drei Maus-Events auf einmal senden und erst danach auf die Antworten warten
+        futures = [self.connection.send("Input.dispatchMouseEvent", {"type": "mouseMoved", "x": x, "y": y})]
+        for event_type in ("mousePressed", "mouseReleased"):
+            futures.append(self.connection.send("Input.dispatchMouseEvent", {
+                "type": event_type, "x": x, "y": y, "button": "left", "clickCount": 1,
+            }))
+        for future in futures:
+            future.result(self.script_timeout)
+
+    def press_keys(self, steps):
+        """
+        Drückt PAGE_DOWN/PAGE_UP (Richtung +1/-1) zu den Verzögerungen (ms) der Schritte;
+        keyDown und keyUp eines Tastendrucks werden zusammen gesendet.
+        """
+        started = time.monotonic()
+        for delay_ms, direction in steps:
+            time.sleep(max(started + delay_ms / 1000.0 - time.monotonic(), 0))
+            name, code = CDP_SCROLL_KEYS[1 if direction > 0 else -1]
+            event = {"key": name, "code": name, "windowsVirtualKeyCode": code, "nativeVirtualKeyCode": code}
+            futures = [self.connection.send("Input.dispatchKeyEvent", dict(event, type=event_type))
+                       for event_type in ("rawKeyDown", "keyUp")]
+            for future in futures:
+                future.result(self.script_timeout)
+
+    def delete_all_cookies(self):
+        self.connection.call("Network.clearBrowserCookies")
+
+    def quit(self):
+        if self.connection is not None:
+            if self.connection.commands:
+                logger.info("DevTools backend: %d commands, %.1f ms mean round trip",
+                            self.connection.commands, self.connection.command_seconds * 1000 / self.connection.commands)
+            self.connection.close()
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        if self.owns_profile:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+# ----------------------------
+# Wait for page load helper (resilient)
+# ----------------------------
+# Ein einziger asynchroner Hook statt Polling: löst aus, sobald eine der Bedingungen eintritt
+# ('complete' = load-Event, 'selector' = MutationObserver findet den Selektor,
+# 'media' = ein video/audio-Element meldet canplay).
+PAGE_READY_JS = """
+var conditions = arguments[0], selector = arguments[1], timeoutMs = arguments[2];
+var done = arguments[arguments.length - 1];
+var finished = false, cleanups = [];
+function finish(reason) {
+    if (finished) return;
+    finished = true;
+    cleanups.forEach(function(fn) { try { fn(); } catch (e) {} });
+    done(reason);
+}
+function mediaReady() {
+    var media = document.querySelectorAll('video, audio');
+    for (var i = 0; i < media.length; i++) {
+        if (media[i].readyState >= 3) return true;
+    }
+    return false;
+}
+if (conditions.indexOf('complete') !== -1) {
+    if (document.readyState === 'complete') return finish('complete');
+    var onLoad = function() { finish('complete'); };
+    window.addEventListener('load', onLoad);
+    cleanups.push(function() { window.removeEventListener('load', onLoad); });
+}
+if (conditions.indexOf('selector') !== -1 && selector) {
+    if (document.querySelector(selector)) return finish('selector');
+    var pending = false;
+    var observer = new MutationObserver(function() {
+        if (pending) return;
+        pending = true;
+        setTimeout(function() {
+            pending = false;
+            if (document.querySelector(selector)) finish('selector');
+        }, 0);
+    });
+    observer.observe(document.documentElement, {childList: true, subtree: true});
+    cleanups.push(function() { observer.disconnect(); });
+}
+if (conditions.indexOf('media') !== -1) {
+    if (mediaReady()) return finish('media');
+    var onCanPlay = function(event) {
+        if (event.target && /^(VIDEO|AUDIO)$/.test(event.target.tagName)) finish('media');
+    };
+    // Media-Events bubbeln nicht, kommen aber in der Capture-Phase am document an
+    document.addEventListener('canplay', onCanPlay, true);
+    cleanups.push(function() { document.removeEventListener('canplay', onCanPlay, true); });
+}
+var timer = setTimeout(function() { finish('timeout'); }, timeoutMs);
+cleanups.push(function() { clearTimeout(timer); });
+"""
+
+# Wird auch ohne Lean-Modus für die 'selector'-Bedingung genutzt (Player + typische Cookie-Banner)
+READY_COOKIE_SELECTOR = "#onetrust-accept-btn-handler, #CybotCookiebotDialog, #uc-btn-accept-banner, .cc-btn.cc-accept"
+
+def page_ready_conditions(ready_selector):
+    if args.ready_conditions:
+        return [c.strip() for c in args.ready_conditions.split(",") if c.strip()]
+    return ["complete", "selector", "media"] if ready_selector else ["complete"]
+
+@timed_phase("ready_wait")
+def wait_for_page_load(driver, timeout=None, ready_selector=None):
+    """
+    Wartet auf document.readyState == "complete". Mit ready_selector (Lean-Modus) reicht
+    schon ein interaktives DOM, in dem der Player-Selektor existiert.
+
+    Mit --ready_mode event (Standard) wird statt Polling ein einziger asynchroner Hook
+    im Browser genutzt, der beim ersten Treffer der Bedingungen zurückkehrt.
+    """
+    if timeout is None:
+        timeout = args.page_load_timeout
+    if args.ready_mode == "event":
+        conditions = page_ready_conditions(ready_selector)
+        if "selector" in conditions and not ready_selector:
+            ready_selector = LEAN_DEFAULTS["ready_selector"] + ", " + READY_COOKIE_SELECTOR
+        try:
+            reason = driver.execute_async_script(PAGE_READY_JS, conditions, ready_selector or "", int(timeout * 1000))
+            logger.debug("Page ready via %s", reason)
+            if reason == "timeout":
+                say("⚠️  Zeitüberschreitung beim Laden der Seite (Ready-Hook).")
+            return
+        except TimeoutException:
+            say("⚠️  Zeitüberschreitung beim Laden der Seite (Ready-Hook).")
+            return
+        except JavascriptException as e:
+            # z.B. Navigation während des Wartens -> klassisches Polling
+            logger.debug("Ready hook failed, falling back to polling: %s", e)
+        except WebDriverException as e:
+            logger.debug("WebDriverException while waiting for page load: %s", e)
+            return
+
+    try:
+        if ready_selector:
+            WebDriverWait(driver, timeout).until(
+                lambda d: d.execute_script(
+                    "return document.readyState === 'complete' || "
+                    "(document.readyState !== 'loading' && !!document.querySelector(arguments[0]));",
+                    ready_selector
+                )
+            )
+            return
+        WebDriverWait(driver, timeout).until(
+            lambda d: d.execute_script("return document.readyState") == "complete"
+        )
+    except TimeoutException:
+        say("⚠️  Zeitüberschreitung beim Laden der Seite (document.readyState).")
+    except WebDriverException as e:
+        logger.debug("WebDriverException while waiting for page load: %s", e)
+
+# Alias
+wait_for_page_load_complete = wait_for_page_load 
+
+# ----------------------------
+# Kurze Pause Helper
+# ----------------------------
+def random_sleep(min_s=0.1, max_s=0.5):
+    time.sleep(random.uniform(min_s, max_s))
+
+# ----------------------------
+# KORRIGIERTE FUNKTION: Ausführung der asynchronen main.js
+# ----------------------------
+def execute_async_js_script(driver, js_script, url):
+    """
+    Führt das asynchrone JS-Skript aus (window.automatePage()) und wartet auf den Status.
+    
+    Returns:
+      action_string ('success', 'restart') oder None bei Fehler.
+    """
+    domain = get_root_domain(url)
+    try:
+        # 1. Rufe die definierte Funktion asynchron auf und warte auf den Callback.
+        # Wir wickeln den Aufruf in einen Wrapper, der den Selenium-Callback nutzt.
+        async_wrapper = """
+        var done = arguments[arguments.length - 1]; // Selenium Callback
+        if (typeof window.automatePage === 'function') {
+            window.automatePage(arguments[0])
+                .then(function(res) { done(res); })
+                .catch(function(err) { done('error: ' + err); });
+        } else {
+            done('error: automatePage not defined');
+        }
+        """
         
-        # 5. Längere Pause
-        random_long_sleep(3, 5)
+        # execute_async_script wartet, bis 'done()' im JS aufgerufen wird
+        with visit_phase("script_run"):
+            action = driver.execute_async_script(async_wrapper, domain)
+
+        # 2. Nicht vorgeladen (kein CDP oder Skript geändert): gesamten JS-Code injizieren und erneut aufrufen
+        if action == 'error: automatePage not defined':
+            with visit_phase("script_inject"):
+                driver.execute_script(js_script)
+            with visit_phase("script_run"):
+                action = driver.execute_async_script(async_wrapper, domain)
         
-        # 6., 7., 8. Fallbacks nur ausführen, wenn JS NICHT erfolgreich war
-        if not js_was_successful:
-            handle_cookies(driver)
-            print("⏳ Kurze Pause (Post-Cookie)...")
+        # Sicherheitsprüfung für den Rückgabewert
+        if not isinstance(action, str):
+            logger.warning(f"[{domain}] JS-Skript gab keinen String zurück: {action}. Behandele als Fehler.")
+            return None
+        
+        # Gib nur erlaubte Aktionen zurück
+        action = action.lower()
+        if 'error' in action:
+             logger.warning(f"[{domain}] JS Fehler gemeldet: {action}")
+             return None
+
+        return action if action in ['success', 'restart'] else None
+            
+    except JavascriptException as e:
+        logger.warning(f"[{domain}] JavaScript Fehler bei asynchroner Ausführung: {e}")
+        return None
+    except Exception as e:
+        logger.warning(f"[{domain}] Unerwarteter Fehler bei asynchroner JS-Ausführung: {e}")
+        return None
+
+# ----------------------------
+# Lange Pause Helper
+# ----------------------------
+@timed_phase("pauses")
+def random_long_sleep(min_s=1.0, max_s=3.0):
+    time.sleep(random.uniform(min_s, max_s))
+
+# ----------------------------
+# Cookie und Play Button Handling
+# ----------------------------
+def attempt_cleanup_actions(driver):
+    """
+    Versucht nacheinander, Pop-ups oder Banner zu schließen/akzeptieren.
+    """
+    # KONSOLIDIERTER XPATH für Schließen/Ablehnen
+    # (Syntaktisch korrigiert, damit das Skript ausführbar ist)
+    try:
+        close_xpath_combined = (
+            "//button[.='x' or .='X' or @aria-label='Close' or @title='Close' or @aria-label='Anmelden' or @title='Anmelden' or @aria-label='Cookie Hinweis' or @title='Cookie Hinweis']"
+            + "| //*[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'schlie') or contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'abbrechen') or contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'spaeter') or contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'not now') or contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'later')]"
+            + "| //*[contains(@class, 'modal-close') or contains(@class, 'close-button') or contains(@class, 'dismiss') or contains(@class, 'fancybox-close') or contains(@class, 'lightbox-close')]"
+        )
+        # Hier könnte Logik stehen, um diesen XPath zu klicken, aber im Original fehlte der Codeblock.
+        # Wir lassen es als Platzhalter stehen, falls später Logik ergänzt wird.
+        pass
+    except Exception:
+        pass
+
+def click_element_safely(driver, element, name="Element"):
+    try:
+        driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", element)
+        time.sleep(0.5)
+        # Versuch 1: Normaler Klick
+        element.click()
+        say(f"✅ Klick auf '{name}' erfolgreich.")
+        return True
+    except (ElementClickInterceptedException, Exception):
+        try:
+            # Versuch 2: JS Klick (erzwungen)
+            driver.execute_script("arguments[0].click();", element)
+            say(f"✅ Klick auf '{name}' per JS erzwungen.")
+            return True
+        except Exception as e:
+            say(f"❌ Konnte '{name}' nicht klicken: {e}")
+    return False
+
+# Suchbegriffe / Selektoren für die Python-Fallbacks (Reihenfolge = Priorität)
+COOKIE_KEYWORDS = [
+    "akzeptieren", "alle akzeptieren", "annehmen", "alle annehmen", "zulassen", "alle zulassen", "einverstanden", "erlauben", "alle cookies erlauben", "accept", "accept all", "allow all", "i agree"
+]
+PLAY_TEXT_KEYWORDS = ["Hoerprobe", "Abspielen", "Play", "Shuffle", "Listen"]
+PLAY_CSS_SELECTORS = [
+    ".playbutton", ".play-button", ".playControl", # Bandcamp / Soundcloud
+    "button[aria-label*='Play']", "button[title*='Play']",
+    ".ytp-play-button", # Youtube
+    ".audio-player-play"
+]
+
+# Gemeinsame Helfer für die Fallback-Suche im Browser. Bildet die frühere XPath-Logik nach
+# (translate(text(), ...) = erster Textknoten, klein geschrieben) und zählt mit, wie viele
+# WebDriver-Aufrufe (find_elements, is_displayed, text/tag_name) die alte Schleife gebraucht hätte.
+FALLBACK_JS_HELPERS = """
+function isShown(el) {
+    if (!el.getClientRects().length) return false;
+    var style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none' && style.opacity !== '0';
+}
+function firstText(el) {
+    for (var n = el.firstChild; n; n = n.nextSibling) {
+        if (n.nodeType === 3) return n.nodeValue.toLowerCase();
+    }
+    return '';
+}
+"""
+
+COOKIE_FALLBACK_JS = FALLBACK_JS_HELPERS + """
+var keywords = arguments[0];
+var elements = Array.prototype.slice.call(document.querySelectorAll('button, a, div[role="button"]'));
+var texts = elements.map(function(el) {
+    return el.tagName === 'DIV' ? (el.textContent || '').toLowerCase() : firstText(el);
+});
+var candidates = [], seen = new Set(), legacy = 0, hit = false;
+for (var k = 0; k < keywords.length; k++) {
+    var keyword = keywords[k].toLowerCase();
+    if (!hit) legacy += 1;
+    for (var i = 0; i < elements.length; i++) {
+        if (texts[i].indexOf(keyword) === -1) continue;
+        if (!hit) legacy += 1;
+        if (!isShown(elements[i])) continue;
+        if (!hit) legacy += 1;
+        hit = true;
+        if (!seen.has(elements[i])) {
+            seen.add(elements[i]);
+            candidates.push([elements[i], keywords[k], (elements[i].innerText || '').trim()]);
+        }
+    }
+}
+return {candidates: candidates.slice(0, 20), legacy: legacy};
+"""
+
+PLAY_FALLBACK_JS = FALLBACK_JS_HELPERS + """
+var keywords = arguments[0], selectors = arguments[1];
+var tags = ['BUTTON', 'A', 'SPAN', 'DIV'];
+var elements = Array.prototype.slice.call(document.querySelectorAll('*'));
+var texts = elements.map(firstText);
+var candidates = [], seen = new Set(), legacy = 0, hit = false;
+function add(el, label) {
+    hit = true;
+    if (!seen.has(el)) {
+        seen.add(el);
+        candidates.push([el, label]);
+    }
+}
+for (var k = 0; k < keywords.length; k++) {
+    var keyword = keywords[k].toLowerCase();
+    if (!hit) legacy += 1;
+    for (var i = 0; i < elements.length; i++) {
+        if (texts[i].indexOf(keyword) === -1) continue;
+        if (!hit) legacy += 1;
+        if (!isShown(elements[i])) continue;
+        if (!hit) legacy += 1;
+        if (tags.indexOf(elements[i].tagName) !== -1) add(elements[i], 'Play-Text: ' + keywords[k]);
+    }
+}
+for (var s = 0; s < selectors.length; s++) {
+    if (!hit) legacy += 1;
+    var matches;
+    try { matches = document.querySelectorAll(selectors[s]); } catch (e) { continue; }
+    for (var j = 0; j < matches.length; j++) {
+        if (!hit) legacy += 1;
+        if (isShown(matches[j])) add(matches[j], 'Play-Icon: ' + selectors[s]);
+    }
+}
+return {candidates: candidates.slice(0, 20), legacy: legacy};
+"""
+
+@timed_phase("fallbacks")
+def handle_cookies(driver):
+    """
+    Sucht nach Cookie-Bannern basierend auf Text-Keywords.
+    Alle Kandidaten werden mit einem einzigen execute_script ermittelt.
+
+    Returns:
+      Anzahl der gegenüber der Einzelabfrage gesparten WebDriver-Aufrufe.
+    """
+    say("🍪 [Fallback] Prüfe auf Cookie-Banner...")
+
+    found = False
+    saved = 0
+    try:
+        result = driver.execute_script(COOKIE_FALLBACK_JS, COOKIE_KEYWORDS)
+        saved = max(result["legacy"] - 1, 0)
+        before = profile_templates.cookie_snapshot(driver) if result["candidates"] else None
+        for elem, keyword, text in result["candidates"]:
+            say(f"   -> Möglicher Cookie-Button gefunden: '{text}'")
+            if click_element_safely(driver, elem, f"Cookie: {keyword}"):
+                found = True
+                profile_templates.consent_clicked(driver, before)
+                break
+    except Exception as e:
+        logger.debug("Cookie fallback failed: %s", e)
+
+    if not found:
+        say("   -> Kein offensichtlicher Cookie-Banner gefunden (oder bereits akzeptiert).")
+    return saved
+
+@timed_phase("fallbacks")
+def handle_play_buttons(driver):
+    """
+    Sucht nach Play-Buttons basierend auf Text und gängigen Klassen
+    (erst Text-Keywords, dann CSS-Selektoren) in einem einzigen execute_script.
+
+    Returns:
+      Anzahl der gegenüber der Einzelabfrage gesparten WebDriver-Aufrufe.
+    """
+    say("▶️  [Fallback] Suche nach Play/Hörprobe/Shuffle Buttons...")
+
+    clicked = False
+    saved = 0
+    try:
+        result = driver.execute_script(PLAY_FALLBACK_JS, PLAY_TEXT_KEYWORDS, PLAY_CSS_SELECTORS)
+        saved = max(result["legacy"] - 1, 0)
+        for elem, label in result["candidates"]:
+            if click_element_safely(driver, elem, label):
+                clicked = True
+                break
+    except Exception as e:
+        logger.debug("Play fallback failed: %s", e)
+
+    if not clicked:
+        say("   -> Keinen Play-Button gefunden.")
+    return saved
+
+# ----------------------------
+# Realistic interaction (resilient)
+# ----------------------------
+# Untergrenze für eine Pause zwischen zwei Ticks, damit der Plan auch bei 0/0 endet
+MIN_INTERACTION_PAUSE = 0.05
+
+def plan_interaction(duration_seconds, scroll_chance=None, url=None):
+    """
+    Berechnet den kompletten Interaktionsablauf eines Besuchs im Voraus. Die Ticks werden
+    wie bisher mit --scroll_chance und Pausen aus [scroll_min, scroll_max] gezogen;
+    Aktionen innerhalb von --interaction_batch_window Sekunden werden zu einem Batch
+    zusammengefasst. Mit --interaction_seed ist der Ablauf pro URL reproduzierbar.
+
+    Returns:
+      Liste von (offset_sekunden, [(verzögerung_ms, richtung), ...]), nach Offset sortiert.
+    """
+    if scroll_chance is None:
+        scroll_chance = setting("scroll_chance", url)
+    if args.interaction_seed is not None:
+        rng = random.Random(f"{args.interaction_seed}:{url}")
+    else:
+        rng = random.Random()
+
+    actions = []
+    offset = 0.0
+    while True:
+        if rng.random() < scroll_chance:
+            actions.append((offset, rng.choice((1, -1))))
+        offset += max(rng.uniform(setting("scroll_min_random_time", url), setting("scroll_max_random_time", url)), MIN_INTERACTION_PAUSE)
+        if offset >= duration_seconds:
+            break
+
+    batches = []
+    for at, direction in actions:
+        if batches and at - batches[-1][0] < args.interaction_batch_window:
+            batches[-1][1].append((int((at - batches[-1][0]) * 1000), direction))
+        else:
+            batches.append((at, [(0, direction)]))
+    logger.debug("Planned %d scroll actions in %d batches for %s", len(actions), len(batches), url)
+    return batches
+
+def perform_interaction_batch(driver, steps):
+    """
+    Drückt PAGE_DOWN/PAGE_UP (Richtung +1/-1) eines Batches aus plan_interaction() als echte
+    Tastatureingaben: über chromedriver als eine W3C-Aktionsfolge mit Pausen, im CDP-Backend
+    über Input.dispatchKeyEvent. Blockiert für die Dauer des Batches.
+    """
+    try:
+        if hasattr(driver, "press_keys"):
+            driver.press_keys(steps)
+        else:
+            actions = ActionChains(driver)
+            elapsed_ms = 0
+            for delay_ms, direction in steps:
+                if delay_ms > elapsed_ms:
+                    actions.pause((delay_ms - elapsed_ms) / 1000.0)
+                    elapsed_ms = delay_ms
+                key = Keys.PAGE_DOWN if direction > 0 else Keys.PAGE_UP
+                actions.key_down(key).key_up(key)
+            actions.perform()
+        logger.debug("Pressed %d scroll keys", len(steps))
+    except Exception as e:
+        logger.debug("Failed to press scroll keys: %s", e)
+
+def split_batch(steps, limit_seconds):
+    """
+    Teilt einen Batch aus plan_interaction() an limit_seconds ab Batch-Beginn, damit er
+    nicht über das Ende der Verweildauer oder das nächste Ereignis eines Tabs hinaus blockiert.
+    Der erste Schritt bleibt immer erhalten.
+
+    Returns:
+      (steps, rest) – rest mit Verzögerungen relativ zu seinem ersten Schritt, leer wenn alles passt.
+    """
+    limit_ms = limit_seconds * 1000
+    head = [step for step in steps if step[0] < limit_ms] or steps[:1]
+    rest = steps[len(head):]
+    if rest:
+        base = rest[0][0]
+        rest = [(delay_ms - base, direction) for delay_ms, direction in rest]
+    return head, rest
+
+def current_visit_url():
+    trace = current_visit.get()
+    return trace.url if trace is not None else None
+
+# Summe der abgespielten Bereiche (played) des am weitesten gelaufenen video/audio-Elements
+PLAYBACK_PROBE_JS = """
+var media = document.querySelectorAll('video, audio');
+var result = {media: media.length, playing: 0, played: 0};
+for (var i = 0; i < media.length; i++) {
+    var m = media[i], played = 0;
+    for (var r = 0; r < m.played.length; r++) played += m.played.end(r) - m.played.start(r);
+    result.played = Math.max(result.played, played);
+    if (!m.paused && !m.ended && m.readyState > 2) result.playing += 1;
+}
+return result;
+"""
+
+class PlaybackProbe:
+    """
+    Prüft in den ersten --playback_probe_window Sekunden der Verweildauer mit
+    --playback_probes Stichproben, ob Audio/Video wirklich läuft, und misst am Ende die
+    effektiven Wiedergabesekunden. Seiten ohne video/audio-Element (z.B. Web-Audio-Player)
+    gelten als unbekannt und werden nie abgebrochen.
+    """
+    def __init__(self, url):
+        self.url = url
+        self.samples = 0
+        self.media_seen = False
+        self.playing = False
+        self.played = 0.0
+
+    @staticmethod
+    def offsets(duration_seconds, url=None):
+        window = min(setting("playback_probe_window", url), duration_seconds)
+        count = max(setting("playback_probes", url), 0)
+        return [window * (i + 1) / count for i in range(count)]
+
+    def _read(self, driver):
+        try:
+            result = driver.execute_script(PLAYBACK_PROBE_JS)
+        except Exception as e:
+            logger.debug("Playback probe failed: %s", e)
+            return None
+        if not isinstance(result, dict):
+            return None
+        self.media_seen = self.media_seen or result.get("media", 0) > 0
+        self.played = max(self.played, float(result.get("played") or 0))
+        # Fortschritt (played > 0) und mindestens ein Element nicht pausiert
+        self.playing = self.playing or (self.played > 0 and result.get("playing", 0) > 0)
+        return result
+
+    def sample(self, driver):
+        """
+        Returns:
+          None (weiter verweilen) oder nach der letzten Probe ohne Wiedergabe die Aktion
+          aus --no_playback ("skip" bzw. "requeue" für einen späteren neuen Versuch).
+        """
+        if self.playing:
+            return None
+        self.samples += 1
+        self._read(driver)
+        if self.playing:
+            logger.info("Playback started on %s (%.1fs played at probe %d)", self.url, self.played, self.samples)
+            return None
+        if self.samples < setting("playback_probes", self.url):
+            return None
+        if not self.media_seen:
+            logger.debug("No media element found on %s, playback unknown", self.url)
+            return None
+        policy = setting("no_playback", self.url)
+        logger.warning("No playback on %s after %d probes (--no_playback %s)", self.url, self.samples, policy)
+        if policy == "continue":
+            return None
+        say("🔇 Keine Wiedergabe erkannt, breche die Verweildauer ab.")
+        mark_visit_failure("no_playback")
+        return "skip" if policy == "skip" else "requeue"
+
+    def finish(self, driver):
+        """
+        Letzte Messung am Ende der Verweildauer: effektive Wiedergabesekunden des Besuchs.
+        """
+        if setting("playback_probes", self.url) <= 0:
+            return
+        trace = current_visit.get()
+        if self._read(driver) is not None and trace is not None:
+            trace.playback_seconds = round(self.played, 1)
+
+def plan_dwell(duration_seconds, scroll_chance=None, url=None):
+    """
+    Returns:
+      Nach Offset sortierte Ereignisse der Verweildauer: (offset, steps) aus
+      plan_interaction() und (offset, None) für die Playback-Proben.
+    """
+    events = plan_interaction(duration_seconds, scroll_chance, url)
+    events += [(offset, None) for offset in PlaybackProbe.offsets(duration_seconds, url)]
+    events.sort(key=lambda event: event[0])
+    return events
+
+def run_dwell_event(driver, steps, probe, time_left=None):
+    """
+    Führt ein Ereignis aus plan_dwell() aus; Schritte eines Batches nach time_left Sekunden
+    entfallen.
+
+    Returns:
+      None oder die Abbruch-Aktion der Playback-Probe.
+    """
+    if steps is None:
+        return probe.sample(driver)
+    if time_left is not None:
+        steps, _ = split_batch(steps, time_left)
+    perform_interaction_batch(driver, steps)
+    return None
+
+@timed_phase("dwell")
+def realistic_user_interaction(driver, duration_seconds, scroll_chance=None):
+    """
+    Returns:
+      None oder "requeue"/"skip", wenn die Playback-Probe die Verweildauer abbricht.
+    """
+    url = current_visit_url()
+    probe = PlaybackProbe(url)
+    events = plan_dwell(duration_seconds, scroll_chance, url)
+
+    say(f"⏱️  Verweile auf der Seite für ca. {duration_seconds} Sekunden...")
+
+    try:
+        # Ereignisse relativ zum Beginn, damit blockierende Batches die Verweildauer nicht verlängern
+        started = time.monotonic()
+        for offset, steps in events:
+            time.sleep(max(started + offset - time.monotonic(), 0))
+            time_left = started + duration_seconds - time.monotonic()
+            if time_left <= 0:
+                break
+            action = run_dwell_event(driver, steps, probe, time_left)
+            if action is not None:
+                return action
+        time.sleep(max(started + duration_seconds - time.monotonic(), 0))
+        probe.finish(driver)
+    except Exception as e:
+        # don't crash the main flow if interactions fail
+        logger.debug("realistic_user_interaction error: %s", e)
+    return None
+
+# Alias
+run_interaction = realistic_user_interaction
+
+# ----------------------------
+# Domain-Skript + Fehlerbehandlung (gemeinsam für alle Engines)
+# ----------------------------
+def run_domain_script(driver, url):
+    """
+    Führt das Domain-Skript aus (Bundle aus core.js + overrides.json oder scripts/<domain>/main.js).
+
+    Returns:
+      'success', 'restart' oder None (kein Skript / kein Erfolg -> Python-Fallbacks).
+    """
+    hostname = get_root_domain(url)
+
+    # HIER WIRD DIE LOGIK FÜR DIE ASYNCHRONE main.js INTEGRIERT
+    entry = script_registry.get(hostname)
+    if entry is None:
+        return None
+    try:
+        say(f"📜 Führe benutzerdefiniertes ASYNCHRONES JS für {hostname} aus...")
+
+        # Führt die neue main.js aus und wartet auf das Ergebnis
+        action = execute_async_js_script(driver, entry.source, url)
+
+        if action == 'success':
+            say(f"✅ ASYNCHRONES JS erfolgreich (Play gedrückt oder läuft bereits).")
+            # Kein Neustart: wir bleiben auf der Seite, die Fallbacks werden übersprungen.
+        elif action == 'restart':
+            say(f"♻️ ASYNCHRONES JS fordert Browser-Neustart an (Timeout).")
+            mark_visit_failure("js_restart")
+        else:
+            say(f"⚠️ ASYNCHRONES JS beendet ohne 'success'. Nutze Python-Fallbacks.")
+        return action
+    except Exception as e:
+        say(f"⚠️  Fehler beim Laden/Ausführen des benutzerdefinierten JS: {e}")
+        return None
+
+def visit_error_action(driver, url, e):
+    """
+    Übersetzt eine Exception während eines Besuchs in die Aktion für den Aufrufer
+    ("restart" -> Browser zurücksetzen/neu starten, "skip" -> URL überspringen).
+    """
+    if isinstance(e, (TimeoutException, urllib3.exceptions.ReadTimeoutError, socket.timeout)):
+        logger.warning("Timeout-like exception for %s: %s", url, e)
+        mark_visit_failure("timeout")
+        return "restart"
+
+    if isinstance(e, (WebDriverException, urllib3.exceptions.ProtocolError)):
+        logger.warning("WebDriver/Protocol error for %s: %s", url, e)
+        mark_visit_failure("webdriver")
+        return "restart"
+
+    logger.error("Unexpected error while processing %s: %s", url, e, exc_info=e)
+    mark_visit_failure("unexpected")
+    return "skip"
+
+# ----------------------------
+# Process single URL with retries and safe failure modes
+# ----------------------------
+def prepare_page(driver, url):
+    """
+    Schritte 1-8 eines Besuchs: Seite laden, auf Bereitschaft warten, Domain-Skript bzw.
+    Python-Fallbacks ausführen. Die Verweildauer übernimmt der Aufrufer.
+
+    Returns:
+      None -> Seite bereit zum Verweilen, "restart" -> Domain-Skript fordert Neustart an.
+    """
+    logger.info("Loading URL: %s", url)
+
+    say(f"\n{'='*60}")
+    say(f"🌍 Lade URL: {url}")
+    say(f"{'='*60}")
+
+    # 1. Seite laden
+    if not url.startswith("http"):
+        url = "https://" + url
+
+    preload_domain_script(driver, url)
+    has_consent = profile_templates.ensure_consent(driver, url)
+    with visit_phase("driver_get"):
+        driver.get(url)
+
+    # 2. Warten bis vollständig geladen
+    wait_for_page_load_complete(driver, timeout=setting("page_load_timeout", url), ready_selector=lean_mode.ready_selector(url))
+    say("✅ Seite geladen.")
+
+    # 3. Kurze Pause
+    say("⏳ Kurze Pause (Init)...")
+    random_long_sleep(1, 3)
+
+    # 4. JavaScript aus Ordner laden (falls vorhanden)
+    apply_script_timeout(driver, url)
+    action = run_domain_script(driver, url)
+    if action == 'restart':
+        return "restart"
+
+    # Flag um zu speichern, ob JS erfolgreich war
+    js_was_successful = action == 'success'
+
+    # 5. Längere Pause
+    random_long_sleep(3, 5)
+
+    # 6., 7., 8. Fallbacks nur ausführen, wenn JS NICHT erfolgreich war
+    if not js_was_successful:
+        if has_consent:
+            say("⏭️  Überspringe Cookie-Banner, Consent-Cookies kommen aus der Profil-Vorlage.")
+            saved_round_trips = 0
+        else:
+            saved_round_trips = handle_cookies(driver)
+            say("⏳ Kurze Pause (Post-Cookie)...")
             random_long_sleep(1, 3)
-            handle_play_buttons(driver)
+            profile_templates.remember_consent(driver, url)
+        saved_round_trips += handle_play_buttons(driver)
+        logger.info("Fallbacks saved %d WebDriver round trips for %s", saved_round_trips, url)
+    else:
+        say("⏭️  Überspringe Python-Fallbacks (Cookies/Play), da JS erfolgreich war.")
+    return None
+
+@traced_visit
+def process_url(driver, url):
+    """
+    Returns:
+      None -> success (visit complete)
+      "restart" -> caller should soft-reset or restart the browser (see BrowserPool.restart)
+      "requeue" -> page-level problem (no playback): retry the URL later, keep the browser
+      "skip" -> skip this URL (non-recoverable or file missing)
+    """
+    try:
+        action = prepare_page(driver, url)
+        if action is not None:
+            return action
+
+        # 9. Interaktion / Verweildauer
+        # Das wird jetzt IMMER erreicht, auch wenn JS erfolgreich war.
+        action = run_interaction(driver, setting("sleep_seconds", url))
+        if action is not None:
+            return action
+
+        # (Alter Block zur Sicherheit, falls run_interaction oben abstürzt, aber wir haben es sichergestellt)
+        # visit_time = min(args.sleep_seconds, args.max_visit_time)
+        # realistic_user_interaction(driver, duration_seconds=visit_time, scroll_chance=args.scroll_chance)
+
+        logger.info("Finished visit for %s", url)
+        return None 
+
+    except Exception as e:
+        return visit_error_action(driver, url, e)
+
+# ----------------------------
+# Faire Verteilung über Domains (Token-Bucket + Round-Robin)
+# ----------------------------
+class TokenBucket:
+    def __init__(self, rate_per_second, burst):
+        self.rate = rate_per_second
+        self.burst = max(1.0, float(burst))
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + max(now - self.updated, 0) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now):
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now):
+        self._refill(now)
+        self.tokens -= 1
+
+class DomainScheduler:
+    """
+    Ordnet den URL-Strom pro Root-Domain (get_root_domain) in Warteschlangen und gibt
+    sie reihum aus. Optional begrenzt ein Token-Bucket pro Domain die Besuche
+    (--domain_rate pro Minute, --domain_burst) und --min_revisit den Mindestabstand
+    zwischen zwei Besuchen derselben URL. Es werden höchstens --schedule_window
+    URLs vorausgelesen.
+    """
+    def __init__(self, rate_per_minute=0, burst=1, min_revisit=0, window=1000):
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self.min_revisit = min_revisit
+        self.window = max(1, window)
+        self.buckets = {}
+        # url -> letzter Besuch, in Besuchsreihenfolge (älteste zuerst)
+        self.last_dispatch = {}
+
+    def _wait_time(self, domain, url, now):
+        wait = 0.0
+        if self.rate > 0:
+            bucket = self.buckets.get(domain)
+            if bucket is None:
+                bucket = self.buckets[domain] = TokenBucket(self.rate, self.burst)
+            wait = bucket.wait_time(now)
+        if self.min_revisit > 0 and url in self.last_dispatch:
+            wait = max(wait, self.last_dispatch[url] + self.min_revisit - now)
+        return wait
+
+    def _dispatch(self, domain, url, now):
+        if self.rate > 0:
+            self.buckets[domain].take(now)
+        if self.min_revisit > 0:
+            self.last_dispatch.pop(url, None)
+            self.last_dispatch[url] = now
+            # Einträge, deren Mindestabstand abgelaufen ist, braucht niemand mehr
+            for old_url, dispatched in list(itertools.islice(self.last_dispatch.items(), 64)):
+                if now - dispatched < self.min_revisit:
+                    break
+                del self.last_dispatch[old_url]
+
+    def schedule(self, items):
+        """
+        Returns:
+          Eine ScheduledRound über items.
+        """
+        return ScheduledRound(self, items)
+
+class ScheduledRound:
+    """
+    Eine Runde des DomainScheduler. poll() schläft nie, sondern liefert den Zeitpunkt,
+    ab dem die nächste URL fällig ist; nur die Iteration wartet diesen Zeitpunkt ab
+    (für den Feeder-Thread und den seriellen Lauf).
+    """
+    def __init__(self, scheduler, items):
+        self.scheduler = scheduler
+        self.source = iter(items)
+        self.queues = {}
+        self.order = collections.deque()
+        self.buffered = 0
+        self.exhausted = False
+
+    def _fill(self):
+        while not self.exhausted and self.buffered < self.scheduler.window:
+            item = next(self.source, None)
+            if item is None:
+                self.exhausted = True
+                break
+            domain = get_root_domain(item[1])
+            if domain not in self.queues:
+                self.queues[domain] = collections.deque()
+                self.order.append(domain)
+            self.queues[domain].append(item)
+            self.buffered += 1
+
+    def poll(self):
+        """
+        Returns:
+          (item, None), wenn eine URL fällig ist, (None, ready_at) mit dem frühesten
+          time.monotonic()-Zeitpunkt, wenn alle Domains warten müssen, (None, None) am Ende.
+        """
+        self._fill()
+        if self.buffered == 0:
+            return None, None
+
+        now = time.monotonic()
+        shortest_wait = None
+        for _ in range(len(self.order)):
+            domain = self.order[0]
+            self.order.rotate(-1)
+            pending = self.queues[domain]
+            wait = self.scheduler._wait_time(domain, pending[0][1], now)
+            if wait > 0:
+                shortest_wait = wait if shortest_wait is None else min(shortest_wait, wait)
+                continue
+            item = pending.popleft()
+            self.buffered -= 1
+            self.scheduler._dispatch(domain, item[1], now)
+            if not pending:
+                del self.queues[domain]
+                self.order.remove(domain)
+            return item, None
+        return None, now + shortest_wait
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        while True:
+            item, ready_at = self.poll()
+            if item is not None:
+                return item
+            if ready_at is None:
+                raise StopIteration
+            wait = max(ready_at - time.monotonic(), 0)
+            logger.debug("All %d domains are rate limited, waiting %.1fs", len(self.order), wait)
+            time.sleep(wait)
+
+domain_scheduler = DomainScheduler(args.domain_rate, args.domain_burst, args.min_revisit, args.schedule_window)
+
+# ----------------------------
+# Retry-Backoff + Circuit-Breaker pro Domain
+# ----------------------------
+def retry_delay(attempt):
+    """
+    Exponentielles Backoff mit Jitter für den n-ten Fehlversuch (1-basiert):
+    --retry_backoff * 2^(n-1), gedeckelt bei --retry_backoff_max.
+    """
+    delay = min(args.retry_backoff * (2 ** (attempt - 1)), args.retry_backoff_max)
+    jitter = min(max(args.retry_jitter, 0.0), 1.0)
+    return random.uniform(delay * (1.0 - jitter), delay)
+
+class CircuitBreaker:
+    """
+    Zählt aufeinanderfolgende Fehlversuche pro Domain. Ab --breaker_threshold wird die
+    Domain für --breaker_cooldown Sekunden geparkt (ihre URLs werden übersprungen),
+    danach ist genau ein Probebesuch erlaubt: Erfolg schließt den Breaker, ein
+    weiterer Fehler parkt die Domain erneut. Meldet der Probebesuch nach einem weiteren
+    Cooldown nichts (Worker gestorben, Lease verloren), wird ein neuer erlaubt.
+    """
+    def __init__(self, threshold, cooldown):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.lock = threading.Lock()
+        self.domains = {}
+
+    def _state(self, domain):
+        if domain not in self.domains:
+            # trial: Startzeit des laufenden Probebesuchs, 0.0 ohne Probebesuch
+            self.domains[domain] = {"failures": 0, "open_until": 0.0, "trial": 0.0, "kinds": collections.Counter()}
+        return self.domains[domain]
+
+    def allow(self, domain):
+        if self.threshold <= 0:
+            return True
+        with self.lock:
+            state = self._state(domain)
+            if not state["open_until"]:
+                return True
+            now = time.time()
+            if now < state["open_until"]:
+                return False
+            if state["trial"]:
+                if now < state["trial"] + self.cooldown:
+                    return False
+                logger.warning("Trial visit for %s was never reported, allowing another one", domain)
+            # Cooldown vorbei -> ein einzelner Probebesuch (half-open)
+            state["trial"] = now
+            logger.info("Circuit half-open for %s, allowing one trial visit", domain)
+            return True
+
+    def record_success(self, domain):
+        if self.threshold <= 0:
+            return
+        with self.lock:
+            state = self._state(domain)
+            if state["open_until"]:
+                logger.info("Circuit closed for %s after successful trial visit", domain)
+            state.update(failures=0, open_until=0.0, trial=0.0)
+            state["kinds"].clear()
+
+    def record_failure(self, domain, kind):
+        """
+        Returns:
+          True, wenn die Domain durch diesen Fehler geparkt wurde.
+        """
+        if self.threshold <= 0:
+            return False
+        with self.lock:
+            state = self._state(domain)
+            state["failures"] += 1
+            state["kinds"][kind] += 1
+            if not state["trial"] and state["failures"] < self.threshold:
+                return False
+            state["open_until"] = time.time() + self.cooldown
+            state["trial"] = 0.0
+            kinds = ", ".join(f"{name}={count}" for name, count in state["kinds"].most_common())
+            logger.warning("Circuit open for %s after %d consecutive failures (%s), parking for %.0fs",
+                           domain, state["failures"], kinds, self.cooldown)
+            say(f"🚧 Domain {domain} wird für {self.cooldown:.0f}s geparkt ({kinds}).")
+            return True
+
+circuit_breaker = CircuitBreaker(args.breaker_threshold, args.breaker_cooldown)
+
+# ----------------------------
+# Persistenter Besuchsstatus (SQLite, --state_db)
+# ----------------------------
+class VisitStateStore:
+    """
+    Speichert pro URL letzten Besuch, Versuche, Ergebnis und Dauer in SQLite (WAL-Modus).
+
+    Ein Zyklus ist ein Durchlauf durch die URL-Liste. Bricht ein Lauf ab, bleibt der
+    Zyklus offen und beim nächsten Start werden die darin schon erledigten URLs übersprungen.
+    Ohne Pfad sind alle Methoden No-Ops.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = None
+        self.cycle = 0
+
+    def open(self):
+        if not self.path:
+            return
+        self.conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS visits (
+                url TEXT PRIMARY KEY,
+                domain TEXT,
+                last_visit REAL,
+                last_outcome TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                successes INTEGER NOT NULL DEFAULT 0,
+                failures INTEGER NOT NULL DEFAULT 0,
+                last_duration REAL,
+                total_duration REAL NOT NULL DEFAULT 0,
+                final_outcome TEXT,
+                done_cycle INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS visits_domain ON visits (domain);
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+        """)
+        self.cycle = int(self._get_meta("cycle") or 0)
+
+    def start_cycle(self):
+        """
+        Zu Beginn jeder Runde: offenen Zyklus fortsetzen oder einen neuen beginnen.
+        """
+        if self.conn is None:
+            return
+        with self.lock:
+            if self.cycle and self._get_meta("cycle_complete") == "0":
+                logger.info("Resuming unfinished cycle %d from %s", self.cycle, self.path)
+                return
+            self.cycle += 1
+            self._set_meta("cycle", str(self.cycle))
+            self._set_meta("cycle_complete", "0")
+
+    def _get_meta(self, key):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self.conn.execute("INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value", (key, value))
+
+    def record_attempt(self, url, outcome, duration):
+        if self.conn is None:
+            return
+        success = 1 if outcome == "success" else 0
+        with self.lock:
+            self.conn.execute("""
+                INSERT INTO visits (url, domain, last_visit, last_outcome, attempts, successes, failures, last_duration, total_duration)
+                VALUES (?, ?, ?, ?, 1, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    last_visit = excluded.last_visit,
+                    last_outcome = excluded.last_outcome,
+                    attempts = attempts + 1,
+                    successes = successes + excluded.successes,
+                    failures = failures + excluded.failures,
+                    last_duration = excluded.last_duration,
+                    total_duration = total_duration + excluded.total_duration
+            """, (url, get_root_domain(url), time.time(), outcome, success, 1 - success, duration, duration))
+
+    def mark_done(self, url, outcome):
+        if self.conn is None:
+            return
+        with self.lock:
+            self.conn.execute("""
+                INSERT INTO visits (url, domain, final_outcome, done_cycle) VALUES (?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET final_outcome = excluded.final_outcome, done_cycle = excluded.done_cycle
+            """, (url, get_root_domain(url), outcome, self.cycle))
+
+    def done_in_cycle(self):
+        if self.conn is None:
+            return set()
+        with self.lock:
+            return {row[0] for row in self.conn.execute("SELECT url FROM visits WHERE done_cycle = ?", (self.cycle,))}
+
+    def pending(self, items):
+        """
+        Filtert (Position, URL)-Paare, die im aktuellen Zyklus schon erledigt sind.
+        """
+        done = self.done_in_cycle()
+        if done:
+            logger.info("Skipping %d URLs already completed in cycle %d.", len(done), self.cycle)
+        for position, url in items:
+            if url not in done:
+                yield position, url
+
+    def complete_cycle(self):
+        if self.conn is None:
+            return
+        with self.lock:
+            self._set_meta("cycle_complete", "1")
+
+    def report(self):
+        """
+        Kurze Übersicht pro Domain (für --state_report).
+        """
+        rows = self.conn.execute("""
+            SELECT domain, COUNT(*), SUM(attempts), SUM(successes), SUM(failures), AVG(last_duration), MAX(last_visit)
+            FROM visits GROUP BY domain ORDER BY domain
+        """).fetchall()
+        print(f"Cycle {self.cycle} ({self.path})")
+        print(f"{'Domain':<30}{'URLs':>8}{'Versuche':>10}{'Erfolge':>10}{'Fehler':>10}{'Ø Dauer':>10}  Letzter Besuch")
+        for domain, urls, attempts, successes, failures, avg_duration, last_visit in rows:
+            last = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(last_visit)) if last_visit else "-"
+            print(f"{domain or '-':<30}{urls:>8}{attempts:>10}{successes:>10}{failures:>10}{(avg_duration or 0):>10.1f}  {last}")
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+visit_state = VisitStateStore(args.state_db)
+
+def finish_url(stats, url, outcome):
+    """
+    Endergebnis einer URL (nach allen Versuchen) zählen und im Status-Store ablegen.
+    """
+    if stats is not None:
+        stats.record(outcome)
+    if outcome != "parked":
+        # Geparkte URLs bleiben im Zyklus offen und werden beim Fortsetzen erneut versucht.
+        visit_state.mark_done(url, outcome)
+    work_client.report(url, outcome)
+
+# ----------------------------
+# Ressourcen-Monitor (RSS/CPU des chromedriver/Chrome-Prozessbaums)
+# ----------------------------
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+def driver_root_pid(driver):
+    """
+    PID des chromedriver-Prozesses (Wurzel des Browser-Prozessbaums), None wenn unbekannt.
+    """
+    try:
+        return driver.service.process.pid
+    except AttributeError:
+        return None
+
+# Neue Prozesse (z.B. Renderer) fallen erst beim nächsten vollen Scan auf; verschwundene sofort
+PROC_RESCAN_INTERVAL = 60.0
+
+def _read_proc_stat(pid):
+    """
+    Returns:
+      Felder aus /proc/<pid>/stat ab dem Zustand (Feld 3) oder None, wenn der Prozess weg ist.
+    """
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            stat = f.read()
+    except OSError:
+        return None
+    # Der Prozessname (Feld 2) kann Leerzeichen enthalten -> hinter der letzten Klammer weiterparsen
+    return stat[stat.rfind(b")") + 2:].split()
+
+def _proc_stat_fields():
+    """
+    Returns:
+      {pid: Felder aus /proc/<pid>/stat ab dem Zustand (Feld 3)} für alle Prozesse.
+    """
+    stats = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        fields = _read_proc_stat(entry)
+        if fields is not None:
+            stats[int(entry)] = fields
+    return stats
+
+class ProcessTree:
+    """
+    Prozessbaum eines Browsers (root_pid und Nachfahren). Gemessen werden nur die
+    bekannten Prozesse; alle Prozesse (/proc bzw. psutil) werden nur neu durchsucht,
+    wenn einer davon verschwunden ist oder PROC_RESCAN_INTERVAL abgelaufen ist.
+    """
+    def __init__(self, root_pid):
+        self.root_pid = root_pid
+        # psutil: [Process], /proc: {pid: Startzeit (Feld 22)} gegen wiederverwendete PIDs
+        self.members = None
+        self.scanned = None
+
+    def usage(self):
+        """
+        Returns:
+          (rss_mb, cpu_seconds, processes) für root_pid und alle Nachfahren oder None, wenn unbekannt.
+        """
+        if self.root_pid is None:
+            return None
+        if self.scanned is not None and time.monotonic() - self.scanned < PROC_RESCAN_INTERVAL:
+            usage = self._measure()
+            if usage is not None:
+                return usage
+        if not self._scan():
+            return None
+        return self._measure()
+
+    def _scan(self):
+        self.members = None
+        if psutil is not None:
+            try:
+                root = psutil.Process(self.root_pid)
+                self.members = [root] + root.children(recursive=True)
+            except psutil.Error:
+                return False
+        else:
+            if not os.path.isdir("/proc"):
+                return False
+            stats = _proc_stat_fields()
+            if self.root_pid not in stats:
+                return False
+            children = collections.defaultdict(list)
+            for pid, fields in stats.items():
+                children[int(fields[1])].append(pid)
+            self.members = {}
+            pending = [self.root_pid]
+            while pending:
+                pid = pending.pop()
+                self.members[pid] = stats[pid][19]
+                pending.extend(children.get(pid, []))
+        self.scanned = time.monotonic()
+        return True
+
+    def _measure(self):
+        """
+        Returns:
+          Die Summen über die bekannten Prozesse oder None, wenn einer davon verschwunden ist.
+        """
+        if self.members is None:
+            return None
+        rss = cpu = 0.0
+        if psutil is not None:
+            for process in self.members:
+                try:
+                    rss += process.memory_info().rss
+                    times = process.cpu_times()
+                    cpu += times.user + times.system
+                except psutil.Error:
+                    return None
+        else:
+            for pid, started in self.members.items():
+                fields = _read_proc_stat(pid)
+                if fields is None or fields[19] != started:
+                    return None
+                # utime/stime = Felder 14/15, rss (Seiten) = Feld 24
+                cpu += (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+                rss += int(fields[21]) * PAGE_SIZE
+        return rss / (1024 * 1024), cpu, len(self.members)
+
+class DriverMonitor:
+    """
+    Misst zwischen zwei Besuchen RSS und CPU des Prozessbaums jedes Browsers und meldet
+    die Werte ins Log, an visit_metrics (--trace_file, --metrics_port, --stats_file)
+    und beim Beenden eine Zusammenfassung pro Browser.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.drivers = {}
+        self.trees = {}
+        self.labels = itertools.count(1)
+
+    def register(self, driver):
+        pid = driver_root_pid(driver)
+        tree = ProcessTree(pid)
+        usage = tree.usage()
+        now = time.time()
+        with self.lock:
+            self.trees[id(driver)] = tree
+            self.drivers[id(driver)] = {
+                "label": f"driver-{next(self.labels)}",
+                "pid": pid,
+                "started": now,
+                "sampled": now,
+                "visits": 0,
+                "rss_mb": usage[0] if usage else 0.0,
+                "peak_rss_mb": usage[0] if usage else 0.0,
+                "cpu_seconds": usage[1] if usage else 0.0,
+                "cpu_percent": 0.0,
+                "processes": usage[2] if usage else 0,
+            }
+
+    def sample(self, driver, visits):
+        """
+        Returns:
+          Die aktuellen Werte des Browsers (dict) oder None, wenn der Prozessbaum unbekannt ist.
+        """
+        with self.lock:
+            known = id(driver) in self.drivers
+        if not known:
+            self.register(driver)
+        with self.lock:
+            info = self.drivers[id(driver)]
+            tree = self.trees[id(driver)]
+        usage = tree.usage()
+        if usage is None:
+            return None
+        rss_mb, cpu_seconds, processes = round(usage[0], 1), round(usage[1], 2), usage[2]
+        now = time.time()
+        with self.lock:
+            elapsed = max(now - info["sampled"], 1e-6)
+            info["cpu_percent"] = round(max(cpu_seconds - info["cpu_seconds"], 0.0) * 100 / elapsed, 1)
+            info.update(sampled=now, visits=visits, rss_mb=rss_mb, cpu_seconds=cpu_seconds, processes=processes)
+            info["peak_rss_mb"] = max(info["peak_rss_mb"], rss_mb)
+            record = dict(info)
+        logger.info("%s (pid %s): %.0f MB RSS in %d processes, %.0f%% CPU, %d visits",
+                    record["label"], record["pid"], rss_mb, processes, record["cpu_percent"], visits)
+        visit_metrics.observe_driver("sample", record)
+        return record
+
+    def retire(self, driver, reason):
+        with self.lock:
+            info = self.drivers.pop(id(driver), None)
+            self.trees.pop(id(driver), None)
+        if info is None:
+            return
+        record = dict(info, reason=reason, lifetime=round(time.time() - info["started"], 1))
+        logger.info("%s retired (%s) after %d visits in %.0fs, peak %.0f MB RSS, %.1fs CPU",
+                    record["label"], reason, record["visits"], record["lifetime"], record["peak_rss_mb"], record["cpu_seconds"])
+        visit_metrics.observe_driver("retired", record)
+
+driver_monitor = DriverMonitor()
+
+# ----------------------------
+# Browser start + Retry-Logik pro URL
+# ----------------------------
+def start_browser():
+    profile_dir = profile_templates.clone()
+    try:
+        driver = create_browser_attempt(profile_dir=profile_dir)
+    except Exception:
+        if profile_dir is not None:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+        raise
+    profile_templates.attach(driver, profile_dir)
+    # WICHTIG: Setze Timeout für asynchrone Skripte (damit execute_async_script nicht unendlich wartet)
+    apply_script_timeout(driver)
+    profile_templates.seed_cookies(driver)
+    return driver
+
+# Zuletzt gesetztes Script-Timeout pro Browser, damit nur Änderungen einen Aufruf kosten
+script_timeouts = weakref.WeakKeyDictionary()
+
+def apply_script_timeout(driver, url=None):
+    """
+    Setzt --script_timeout (bzw. den Domain-Override aus --config) am laufenden Browser.
+    """
+    timeout = setting("script_timeout", url)
+    if script_timeouts.get(driver) != timeout:
+        driver.set_script_timeout(timeout)
+        script_timeouts[driver] = timeout
+
+@contextlib.contextmanager
+def blank_page_timeout(driver):
+    """
+    Bricht eine hängende Navigation per Page.stopLoading ab (chromedriver wartet sonst vor
+    jedem Befehl auf sie) und begrenzt den Page-Load-Timeout auf BLANK_PAGE_TIMEOUT.
+    """
+    try:
+        driver.execute_cdp_cmd("Page.stopLoading", {})
+    except Exception as e:
+        logger.debug("Page.stopLoading failed: %s", e)
+    driver.set_page_load_timeout(BLANK_PAGE_TIMEOUT)
+    try:
+        yield
+    finally:
+        driver.set_page_load_timeout(WEBDRIVER_PAGE_LOAD_TIMEOUT)
+
+def load_blank_page(driver):
+    with blank_page_timeout(driver):
+        driver.get("about:blank")
+
+def soft_reset_driver(driver):
+    """
+    Günstiger Reset statt Chrome-Neustart: laufende Navigation abbrechen, extra Tabs
+    schließen, Cookies und Storage löschen, about:blank laden. Gibt False zurück, wenn der
+    Browser nicht mehr reagiert.
+    """
+    try:
+        with blank_page_timeout(driver):
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            driver.delete_all_cookies()
+            driver.execute_script("try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}")
+            driver.get("about:blank")
+        profile_templates.seed_cookies(driver)
+        return True
+    except Exception as e:
+        logger.debug("Soft reset failed: %s", e)
+        return False
+
+def page_js_heap_mb(driver):
+    """
+    Genutzter JS-Heap der aktuellen Seite in MB (Chrome performance.memory), None wenn unbekannt.
+    Sagt nichts über den Speicher des Browsers aus, dafür gibt es --recycle_rss_mb.
+    """
+    try:
+        used = driver.execute_script("return (window.performance && performance.memory) ? performance.memory.usedJSHeapSize : null;")
+        return used / (1024 * 1024) if used else None
+    except Exception:
+        return None
+
+def quit_driver_quietly(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+    try:
+        profile_templates.release(driver)
+    except Exception as e:
+        logger.warning("Could not return browser profile to the template: %s", e)
+
+class BrowserPool:
+    """
+    Hält vorgewärmte Chrome-Instanzen bereit (--warm_spares), versucht bei einem
+    Restart zuerst einen Soft-Reset (--soft_reset) und recycelt Browser zwischen zwei
+    Besuchen nach --recycle_after_visits Besuchen, über --recycle_rss_mb (Prozessbaum)
+    oder über --recycle_js_heap_mb (JS-Heap der aktuellen Seite).
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.spares = 0
+        self.ready = []
+        self.visits = {}
+        self.closed = False
+        self.refill_thread = None
+
+    def start(self, spares):
+        self.spares = spares
+        self.closed = False
+        if spares > 0 and self.refill_thread is None:
+            self.refill_thread = threading.Thread(target=self._refill_loop, name="browser-pool", daemon=True)
+            self.refill_thread.start()
+            logger.info("Keeping %d pre-warmed browser(s) ready.", spares)
+
+    def _refill_loop(self):
+        while not self.closed:
+            with self.lock:
+                missing = self.spares - len(self.ready)
+            if missing <= 0:
+                self.wakeup.wait(5)
+                self.wakeup.clear()
+                continue
+            try:
+                driver = start_browser()
+            except Exception as e:
+                logger.warning("Could not pre-warm browser: %s", e)
+                time.sleep(args.retry_backoff)
+                continue
+            with self.lock:
+                if not self.closed:
+                    self.ready.append(driver)
+                    driver = None
+            if driver is not None:
+                quit_driver_quietly(driver)
+
+    def acquire(self):
+        with self.lock:
+            driver = self.ready.pop() if self.ready else None
+        self.wakeup.set()
+        if driver is None:
+            driver = start_browser()
+        else:
+            logger.info("Using pre-warmed browser.")
+        with self.lock:
+            self.visits[id(driver)] = 0
+        driver_monitor.register(driver)
+        return driver
+
+    def discard(self, driver, reason="discarded"):
+        with self.lock:
+            self.visits.pop(id(driver), None)
+        driver_monitor.retire(driver, reason)
+        if self.spares > 0:
+            # Beenden im Hintergrund, der Ersatz-Browser steht ja schon bereit
+            threading.Thread(target=quit_driver_quietly, args=(driver,), daemon=True).start()
         else:
-            print("⏭️  Überspringe Python-Fallbacks (Cookies/Play), da JS erfolgreich war.")
+            quit_driver_quietly(driver)
+
+    def restart(self, driver):
+        """
+        Soft-Reset (falls aktiviert), sonst harter Neustart über einen (vorgewärmten) Browser.
+        """
+        if args.soft_reset and soft_reset_driver(driver):
+            logger.info("Soft reset succeeded, reusing browser.")
+            return driver
+        self.discard(driver, "restart")
+        return self.acquire()
+
+    def record_visit(self, driver):
+        """
+        Zählt einen Besuch und tauscht den Browser aus, wenn ein Recycle-Limit erreicht ist.
+        """
+        reason = self.count_visit(driver)
+        if reason is None:
+            return driver
+        return self.replace(driver, reason)
+
+    def count_visit(self, driver):
+        """
+        Zählt einen Besuch und prüft die Recycle-Limits.
+
+        Returns:
+          Den Grund für ein Recycling (str) oder None.
+        """
+        with self.lock:
+            visits = self.visits.get(id(driver), 0) + 1
+            self.visits[id(driver)] = visits
+
+        record = driver_monitor.sample(driver, visits)
+
+        reason = None
+        if args.recycle_after_visits and visits >= args.recycle_after_visits:
+            reason = f"{visits} visits"
+        elif args.recycle_rss_mb and record is not None and record["rss_mb"] > args.recycle_rss_mb:
+            reason = f"{record['rss_mb']:.0f} MB RSS"
+        elif args.recycle_js_heap_mb:
+            heap_mb = page_js_heap_mb(driver)
+            if heap_mb is not None and heap_mb > args.recycle_js_heap_mb:
+                reason = f"{heap_mb:.0f} MB page JS heap"
+        return reason
+
+    def replace(self, driver, reason):
+        logger.info("Recycling browser after %s.", reason)
+        try:
+            replacement = self.acquire()
+        except Exception as e:
+            logger.warning("Could not start replacement browser, keeping the old one: %s", e)
+            return driver
+        self.discard(driver, f"recycled after {reason}")
+        return replacement
+
+    def release(self, driver):
+        """
+        Gibt einen Browser am Ende einer Runde zurück: bei aktivem Pool wird er
+        zurückgesetzt und wiederverwendet, sonst beendet.
+        """
+        with self.lock:
+            keep = self.spares > 0 and not self.closed and len(self.ready) < self.spares
+        if keep and args.soft_reset and soft_reset_driver(driver):
+            with self.lock:
+                self.visits.pop(id(driver), None)
+                self.ready.append(driver)
+            driver_monitor.retire(driver, "returned to pool")
+            return
+        self.discard(driver, "end of round")
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            drivers, self.ready = self.ready, []
+        self.wakeup.set()
+        for driver in drivers:
+            quit_driver_quietly(driver)
+
+browser_pool = BrowserPool()
+
+class RetryQueue:
+    """
+    URLs, die process_url() mit "requeue" zurückgegeben hat: sie kommen nach retry_delay()
+    wieder an die Reihe, in der Zwischenzeit besucht der Browser andere URLs.
+    """
+    def __init__(self):
+        self.items = []
+        self.order = itertools.count()
+
+    def __len__(self):
+        return len(self.items)
+
+    def add(self, position, url, attempt):
+        heapq.heappush(self.items, (time.time() + retry_delay(attempt), next(self.order), (position, url, attempt)))
+
+    def pop_due(self):
+        """
+        Returns:
+          Den nächsten fälligen (position, url, attempt) oder None.
+        """
+        if self.items and self.items[0][0] <= time.time():
+            return heapq.heappop(self.items)[2]
+        return None
+
+    def wait_time(self):
+        """
+        Returns:
+          Sekunden bis zum nächsten fälligen Eintrag, None ohne Einträge.
+        """
+        return max(self.items[0][0] - time.time(), 0) if self.items else None
+
+def with_requeued(items, retries):
+    """
+    Liefert (position, url, attempt): fällige Einträge aus retries vor der nächsten URL aus
+    items, am Ende des Stroms die restlichen nach ihrer Wartezeit.
+    """
+    for position, url in items:
+        item = retries.pop_due()
+        while item is not None:
+            yield item
+            item = retries.pop_due()
+        yield position, url, 0
+    while retries:
+        time.sleep(retries.wait_time())
+        item = retries.pop_due()
+        if item is not None:
+            yield item
+
+def reset_page(driver):
+    # Medien und Skripte der Seite stoppen, der Browser bleibt
+    try:
+        load_blank_page(driver)
+    except Exception as e:
+        logger.debug("Could not reset the page: %s", e)
 
-        # 9. Interaktion / Verweildauer
-        # Das wird jetzt IMMER erreicht, auch wenn JS erfolgreich war.
-        run_interaction(driver, args.sleep_seconds)
+def visit_url_with_retries(driver, url, position, total, stats=None, attempt=0, retries=None):
+    """
+    Besucht eine URL mit den bekannten Retry/Restart-Regeln von process_url(). Bei
+    "requeue" landet die URL ohne Neustart und ohne Circuit-Breaker-Fehler in retries
+    (ohne retries: erneuter Versuch nach retry_delay() im selben Browser).
 
-        # (Alter Block zur Sicherheit, falls run_interaction oben abstürzt, aber wir haben es sichergestellt)
-        # visit_time = min(args.sleep_seconds, args.max_visit_time)
-        # realistic_user_interaction(driver, duration_seconds=visit_time, scroll_chance=args.scroll_chance)
+    Returns:
+      Den (eventuell neu erstellten) driver, der für die nächste URL weiterverwendet wird.
+    """
+    domain = get_root_domain(url)
+    while attempt <= setting("max_retries", url):
+        if not circuit_breaker.allow(domain):
+            logger.info("Domain %s is parked by the circuit breaker, skipping %s", domain, url)
+            finish_url(stats, url, "parked")
+            return driver
+        attempt += 1
+        logger.info("Processing URL [%d/%s] attempt %d: %s", position, total or "?", attempt, url)
+        action = None
+        try:
+            action = process_url(driver, url)
+        except Exception as e:
+            logger.exception("process_url raised an unexpected exception: %s", e)
+            action = "restart"
+        failure = last_visit_failure() or "unexpected"
 
-        logger.info("Finished visit for %s", url)
-        return None 
+        if action is None:
+            # success -> move to next URL
+            circuit_breaker.record_success(domain)
+            finish_url(stats, url, "success")
+            return browser_pool.record_visit(driver)
+        if action == "skip":
+            logger.info("Skipping URL after unrecoverable error: %s", url)
+            circuit_breaker.record_failure(domain, failure)
+            finish_url(stats, url, "skip")
+            return driver
+        if action == "requeue":
+            reset_page(driver)
+            if attempt > setting("max_retries", url):
+                break
+            logger.info("Requeueing URL %s after %s (attempt %d of %d).", url, failure, attempt, setting("max_retries", url) + 1)
+            if retries is not None:
+                retries.add(position, url, attempt)
+                return driver
+            time.sleep(retry_delay(attempt))
+            continue
+        if action == "restart":
+            logger.info("Restart requested for URL %s after %s failure (attempt %d of %d).", url, failure, attempt, setting("max_retries", url) + 1)
+            if stats is not None:
+                stats.record_restart()
+            if not circuit_breaker.record_failure(domain, failure):
+                time.sleep(retry_delay(attempt))
+            restart_started = time.perf_counter()
+            try:
+                driver = browser_pool.restart(driver)
+                visit_metrics.observe_restart(url, time.perf_counter() - restart_started)
+            except Exception as e:
+                logger.exception("Failed to recreate WebDriver while retrying URL %s: %s", url, e)
+                time.sleep(args.retry_backoff)
+            continue
 
-    except (TimeoutException, urllib3.exceptions.ReadTimeoutError, socket.timeout) as e:
-        logger.warning("Timeout-like exception for %s: %s", url, e)
+        logger.warning("Unknown action from process_url: %s. Skipping URL.", action)
+        finish_url(stats, url, "skip")
+        return driver
+
+    finish_url(stats, url, "failed")
+    return driver
+
+# ----------------------------
+# Mehrere Tabs pro Browser (--tabs N)
+# ----------------------------
+class TabVisit:
+    """
+    Ein Tab einer TabSession mit seinem laufenden Besuch und dessen Zeitpunkten.
+    """
+    def __init__(self, number, handle):
+        self.number = number
+        self.handle = handle
+        self.item = None
+        self.trace = None
+        self.dwell_started = 0.0
+        self.deadline = 0.0
+        self.next_action = 0.0
+        self.plan = collections.deque()
+        self.probe = None
+
+class TabSession:
+    """
+    Ein Browser mit --tabs Tabs: Laden, Skript und Fallbacks laufen nacheinander im
+    jeweiligen Tab, danach verweilt jeder Tab bis zu seiner eigenen Deadline. Der Fokus
+    wechselt immer zu dem Tab, der als Nächstes eine Scroll-Aktion oder sein Ende hat;
+    während ein Tab lädt, werden fällige Aktionen der anderen erst danach nachgeholt.
+    """
+    def __init__(self, driver, next_item, total, stats):
+        self.driver = driver
+        self.next_item = next_item
+        self.total = total
+        self.stats = stats
+        self.tabs = []
+        self.focused = None
+        self.retries = []
+        self.exhausted = False
+        self.drain_reason = None
+
+    def run(self):
+        """
+        next_item(timeout=...) verhält sich wie queue.Queue.get: liefert (position, url),
+        None am Ende des Stroms oder wirft queue.Empty, wenn in timeout Sekunden nichts kam.
+
+        Returns:
+          Den (eventuell neu erstellten) driver, nachdem next_item() None geliefert hat.
+        """
+        self._open_tabs()
+        while True:
+            try:
+                if not self._step():
+                    break
+            except Exception as e:
+                logger.warning("Browser with %d tabs failed, restarting: %s", len(self.tabs), e)
+                self._restart_browser()
+        self._close_tabs()
+        return self.driver
+
+    def _step(self):
+        now = time.time()
+        idle = [tab for tab in self.tabs if tab.item is None]
+        busy = [tab for tab in self.tabs if tab.item is not None]
+
+        # Fällige Tabs (Deadline oder Scroll-Aktion) haben Vorrang vor neuen Besuchen
+        due = [tab for tab in busy if now >= min(tab.deadline, tab.next_action)]
+        if due:
+            for tab in due:
+                if now >= tab.deadline:
+                    self._finish(tab)
+                else:
+                    self._interact(tab)
+            return True
+
+        if idle and not self.drain_reason:
+            item = self._next(now, busy)
+            if item is not None:
+                self._start(idle[0], item)
+                return True
+            now = time.time()
+
+        if not busy:
+            if self.drain_reason:
+                self.driver = browser_pool.replace(self.driver, self.drain_reason)
+                self.drain_reason = None
+                self._open_tabs()
+                return True
+            if not self.retries and self.exhausted:
+                return False
+
+        # Bis zum nächsten fälligen Ereignis schlafen: Scroll-Aktion, Deadline oder Retry
+        events = [min(tab.deadline, tab.next_action) for tab in busy]
+        if idle and not self.drain_reason:
+            events += [ready_at for ready_at, _ in self.retries]
+        if events:
+            time.sleep(max(min(events) - now, 0))
+        return True
+
+    def _next(self, now, busy):
+        for index, (ready_at, item) in enumerate(self.retries):
+            if ready_at <= now:
+                del self.retries[index]
+                return item
+        if self.exhausted:
+            return None
+        # Nur so lange auf eine neue URL warten, bis ein anderer Tab oder ein Retry wieder dran ist
+        events = [min(tab.deadline, tab.next_action) for tab in busy] + [ready_at for ready_at, _ in self.retries]
+        timeout = max(min(events) - now, 0) if events else None
         try:
-            driver.quit()
-        except Exception:
-            pass
-        return "restart"
+            item = self.next_item(timeout=timeout)
+        except queue.Empty:
+            return None
+        if item is None:
+            self.exhausted = True
+            return None
+        position, url = item
+        return position, url, 1
 
-    except (WebDriverException, urllib3.exceptions.ProtocolError) as e:
-        logger.warning("WebDriver/Protocol error for %s: %s", url, e)
+    def _open_tabs(self):
+        handles = self.driver.window_handles
+        self.tabs = [TabVisit(1, handles[0])]
+        self.focused = None
+        if not hasattr(self.driver.switch_to, "new_window"):
+            logger.warning("Browser backend cannot open tabs, using a single tab.")
+            return
+        for number in range(2, max(args.tabs, 1) + 1):
+            self.driver.switch_to.new_window("tab")
+            self.tabs.append(TabVisit(number, self.driver.current_window_handle))
+        self.focused = self.tabs[-1].handle
+
+    def _close_tabs(self):
+        try:
+            for tab in self.tabs[1:]:
+                self.driver.switch_to.window(tab.handle)
+                self.driver.close()
+            self.driver.switch_to.window(self.tabs[0].handle)
+        except Exception as e:
+            logger.debug("Closing tabs failed: %s", e)
+
+    @contextlib.contextmanager
+    def _focus(self, tab):
+        if self.focused != tab.handle:
+            self.driver.switch_to.window(tab.handle)
+            self.focused = tab.handle
+        token = current_visit.set(tab.trace)
+        try:
+            yield
+        finally:
+            current_visit.reset(token)
+
+    def _start(self, tab, item):
+        position, url, attempt = item
+        domain = get_root_domain(url)
+        if not circuit_breaker.allow(domain):
+            logger.info("Domain %s is parked by the circuit breaker, skipping %s", domain, url)
+            finish_url(self.stats, url, "parked")
+            return
+        logger.info("Processing URL [%d/%s] attempt %d in tab %d: %s", position, self.total or "?", attempt, tab.number, url)
+        tab.item = item
+        tab.trace = VisitTrace(url)
+        with self._focus(tab):
+            try:
+                action = prepare_page(self.driver, url)
+            except Exception as e:
+                action = visit_error_action(self.driver, url, e)
+        if action is not None:
+            self._fail(tab, action)
+            return
+        now = time.time()
+        dwell = setting("sleep_seconds", url)
+        say(f"⏱️  Tab {tab.number} verweilt ca. {dwell} Sekunden...")
+        tab.dwell_started = now
+        tab.deadline = now + dwell
+        tab.plan = collections.deque(plan_dwell(dwell, url=url))
+        tab.probe = PlaybackProbe(url)
+        self._schedule(tab)
+
+    def _schedule(self, tab):
+        # Ohne weitere Batches ist erst die Deadline wieder fällig
+        tab.next_action = tab.dwell_started + tab.plan[0][0] if tab.plan else tab.deadline
+
+    def _interact(self, tab):
+        _, steps = tab.plan.popleft()
+        if steps is not None:
+            # Der Batch blockiert den Browser: nur bis zum nächsten Ereignis eines anderen Tabs,
+            # der Rest wird danach als eigener Batch fortgesetzt
+            now = time.time()
+            events = [tab.deadline] + [min(other.deadline, other.next_action) for other in self.tabs if other is not tab and other.item is not None]
+            head, rest = split_batch(steps, min(events) - now)
+            if rest:
+                resume = now - tab.dwell_started + steps[len(head)][0] / 1000.0
+                index = next((i for i, event in enumerate(tab.plan) if event[0] > resume), len(tab.plan))
+                tab.plan.insert(index, (resume, rest))
+            steps = head
+        with self._focus(tab):
+            action = run_dwell_event(self.driver, steps, tab.probe)
+        if action is not None:
+            self._fail(tab, action)
+            return
+        self._schedule(tab)
+
+    def _finish(self, tab):
+        _, url, _ = tab.item
+        with self._focus(tab):
+            tab.probe.finish(self.driver)
+        tab.trace.add("dwell", time.time() - tab.dwell_started)
+        finish_trace(tab.trace, "success")
+        circuit_breaker.record_success(get_root_domain(url))
+        finish_url(self.stats, url, "success")
+        logger.info("Finished visit for %s in tab %d", url, tab.number)
+        tab.item = tab.trace = None
+        # Medien des beendeten Besuchs stoppen, bis der Tab wieder gebraucht wird
+        with self._focus(tab):
+            self.driver.get("about:blank")
+        reason = browser_pool.count_visit(self.driver)
+        if reason is not None and self.drain_reason is None:
+            logger.info("Browser reached its recycle limit (%s), finishing open tabs first.", reason)
+            self.drain_reason = reason
+
+    def _fail(self, tab, action, failure=None):
+        position, url, attempt = tab.item
+        failure = failure or tab.trace.failure or "unexpected"
+        finish_trace(tab.trace, action)
+        tab.item = tab.trace = None
+        # Seitenprobleme ("requeue", z.B. keine Wiedergabe) zählen nicht für den Circuit-Breaker
+        parked = action != "requeue" and circuit_breaker.record_failure(get_root_domain(url), failure)
+        max_retries = setting("max_retries", url)
+        if action in ("restart", "requeue") and attempt <= max_retries:
+            logger.info("Retrying URL %s after %s failure (attempt %d of %d).", url, failure, attempt, max_retries + 1)
+            if self.stats is not None and action == "restart":
+                self.stats.record_restart()
+            ready_at = time.time() + (0 if parked else retry_delay(attempt))
+            self.retries.append((ready_at, (position, url, attempt + 1)))
+        else:
+            finish_url(self.stats, url, "skip" if action == "skip" else "failed")
+        # Nur der Tab wird zurückgesetzt, die Besuche der anderen Tabs laufen weiter
+        with self._focus(tab):
+            self.driver.get("about:blank")
+
+    def _restart_browser(self):
+        for tab in self.tabs:
+            if tab.item is not None:
+                tab.trace.failure = tab.trace.failure or "webdriver"
+                self._fail_quietly(tab)
         try:
-            driver.quit()
+            self.driver = browser_pool.restart(self.driver)
+            self._open_tabs()
+        except Exception as e:
+            # Die Retries bleiben eingeplant; scheitert der nächste Schritt, folgt der nächste Versuch
+            logger.exception("Failed to recreate WebDriver for %d tabs: %s", len(self.tabs), e)
+            time.sleep(args.retry_backoff)
+
+    def _fail_quietly(self, tab):
+        try:
+            self._fail(tab, "restart")
         except Exception:
+            # about:blank im toten Browser schlägt fehl, der Besuch ist trotzdem verbucht
             pass
-        return "restart"
+
+# ----------------------------
+# Worker-Pool (--workers N)
+# ----------------------------
+class VisitStats:
+    """
+    Thread-sichere Zähler für den Durchsatz aller Worker.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.counts = {"success": 0, "skip": 0, "failed": 0, "parked": 0}
+        self.restarts = 0
+        self.playback_started = visit_metrics.playback_total()
+
+    def record(self, outcome):
+        with self.lock:
+            self.counts[outcome] = self.counts.get(outcome, 0) + 1
+
+    def record_restart(self):
+        with self.lock:
+            self.restarts += 1
+
+    def summary(self):
+        with self.lock:
+            elapsed = max(time.time() - self.started, 1e-6)
+            done = sum(self.counts.values())
+            playback = visit_metrics.playback_total() - self.playback_started
+            return (
+                f"{done} URLs in {elapsed:.0f}s "
+                f"(success={self.counts['success']}, skip={self.counts['skip']}, failed={self.counts['failed']}, "
+                f"parked={self.counts['parked']}, "
+                f"restarts={self.restarts}) -> {self.counts['success'] * 3600 / elapsed:.1f} visits/h, "
+                f"{playback:.0f}s effective playback ({playback * 3600 / elapsed:.0f}s/h)"
+            )
+
+class BrowserWorker(threading.Thread):
+    """
+    Ein Worker besitzt genau einen Chrome und zieht URLs aus der gemeinsamen Queue.
+    """
+    def __init__(self, worker_id, url_queue, total, stats):
+        super().__init__(name=f"worker-{worker_id}", daemon=True)
+        self.worker_id = worker_id
+        self.url_queue = url_queue
+        self.total = total
+        self.stats = stats
+        self.driver = None
+        self.finished = False
+        self.retries = RetryQueue()
+
+    def run(self):
+        try:
+            if args.tabs > 1:
+                self._run_tabs()
+                return
+            for position, url, attempt in with_requeued(iter(self._next_item, None), self.retries):
+                try:
+                    if self.driver is None:
+                        self.driver = browser_pool.acquire()
+                    self.driver = visit_url_with_retries(self.driver, url, position, self.total, self.stats, attempt, self.retries)
+                except Exception as e:
+                    logger.exception("[%s] Could not process %s: %s", self.name, url, e)
+                    finish_url(self.stats, url, "failed")
+                    self._release_driver(discard=True)
+                    time.sleep(args.retry_backoff)
+        finally:
+            self._release_driver()
+            logger.info("[%s] Browser closed.", self.name)
+
+    def _next_item(self, timeout=None):
+        item = self.url_queue.get(timeout=timeout)
+        self.url_queue.task_done()
+        if item is None:
+            # Ende des URL-Stroms
+            self.finished = True
+        return item
+
+    def _run_tabs(self):
+        while not self.finished:
+            try:
+                if self.driver is None:
+                    self.driver = browser_pool.acquire()
+                self.driver = TabSession(self.driver, self._next_item, self.total, self.stats).run()
+            except Exception as e:
+                logger.exception("[%s] Tab session failed: %s", self.name, e)
+                self._release_driver(discard=True)
+                time.sleep(args.retry_backoff)
+
+    def _release_driver(self, discard=False):
+        if self.driver is not None:
+            if discard:
+                browser_pool.discard(self.driver)
+            else:
+                browser_pool.release(self.driver)
+            self.driver = None
+
+def feed_url_queue(items, url_queue, num_workers):
+    try:
+        for item in items:
+            url_queue.put(item)
+    except Exception as e:
+        logger.exception("Reading the URL list failed, ending the round early: %s", e)
+    finally:
+        # Ein Ende-Signal pro Worker, auch wenn der Strom abbricht
+        for _ in range(num_workers):
+            url_queue.put(None)
+
+def run_worker_pool(items, total, num_workers):
+    """
+    Verteilt die URLs auf num_workers unabhängige Browser-Worker und überwacht sie.
+    Die URLs werden aus dem Strom in eine kleine, begrenzte Queue nachgefüllt.
+    Stirbt ein Worker-Thread, wird er ersetzt, solange er das Ende-Signal nicht erhalten hat.
+    """
+    if total is not None:
+        num_workers = min(num_workers, total)
+    url_queue = queue.Queue(maxsize=num_workers * 2)
+    feeder = threading.Thread(target=feed_url_queue, args=(items, url_queue, num_workers), name="url-feeder", daemon=True)
+    feeder.start()
+
+    stats = VisitStats()
+    logger.info("Starting %d browser workers for %s URLs.", num_workers, total if total is not None else "a stream of")
+    supervise_workers(url_queue, total, stats, num_workers)
+    logger.info("Throughput: %s", stats.summary())
+
+def supervise_workers(url_queue, total, stats, num_workers):
+    """
+    Startet num_workers BrowserWorker auf url_queue und ersetzt Worker, die sterben,
+    bevor sie das Ende-Signal erhalten haben.
+    """
+    workers = {}
+    for worker_id in range(1, num_workers + 1):
+        workers[worker_id] = BrowserWorker(worker_id, url_queue, total, stats)
+        workers[worker_id].start()
+
+    while workers:
+        for worker_id, worker in list(workers.items()):
+            worker.join(timeout=1)
+            if worker.is_alive():
+                continue
+            if worker.finished:
+                del workers[worker_id]
+            else:
+                logger.warning("[%s] died unexpectedly, starting replacement.", worker.name)
+                workers[worker_id] = BrowserWorker(worker_id, url_queue, total, stats)
+                workers[worker_id].start()
+
+# ----------------------------
+# Asyncio-Engine (--engine asyncio)
+# ----------------------------
+async def run_blocking(func, *func_args):
+    """
+    Führt einen blockierenden WebDriver-Aufruf im Executor aus, damit der Event-Loop frei bleibt.
+    """
+    loop = asyncio.get_running_loop()
+    # Kontext mitnehmen, damit Phasen im Executor dem laufenden Besuch zugeordnet werden
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(None, functools.partial(context.run, func, *func_args))
+
+@timed_phase("pauses")
+async def async_random_sleep(min_s, max_s):
+    await asyncio.sleep(random.uniform(min_s, max_s))
+
+@timed_phase("dwell")
+async def realistic_user_interaction_async(driver, duration_seconds, scroll_chance=None):
+    """
+    Wie realistic_user_interaction(), aber Pausen sind Timer im Event-Loop statt time.sleep().
+    """
+    url = current_visit_url()
+    probe = PlaybackProbe(url)
+    events = plan_dwell(duration_seconds, scroll_chance, url)
+
+    say(f"⏱️  Verweile auf der Seite für ca. {duration_seconds} Sekunden...")
+
+    try:
+        started = time.monotonic()
+        for offset, steps in events:
+            await asyncio.sleep(max(started + offset - time.monotonic(), 0))
+            time_left = started + duration_seconds - time.monotonic()
+            if time_left <= 0:
+                break
+            action = await run_blocking(run_dwell_event, driver, steps, probe, time_left)
+            if action is not None:
+                return action
+        await asyncio.sleep(max(started + duration_seconds - time.monotonic(), 0))
+        await run_blocking(probe.finish, driver)
+    except Exception as e:
+        logger.debug("realistic_user_interaction_async error: %s", e)
+    return None
+
+@traced_visit
+async def process_url_async(driver, url):
+    """
+    Coroutine-Variante von process_url() mit identischen Rückgabewerten.
+    """
+    logger.info("Loading URL: %s", url)
+
+    say(f"\n{'='*60}")
+    say(f"🌍 Lade URL: {url}")
+    say(f"{'='*60}")
+
+    try:
+        if not url.startswith("http"):
+            url = "https://" + url
+
+        await run_blocking(preload_domain_script, driver, url)
+        has_consent = await run_blocking(profile_templates.ensure_consent, driver, url)
+        with visit_phase("driver_get"):
+            await run_blocking(driver.get, url)
+        await run_blocking(functools.partial(wait_for_page_load_complete, driver, timeout=setting("page_load_timeout", url), ready_selector=lean_mode.ready_selector(url)))
+        say("✅ Seite geladen.")
+
+        say("⏳ Kurze Pause (Init)...")
+        await async_random_sleep(1, 3)
+
+        await run_blocking(apply_script_timeout, driver, url)
+        action = await run_blocking(run_domain_script, driver, url)
+        if action == 'restart':
+            return "restart"
+        js_was_successful = action == 'success'
+
+        await async_random_sleep(3, 5)
+
+        if not js_was_successful:
+            if has_consent:
+                say("⏭️  Überspringe Cookie-Banner, Consent-Cookies kommen aus der Profil-Vorlage.")
+                saved_round_trips = 0
+            else:
+                saved_round_trips = await run_blocking(handle_cookies, driver)
+                say("⏳ Kurze Pause (Post-Cookie)...")
+                await async_random_sleep(1, 3)
+                await run_blocking(profile_templates.remember_consent, driver, url)
+            saved_round_trips += await run_blocking(handle_play_buttons, driver)
+            logger.info("Fallbacks saved %d WebDriver round trips for %s", saved_round_trips, url)
+        else:
+            say("⏭️  Überspringe Python-Fallbacks (Cookies/Play), da JS erfolgreich war.")
+
+        action = await realistic_user_interaction_async(driver, setting("sleep_seconds", url))
+        if action is not None:
+            return action
+
+        logger.info("Finished visit for %s", url)
+        return None
 
     except Exception as e:
-        logger.exception("Unexpected error while processing %s: %s", url, e)
-        return "skip"
+        return await run_blocking(visit_error_action, driver, url, e)
+
+async def visit_url_with_retries_async(driver, url, position, total, stats, attempt=0, retries=None):
+    """
+    Coroutine-Variante von visit_url_with_retries().
+    """
+    domain = get_root_domain(url)
+    while attempt <= setting("max_retries", url):
+        if not circuit_breaker.allow(domain):
+            logger.info("Domain %s is parked by the circuit breaker, skipping %s", domain, url)
+            finish_url(stats, url, "parked")
+            return driver
+        attempt += 1
+        logger.info("Processing URL [%d/%s] attempt %d: %s", position, total or "?", attempt, url)
+        try:
+            action = await process_url_async(driver, url)
+        except Exception as e:
+            logger.error("process_url_async raised an unexpected exception: %s", e, exc_info=e)
+            action = "restart"
+        failure = last_visit_failure() or "unexpected"
+
+        if action is None:
+            circuit_breaker.record_success(domain)
+            finish_url(stats, url, "success")
+            return await run_blocking(browser_pool.record_visit, driver)
+        if action == "skip":
+            logger.info("Skipping URL after unrecoverable error: %s", url)
+            circuit_breaker.record_failure(domain, failure)
+            finish_url(stats, url, "skip")
+            return driver
+        if action == "requeue":
+            await run_blocking(reset_page, driver)
+            if attempt > setting("max_retries", url):
+                break
+            logger.info("Requeueing URL %s after %s (attempt %d of %d).", url, failure, attempt, setting("max_retries", url) + 1)
+            if retries is not None:
+                retries.add(position, url, attempt)
+                return driver
+            await asyncio.sleep(retry_delay(attempt))
+            continue
+        if action == "restart":
+            logger.info("Restart requested for URL %s after %s failure (attempt %d of %d).", url, failure, attempt, setting("max_retries", url) + 1)
+            stats.record_restart()
+            if not circuit_breaker.record_failure(domain, failure):
+                await asyncio.sleep(retry_delay(attempt))
+            restart_started = time.perf_counter()
+            try:
+                driver = await run_blocking(browser_pool.restart, driver)
+                visit_metrics.observe_restart(url, time.perf_counter() - restart_started)
+            except Exception as e:
+                logger.error("Failed to recreate WebDriver while retrying URL %s: %s", url, e, exc_info=e)
+                await asyncio.sleep(args.retry_backoff)
+            continue
+
+        logger.warning("Unknown action from process_url_async: %s. Skipping URL.", action)
+        finish_url(stats, url, "skip")
+        return driver
+
+    finish_url(stats, url, "failed")
+    return driver
+
+async def async_session(session_id, url_queue, total, stats):
+    """
+    Eine Browser-Session als Coroutine: zieht URLs aus der Queue, bis sie leer ist.
+    """
+    driver = None
+    retries = RetryQueue()
+    ended = False
+    try:
+        while True:
+            item = retries.pop_due()
+            if item is None:
+                if ended:
+                    if not retries:
+                        return
+                    await asyncio.sleep(retries.wait_time())
+                    continue
+                item = await url_queue.get()
+                if item is None:
+                    # Ende des URL-Stroms, ausstehende Retries noch abarbeiten
+                    ended = True
+                    continue
+                item = (*item, 0)
+            position, url, attempt = item
+            try:
+                if driver is None:
+                    driver = await run_blocking(browser_pool.acquire)
+                driver = await visit_url_with_retries_async(driver, url, position, total, stats, attempt, retries)
+            except Exception as e:
+                logger.error("[session-%d] Could not process %s: %s", session_id, url, e, exc_info=e)
+                finish_url(stats, url, "failed")
+                if driver is not None:
+                    await run_blocking(browser_pool.discard, driver)
+                    driver = None
+                await asyncio.sleep(args.retry_backoff)
+    finally:
+        if driver is not None:
+            await run_blocking(browser_pool.release, driver)
+        logger.info("[session-%d] Browser closed.", session_id)
+
+async def feed_async_queue(items, url_queue, num_sessions):
+    while True:
+        # Lesen aus Datei/stdin kann blockieren -> Executor
+        item = await run_blocking(next, items, None)
+        if item is None:
+            break
+        await url_queue.put(item)
+    for _ in range(num_sessions):
+        await url_queue.put(None)
+
+async def _run_async_engine(items, total, num_sessions):
+    loop = asyncio.get_running_loop()
+    if total is not None:
+        num_sessions = min(num_sessions, total)
+    # Threads werden nur während WebDriver-Aufrufen belegt, nicht während der Verweildauer.
+    max_threads = args.async_threads or num_sessions
+    loop.set_default_executor(concurrent.futures.ThreadPoolExecutor(max_workers=max_threads + 1, thread_name_prefix="webdriver"))
+
+    url_queue = asyncio.Queue(maxsize=num_sessions * 2)
+    stats = VisitStats()
+    logger.info("Started asyncio engine with %d sessions (%d executor threads) for %s URLs.", num_sessions, max_threads, total if total is not None else "a stream of")
+    await asyncio.gather(
+        feed_async_queue(items, url_queue, num_sessions),
+        *(async_session(session_id, url_queue, total, stats) for session_id in range(1, num_sessions + 1))
+    )
+    logger.info("Throughput: %s", stats.summary())
+
+def run_async_engine(items, total, num_sessions):
+    asyncio.run(_run_async_engine(items, total, num_sessions))
+
+# ----------------------------
+# Verteilter Modus (--coordinator / --join)
+# ----------------------------
+# Ein Koordinator besitzt die URL-Queue, Worker-Knoten leihen sich einzelne URLs per
+# HTTP/JSON: POST /lease, /heartbeat, /result und GET /status. Läuft eine Leihe ohne
+# Heartbeat ab (Knoten tot), geht die URL zurück in die Queue.
+class WorkCoordinator:
+    """
+    Verleiht die URLs einer Runde an entfernte Worker und sammelt deren Ergebnisse.
+    """
+    def __init__(self, lease_timeout, heartbeat_interval, token=None):
+        self.lease_timeout = lease_timeout
+        self.heartbeat_interval = heartbeat_interval
+        self.token = token
+        self.lock = threading.Condition()
+        self.lease_ids = itertools.count(1)
+        self.leases = {}
+        self.requeued = collections.deque()
+        self.url_queue = None
+        self.total = None
+        self.stats = None
+        self.exhausted = True
+        self.finished = False
+        self.nodes = {}
+        self.told_done = set()
+        self.server = None
+
+    def serve(self, address):
+        """
+        Startet den HTTP-Server auf [HOST:]PORT; ohne HOST nur auf 127.0.0.1.
+
+        Returns:
+          Die tatsächliche (host, port)-Adresse (PORT 0 wählt einen freien Port).
+        """
+        host, _, port = address.rpartition(":")
+        host = host or "127.0.0.1"
+        coordinator = self
+
+        class CoordinatorHandler(http.server.BaseHTTPRequestHandler):
+            def _authorized(self):
+                if not coordinator.token:
+                    return True
+                sent = self.headers.get("X-Coordinator-Token", "")
+                if hmac.compare_digest(sent.encode("utf-8"), coordinator.token.encode("utf-8")):
+                    return True
+                self.send_error(403)
+                return False
+
+            def do_GET(self):
+                if not self._authorized():
+                    return
+                if self.path.split("?")[0] != "/status":
+                    self.send_error(404)
+                    return
+                self._reply(coordinator.status())
+
+            def do_POST(self):
+                if not self._authorized():
+                    return
+                routes = {"/lease": coordinator.lease, "/heartbeat": coordinator.heartbeat, "/result": coordinator.result}
+                handler = routes.get(self.path.split("?")[0])
+                if handler is None:
+                    self.send_error(404)
+                    return
+                try:
+                    length = int(self.headers.get("Content-Length") or 0)
+                    request = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    self.send_error(400)
+                    return
+                self._reply(handler(request))
+
+            def _reply(self, payload):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *log_args):
+                pass
+
+        self.server = http.server.ThreadingHTTPServer((host, int(port)), CoordinatorHandler)
+        threading.Thread(target=self.server.serve_forever, name="coordinator-http", daemon=True).start()
+        host, port = self.server.server_address[:2]
+        logger.info("Coordinator listening on %s:%s (%s)", host, port, "token required" if self.token else "no token")
+        if not self.token and host not in ("127.0.0.1", "::1", "localhost"):
+            logger.warning("Coordinator on %s accepts leases and results from anyone who can reach it; set --coordinator_token.", host)
+        say(f"🛰️  Koordinator läuft auf {host}:{port}")
+        return host, port
+
+    def _reap(self):
+        now = time.time()
+        for lease_id, lease in list(self.leases.items()):
+            if lease["deadline"] < now:
+                del self.leases[lease_id]
+                self.requeued.append((lease["position"], lease["url"]))
+                logger.warning("Lease %d for %s on node %s expired, requeueing", lease_id, lease["url"], lease["node"])
+
+    def lease(self, request):
+        node = request.get("node", "?")
+        with self.lock:
+            self.nodes[node] = time.time()
+            self._reap()
+            item = self.requeued.popleft() if self.requeued else None
+            if item is None and not self.exhausted:
+                try:
+                    item = self.url_queue.get_nowait()
+                except queue.Empty:
+                    return {"wait": 1.0}
+                if item is None:
+                    self.exhausted = True
+            if item is None:
+                if self.finished:
+                    self.told_done.add(node)
+                    self.lock.notify_all()
+                    return {"done": True}
+                return {"wait": min(self.heartbeat_interval, 5.0)}
+            position, url = item
+            lease_id = next(self.lease_ids)
+            self.leases[lease_id] = {"position": position, "url": url, "node": node, "deadline": time.time() + self.lease_timeout}
+            return {
+                "lease": lease_id,
+                "position": position,
+                "url": url,
+                "total": self.total,
+                "lease_timeout": self.lease_timeout,
+                "heartbeat_interval": self.heartbeat_interval,
+            }
+
+    def heartbeat(self, request):
+        lost = []
+        with self.lock:
+            self.nodes[request.get("node", "?")] = time.time()
+            for lease_id in request.get("leases", []):
+                lease = self.leases.get(lease_id)
+                if lease is None:
+                    lost.append(lease_id)
+                else:
+                    lease["deadline"] = time.time() + self.lease_timeout
+        return {"lost": lost}
+
+    def result(self, request):
+        with self.lock:
+            lease = self.leases.pop(request.get("lease"), None)
+            if lease is None:
+                logger.warning("Ignoring result for unknown or expired lease %s from node %s", request.get("lease"), request.get("node"))
+                return {"ok": False}
+            finish_url(self.stats, lease["url"], request.get("outcome", "failed"))
+            self.lock.notify_all()
+        return {"ok": True}
+
+    def status(self):
+        with self.lock:
+            return {
+                "leases": len(self.leases),
+                "requeued": len(self.requeued),
+                "exhausted": self.exhausted,
+                "nodes": {node: round(time.time() - seen, 1) for node, seen in self.nodes.items()},
+                "stats": self.stats.summary() if self.stats is not None else None,
+            }
+
+    def run_round(self, items, total):
+        """
+        Stellt eine Runde zum Verleihen bereit und blockiert, bis jede URL ein Ergebnis hat.
+        """
+        url_queue = queue.Queue(maxsize=1000)
+        threading.Thread(target=feed_url_queue, args=(items, url_queue, 1), name="url-feeder", daemon=True).start()
+        with self.lock:
+            self.url_queue = url_queue
+            self.total = total
+            self.stats = VisitStats()
+            self.exhausted = False
+            while not (self.exhausted and not self.leases and not self.requeued):
+                self.lock.wait(timeout=1)
+                self._reap()
+        logger.info("Throughput: %s", self.stats.summary())
+
+    def shutdown(self):
+        """
+        Meldet allen Knoten, die zuletzt aktiv waren, das Ende (höchstens eine Heartbeat-Periode lang).
+        """
+        if self.server is None:
+            return
+        deadline = time.time() + max(self.heartbeat_interval, 5.0)
+        with self.lock:
+            self.finished = True
+            while time.time() < deadline:
+                active = {node for node, seen in self.nodes.items() if time.time() - seen < self.lease_timeout}
+                if active <= self.told_done:
+                    break
+                self.lock.wait(timeout=1)
+        self.server.shutdown()
+
+class WorkQueueClient:
+    """
+    Worker-Seite: verhält sich für BrowserWorker wie eine Queue (get/task_done) und
+    meldet Ergebnisse über finish_url() zurück. Ohne --join ein No-Op.
+
+    Leases werden pro URL gemerkt, nicht pro Thread: eine TabSession hält mehrere
+    gleichzeitig und meldet sie in beliebiger Reihenfolge zurück.
+    """
+    def __init__(self, base_url, node_id, token=None):
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self.node_id = node_id
+        self.token = token
+        self.lock = threading.Lock()
+        # url -> [lease_id, ...] (dieselbe URL kann mehrfach in der Liste stehen)
+        self.leases = collections.defaultdict(list)
+        self.heartbeat_interval = args.heartbeat_interval
+        self.lease_timeout = args.lease_timeout
+        self.unreachable_since = None
+
+    def _post(self, path, payload):
+        payload = dict(payload, node=self.node_id)
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["X-Coordinator-Token"] = self.token
+        request = urllib.request.Request(
+            self.base_url + path,
+            data=json.dumps(payload).encode("utf-8"),
+            headers=headers,
+        )
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return json.loads(response.read().decode("utf-8"))
+
+    def start(self):
+        threading.Thread(target=self._heartbeat_loop, name="heartbeat", daemon=True).start()
+
+    def _heartbeat_loop(self):
+        while True:
+            time.sleep(self.heartbeat_interval)
+            with self.lock:
+                leases = sorted(lease_id for lease_ids in self.leases.values() for lease_id in lease_ids)
+            if not leases:
+                continue
+            try:
+                lost = self._post("/heartbeat", {"leases": leases}).get("lost", [])
+            except (OSError, ValueError) as e:
+                logger.warning("Heartbeat to %s failed: %s", self.base_url, e)
+                continue
+            for lease_id in lost:
+                logger.warning("Lease %s was reassigned by the coordinator", lease_id)
+                self._forget(lease_id)
+
+    def get(self, timeout=None):
+        """
+        Wartet wie queue.Queue.get höchstens timeout Sekunden (None = unbegrenzt) und
+        wirft danach queue.Empty.
+
+        Returns:
+          (position, url) der nächsten geliehenen URL oder None, wenn der Koordinator fertig ist.
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            try:
+                reply = self._post("/lease", {})
+            except (OSError, ValueError) as e:
+                self.unreachable_since = self.unreachable_since or time.time()
+                if time.time() - self.unreachable_since > self.lease_timeout:
+                    logger.error("Coordinator %s unreachable for %.0fs, stopping: %s", self.base_url, self.lease_timeout, e)
+                    return None
+                logger.warning("Coordinator %s unreachable: %s", self.base_url, e)
+                pause = min(self.heartbeat_interval, 10.0)
+            else:
+                self.unreachable_since = None
+                if reply.get("done"):
+                    return None
+                if "lease" in reply:
+                    self.heartbeat_interval = reply.get("heartbeat_interval", self.heartbeat_interval)
+                    with self.lock:
+                        self.leases[reply["url"]].append(reply["lease"])
+                    return reply["position"], reply["url"]
+                pause = reply.get("wait", 1.0)
+            if deadline is not None:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise queue.Empty
+                pause = min(pause, remaining)
+            time.sleep(pause)
+
+    def task_done(self):
+        pass
+
+    def _forget(self, lease_id):
+        with self.lock:
+            for url, lease_ids in list(self.leases.items()):
+                if lease_id in lease_ids:
+                    lease_ids.remove(lease_id)
+                    if not lease_ids:
+                        del self.leases[url]
+                    return
+
+    def report(self, url, outcome):
+        if self.base_url is None:
+            return
+        with self.lock:
+            lease_ids = self.leases.get(url)
+            if not lease_ids:
+                return
+            lease_id = lease_ids.pop(0)
+            if not lease_ids:
+                del self.leases[url]
+        try:
+            if not self._post("/result", {"lease": lease_id, "outcome": outcome}).get("ok"):
+                logger.warning("Coordinator rejected result for %s (lease %s expired)", url, lease_id)
+        except (OSError, ValueError) as e:
+            logger.warning("Could not report result for %s: %s", url, e)
+
+work_coordinator = WorkCoordinator(args.lease_timeout, args.heartbeat_interval, args.coordinator_token)
+work_client = WorkQueueClient(args.join, args.node_id, args.coordinator_token)
+
+def run_remote_worker(num_workers):
+    """
+    Worker-Knoten: num_workers Browser leihen URLs vom Koordinator, bis dieser fertig ist.
+    """
+    logger.info("Joining coordinator %s as node %s with %d browser workers.", args.join, args.node_id, num_workers)
+    work_client.start()
+    if args.engine == "asyncio":
+        # Die Sessions ziehen Leases über die Feeder-Queue, get() liefert None am Ende
+        run_async_engine(iter(work_client.get, None), None, num_workers)
+        return
+    stats = VisitStats()
+    supervise_workers(work_client, None, stats, num_workers)
+    logger.info("Throughput: %s", stats.summary())
+
+# ----------------------------
+# Dry-Run / Validierung (--dry_run, --validate)
+# ----------------------------
+def report_startup_time(label):
+    logger.info("%s after %.0f ms", label, (time.perf_counter() - STARTUP_STARTED) * 1000)
+
+def validate_url_list():
+    """
+    Löst für jede URL der Liste Root-Domain und Skript auf, ohne Chrome zu starten.
+
+    Returns:
+      0, wenn alle URLs gültig sind, sonst 1.
+    """
+    if not url_source.exists():
+        print(f"❌ Datei nicht gefunden: {args.url_list}")
+        return 1
+    items, _ = url_source.round()
+    if items is None:
+        print("❌ Keine URLs gefunden.")
+        return 1
+
+    started = time.perf_counter()
+    domains = {}
+    invalid = []
+    for position, url in items:
+        full_url = url if url.startswith("http") else "https://" + url
+        hostname = get_hostname(full_url)
+        if not hostname or "." not in hostname:
+            invalid.append((position, url))
+            continue
+        domain = get_root_domain(full_url)
+        domains[domain] = domains.get(domain, 0) + 1
+
+    print(f"\n{'Domain':<40} {'URLs':>8}  Skript")
+    with_script = 0
+    for domain, count in sorted(domains.items(), key=lambda item: (-item[1], item[0])):
+        entry = script_registry.get(domain)
+        if entry is not None:
+            with_script += count
+        target = entry.path if entry is not None else "— (Python-Fallbacks Cookies/Play)"
+        print(f"{domain:<40} {count:>8}  {target}")
+    for position, url in invalid:
+        print(f"❌ Ungültige URL an Position {position}: {url}")
+
+    total = sum(domains.values()) + len(invalid)
+    print(f"\n✅ {total} URLs, {len(domains)} Domains, {with_script} mit Skript, {len(invalid)} ungültig.")
+    logger.info("Validated %d URLs (%d domains, %d with script, %d invalid) in %.0f ms",
+                total, len(domains), with_script, len(invalid), (time.perf_counter() - started) * 1000)
+    report_startup_time("Validation finished")
+    return 1 if invalid else 0
 
 # ----------------------------
 # Main loop
 # ----------------------------
 def main():
+    setup_logging()
+    live_config.start()
+    report_startup_time("Started")
+
+    if args.dry_run:
+        if validate_url_list():
+            sys.exit(1)
+        return
+
+    if args.state_report:
+        visit_state.open()
+        visit_state.report()
+        visit_state.close()
+        return
+
     if args.loop:
         logger.info("Loop mode active. Press Ctrl+C to stop.")
 
+    visit_metrics.open_trace_file(args.trace_file)
+    visit_metrics.start_exporters(args.metrics_port, args.stats_file, args.stats_interval)
+    if args.join:
+        browser_pool.start(args.warm_spares)
+        try:
+            run_remote_worker(max(args.workers, 1))
+        finally:
+            browser_pool.close()
+        return
+
+    visit_state.open()
+    if args.coordinator:
+        work_coordinator.serve(args.coordinator)
+    else:
+        browser_pool.start(args.warm_spares)
+    try:
+        run_rounds()
+    finally:
+        work_coordinator.shutdown()
+        browser_pool.close()
+        visit_state.close()
+        if args.stats_file:
+            visit_metrics.write_stats_file(args.stats_file)
+
+def run_rounds():
     while True:
-        urls = read_urls_from_file()
-        if not urls:
+        items = None
+        if url_source.exists():
+            items, total = url_source.round()
+            if items is not None and args.state_db:
+                visit_state.start_cycle()
+                items, total = visit_state.pending(items), None
+            if items is not None and (args.fair_schedule or args.domain_rate or args.min_revisit):
+                items = domain_scheduler.schedule(items)
+        else:
+            print(f"❌ Datei nicht gefunden: {args.url_list}")
+        if items is None:
             if not args.loop:
                 logger.info("No URLs found. Exiting.")
                 return
@@ -532,68 +4968,37 @@ def main():
             time.sleep(args.loop_sleep)
             continue
 
-        if args.url_shuffle:
-            print("mj🎲 Mische URLs...")
-            random.shuffle(urls)
-
-        # create initial browser
-        try:
-            driver = create_browser_attempt()
-            # WICHTIG: Setze Timeout für asynchrone Skripte (damit execute_async_script nicht unendlich wartet)
-            driver.set_script_timeout(120) 
-        except Exception as e:
-            logger.exception("Could not create WebDriver, exiting: %s", e)
-            return
-
-        try:
-            for url in urls:
-                attempt = 0
-                while attempt <= args.max_retries:
-                    attempt += 1
-                    logger.info("Processing URL [%d/%d] attempt %d: %s", urls.index(url) + 1, len(urls), attempt, url)
-                    action = None
-                    try:
-                        action = process_url(driver, url)
-                    except Exception as e:
-                        logger.exception("process_url raised an unexpected exception: %s", e)
-                        action = "restart"
-
-                    if action is None:
-                        # success -> move to next URL
-                        break
-                    if action == "skip":
-                        logger.info("Skipping URL after unrecoverable error: %s", url)
-                        break
-                    if action == "restart":
-                        logger.info("Restart requested for URL %s (attempt %d of %d).", url, attempt, args.max_retries + 1)
-                        try:
-                            driver.quit()
-                        except Exception:
-                            pass
-                        time.sleep(args.retry_backoff)
-                        try:
-                            driver = create_browser_attempt()
-                            driver.set_script_timeout(120) # Reset timeout nach Neustart
-                        except Exception as e:
-                            logger.exception("Failed to recreate WebDriver while retrying URL %s: %s", url, e)
-                            time.sleep(args.retry_backoff)
-                            if attempt > args.max_retries:
-                                break
-                            continue
-                        if attempt > args.max_retries:
-                            break
-                        else:
-                            continue
-                    else:
-                        logger.warning("Unknown action from process_url: %s. Skipping URL.", action)
-                        break
+        if args.coordinator:
+            work_coordinator.run_round(items, total)
+        elif args.engine == "asyncio":
+            run_async_engine(items, total, args.workers)
+        elif args.workers > 1:
+            run_worker_pool(items, total, args.workers)
+        else:
+            # create initial browser
+            try:
+                driver = browser_pool.acquire()
+            except Exception as e:
+                logger.exception("Could not create WebDriver, exiting: %s", e)
+                return
 
-        finally:
+            stats = VisitStats()
             try:
-                driver.quit()
-            except Exception:
-                pass
-            logger.info("Browser closed.")
+                if args.tabs > 1:
+                    # Feeder-Thread, damit Lesen/Planen der URLs die Tabs nicht blockiert
+                    url_queue = queue.Queue(maxsize=args.tabs * 2)
+                    threading.Thread(target=feed_url_queue, args=(items, url_queue, 1), name="url-feeder", daemon=True).start()
+                    driver = TabSession(driver, url_queue.get, total, stats).run()
+                else:
+                    retries = RetryQueue()
+                    for position, url, attempt in with_requeued(items, retries):
+                        driver = visit_url_with_retries(driver, url, position, total, stats, attempt, retries)
+            finally:
+                browser_pool.release(driver)
+                logger.info("Browser closed.")
+                logger.info("Throughput: %s", stats.summary())
+
+        visit_state.complete_cycle()
 
         if not args.loop:
             logger.info("Completed single run; exiting.")
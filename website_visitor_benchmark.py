@@ -0,0 +1,545 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark für website_visitor.py ohne echten Chrome.
+
+Startet einen lokalen HTTP-Server mit den Seiten aus benchmark_fixtures/
+(Bandcamp/SoundCloud/YouTube/Mixcloud-ähnliche Layouts, Cookie-Banner,
+Play-Buttons, langsam ladende Seite) und lässt process_url() gegen einen
+FakeDriver laufen. Gemessen werden die Phasen eines Besuchs, Besuche pro
+Minute und WebDriver-Round-Trips, außerdem der Durchsatz des Loggings.
+
+Beispiel:
+  python3 website_visitor_benchmark.py --visits 20 --json bench.json
+  python3 website_visitor_benchmark.py --compare bench.json
+"""
+
+import sys
+import os
+import re
+import json
+import time
+import argparse
+import contextlib
+import io
+import statistics
+import tempfile
+import threading
+import html.parser
+import http.server
+import urllib.request
+
+from urllib.parse import urlparse, parse_qs
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_DIR = os.path.join(BASE_DIR, "benchmark_fixtures")
+
+DEFAULT_URLS = [
+    "https://artist.bandcamp.com/album/fixture",
+    "https://soundcloud.com/artist/fixture",
+    "https://www.youtube.com/watch?v=fixture",
+    "https://www.mixcloud.com/artist/fixture/",
+    "https://shop.example.org/release?delay_ms=1500",
+]
+
+PHASES = ["load", "wait_for_page_load", "js", "fallbacks", "interaction", "pauses"]
+
+# ----------------------------
+# Argument parsing
+# ----------------------------
+parser = argparse.ArgumentParser(description="Benchmark process_url() against local fixture pages and a fake WebDriver.")
+parser.add_argument("--visits", type=int, default=10, help="Number of process_url() calls (cycles through the fixture URLs).")
+parser.add_argument("--time_scale", type=float, default=0.01, help="Factor applied to all sleeps inside website_visitor and the fake page scripts.")
+parser.add_argument("--sleep_seconds", type=int, default=1, help="Dwell time passed to website_visitor (--sleep_seconds).")
+parser.add_argument("--rtt_ms", type=float, default=2.0, help="Simulated latency of one WebDriver round trip in milliseconds.")
+parser.add_argument("--verbose", action="store_true", help="Show the console output of process_url().")
+parser.add_argument("--log_records", type=int, default=20000, help="Number of log records written for the logging throughput measurement (0 = skip).")
+parser.add_argument("--log_format", choices=["text", "json"], default="text", help="Log file format passed to website_visitor (--log_format).")
+parser.add_argument("--json", help="Write the results as JSON to this file.")
+parser.add_argument("--compare", help="Compare against a JSON result file and exit 1 on regressions.")
+parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown per metric for --compare.")
+
+# ----------------------------
+# Fixture-Server
+# ----------------------------
+class FixtureHandler(http.server.SimpleHTTPRequestHandler):
+    def __init__(self, *handler_args, **kwargs):
+        super().__init__(*handler_args, directory=FIXTURE_DIR, **kwargs)
+
+    def do_GET(self):
+        # ?delay_ms=N simuliert einen langsamen Server
+        query = parse_qs(urlparse(self.path).query)
+        delay_ms = float(query.get("delay_ms", ["0"])[0])
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000.0)
+        super().do_GET()
+
+    def log_message(self, format, *log_args):
+        pass
+
+def start_fixture_server():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, name="fixture-server", daemon=True).start()
+    return server
+
+# ----------------------------
+# Mini-DOM für den FakeDriver
+# ----------------------------
+class FakeElement:
+    def __init__(self, driver, tag, attrs, parent):
+        self.driver = driver
+        self.id = f"fake-{id(self)}"
+        self.tag_name = tag
+        self.attrs = attrs
+        self.parent = parent
+        self.children = []
+        self.first_text = None
+        self.text_parts = []
+
+    @property
+    def text(self):
+        self.driver._round_trip()
+        return self.full_text()
+
+    def full_text(self):
+        return " ".join(" ".join(part.split()) for part in self.text_parts if part.strip())
+
+    def hidden(self):
+        node = self
+        while node is not None:
+            style = node.attrs.get("style", "").replace(" ", "")
+            if "display:none" in style or "visibility:hidden" in style or "hidden" in node.attrs:
+                return True
+            node = node.parent
+        return False
+
+    def is_displayed(self):
+        self.driver._round_trip()
+        return not self.hidden()
+
+    def click(self):
+        self.driver._round_trip()
+        self.driver.clicks.append(self)
+
+    def matches(self, selector):
+        """
+        Unterstützt die in website_visitor.py genutzten Formen: .klasse, tag.klasse, tag[attr*='wert'].
+        """
+        match = re.fullmatch(r"(\w*)\[(\w[\w-]*)\*='([^']*)'\]", selector)
+        if match:
+            tag, attr, value = match.groups()
+            return (not tag or tag == self.tag_name) and value in self.attrs.get(attr, "")
+        match = re.fullmatch(r"(\w*)\.([\w-]+)", selector)
+        if match:
+            tag, cls = match.groups()
+            return (not tag or tag == self.tag_name) and cls in self.attrs.get("class", "").split()
+        return False
+
+class FixtureParser(html.parser.HTMLParser):
+    VOID = {"meta", "link", "br", "img", "input", "hr"}
+
+    def __init__(self, driver):
+        super().__init__()
+        self.driver = driver
+        self.elements = []
+        self.stack = []
+
+    def handle_starttag(self, tag, attrs):
+        parent = self.stack[-1] if self.stack else None
+        elem = FakeElement(self.driver, tag, {k: v or "" for k, v in attrs}, parent)
+        if parent is not None:
+            parent.children.append(elem)
+        self.elements.append(elem)
+        if tag not in self.VOID:
+            self.stack.append(elem)
+
+    def handle_endtag(self, tag):
+        while self.stack:
+            if self.stack.pop().tag_name == tag:
+                break
+
+    def handle_data(self, data):
+        if not self.stack:
+            return
+        if self.stack[-1].first_text is None:
+            self.stack[-1].first_text = data.lower()
+        for elem in self.stack:
+            elem.text_parts.append(data)
+
+# ----------------------------
+# FakeDriver
+# ----------------------------
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver._round_trip()
+
+class FakeDriver:
+    """
+    Minimaler Ersatz für webdriver.Chrome: lädt Fixture-Seiten vom lokalen Server,
+    beantwortet die bekannten Skripte aus website_visitor.py und zählt jeden Aufruf
+    als WebDriver-Round-Trip (mit --rtt_ms simulierter Latenz).
+    """
+    def __init__(self, server_url, rtt_ms, time_scale, wv):
+        self.server_url = server_url
+        self.rtt = rtt_ms / 1000.0
+        self.time_scale = time_scale
+        self.wv = wv
+        self.round_trips = 0
+        self.clicks = []
+        self.elements = []
+        self.body_attrs = {}
+        self.loaded_at = 0.0
+        self.preloaded = False
+        self.injected = False
+        self.window_handles = ["main"]
+        self.switch_to = FakeSwitchTo(self)
+
+    def _round_trip(self):
+        self.round_trips += 1
+        if self.rtt > 0:
+            time.sleep(self.rtt)
+
+    def get(self, url):
+        self._round_trip()
+        if url == "about:blank":
+            self.elements, self.body_attrs = [], {}
+            return
+        parsed = urlparse(url)
+        domain = self.wv.get_root_domain(url)
+        page = f"{domain}.html" if os.path.isfile(os.path.join(FIXTURE_DIR, f"{domain}.html")) else "example.org.html"
+        query = f"?{parsed.query}" if parsed.query else ""
+        with urllib.request.urlopen(f"{self.server_url}/{page}{query}") as response:
+            source = response.read().decode("utf-8")
+        dom = FixtureParser(self)
+        dom.feed(source)
+        self.elements = dom.elements
+        body = next((e for e in self.elements if e.tag_name == "body"), None)
+        self.body_attrs = body.attrs if body is not None else {}
+        self.loaded_at = time.time()
+        self.injected = self.preloaded
+
+    def set_script_timeout(self, timeout):
+        self._round_trip()
+
+    def execute_cdp_cmd(self, cmd, params):
+        self._round_trip()
+        if cmd == "Page.addScriptToEvaluateOnNewDocument":
+            self.preloaded = True
+            return {"identifier": "1"}
+        if cmd == "Page.removeScriptToEvaluateOnNewDocument":
+            self.preloaded = False
+        return {}
+
+    def execute(self, command, params=None):
+        # ActionChains & Co.
+        self._round_trip()
+        return {"value": None}
+
+    def execute_script(self, script, *script_args):
+        self._round_trip()
+        if "document.readyState" in script:
+            delay = float(self.body_attrs.get("data-ready-delay-ms", 0)) * self.time_scale / 1000.0
+            return "complete" if time.time() - self.loaded_at >= delay else "loading"
+        if script is self.wv.COOKIE_FALLBACK_JS:
+            return self._cookie_candidates(script_args[0])
+        if script is self.wv.PLAY_FALLBACK_JS:
+            return self._play_candidates(script_args[0], script_args[1])
+        if "window.automatePage" in script and "function" in script:
+            # Domain-Skript (Bundle oder main.js) wurde injiziert
+            self.injected = True
+        return None
+
+    def execute_async_script(self, script, *script_args):
+        self._round_trip()
+        if script is getattr(self.wv, "PAGE_READY_JS", None):
+            # Ready-Hook: wartet (ohne Polling) bis zum simulierten load-Event
+            delay = float(self.body_attrs.get("data-ready-delay-ms", 0)) * self.time_scale / 1000.0
+            time.sleep(max(0.0, self.loaded_at + delay - time.time()))
+            return "complete"
+        if not self.injected:
+            return "error: automatePage not defined"
+        time.sleep(float(self.body_attrs.get("data-automate-ms", 0)) * self.time_scale / 1000.0)
+        return self.body_attrs.get("data-automate-result", "success")
+
+    def find_element(self, by, value):
+        self._round_trip()
+        return next((e for e in self.elements if e.tag_name == value), FakeElement(self, value, {}, None))
+
+    def find_elements(self, by, value):
+        self._round_trip()
+        return [e for e in self.elements if e.matches(value)]
+
+    def delete_all_cookies(self):
+        self._round_trip()
+
+    def close(self):
+        self._round_trip()
+
+    def quit(self):
+        self._round_trip()
+
+    def _cookie_candidates(self, keywords):
+        candidates, legacy, hit = [], 0, False
+        pool = [e for e in self.elements if e.tag_name in ("button", "a") or (e.tag_name == "div" and e.attrs.get("role") == "button")]
+        for keyword in keywords:
+            if not hit:
+                legacy += 1
+            for elem in pool:
+                text = elem.full_text().lower() if elem.tag_name == "div" else (elem.first_text or "")
+                if keyword.lower() not in text:
+                    continue
+                if not hit:
+                    legacy += 1
+                if elem.hidden():
+                    continue
+                if not hit:
+                    legacy += 1
+                hit = True
+                if all(c[0] is not elem for c in candidates):
+                    candidates.append([elem, keyword, elem.full_text()])
+        return {"candidates": candidates, "legacy": legacy}
+
+    def _play_candidates(self, keywords, selectors):
+        candidates, legacy, hit = [], 0, False
+        for keyword in keywords:
+            if not hit:
+                legacy += 1
+            for elem in self.elements:
+                if keyword.lower() not in (elem.first_text or ""):
+                    continue
+                if not hit:
+                    legacy += 1
+                if elem.hidden():
+                    continue
+                if not hit:
+                    legacy += 1
+                if elem.tag_name in ("button", "a", "span", "div"):
+                    hit = True
+                    if all(c[0] is not elem for c in candidates):
+                        candidates.append([elem, f"Play-Text: {keyword}"])
+        for selector in selectors:
+            if not hit:
+                legacy += 1
+            for elem in self.elements:
+                if not elem.matches(selector):
+                    continue
+                if not hit:
+                    legacy += 1
+                if not elem.hidden():
+                    hit = True
+                    if all(c[0] is not elem for c in candidates):
+                        candidates.append([elem, f"Play-Icon: {selector}"])
+        return {"candidates": candidates, "legacy": legacy}
+
+# ----------------------------
+# Instrumentierung
+# ----------------------------
+class ScaledTime:
+    """
+    Ersetzt das time-Modul in website_visitor: sleep() wird mit --time_scale skaliert.
+    """
+    def __init__(self, scale):
+        self.scale = scale
+
+    def sleep(self, seconds):
+        time.sleep(seconds * self.scale)
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+class PhaseTimer:
+    def __init__(self):
+        self.current = {}
+
+    def wrap(self, wv, name, phase):
+        original = getattr(wv, name)
+        def timed(*call_args, **call_kwargs):
+            start = time.perf_counter()
+            try:
+                return original(*call_args, **call_kwargs)
+            finally:
+                self.current[phase] = self.current.get(phase, 0.0) + time.perf_counter() - start
+        setattr(wv, name, timed)
+
+def import_website_visitor(url_list, log_file, sleep_seconds, log_format="text", verbose=False):
+    sys.argv = [
+        "website_visitor.py",
+        "--url_list", url_list,
+        "--script_folder", os.path.join(BASE_DIR, "scripts"),
+        "--sleep_seconds", str(sleep_seconds),
+        "--log_file", log_file,
+        "--log_format", log_format,
+    ]
+    if not verbose:
+        sys.argv.append("--quiet")
+    sys.path.insert(0, BASE_DIR)
+    import website_visitor
+    website_visitor.setup_logging()
+    website_visitor.load_browser_modules()
+    if not verbose:
+        for handler in website_visitor.log_listener.handlers:
+            if not hasattr(handler, "baseFilename"):
+                handler.setLevel(100)
+    return website_visitor
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+def measure_log_throughput(wv, records):
+    """
+    Schreibt records DEBUG-Zeilen über den Logger von website_visitor. Gemessen werden die
+    Kosten eines Log-Aufrufs im aufrufenden Thread und der Durchsatz, bis alles in der
+    Log-Datei steht (stop_logging() wartet auf die Queue).
+    """
+    if records <= 0:
+        return {}
+    started = time.perf_counter()
+    for i in range(records):
+        wv.logger.debug("Benchmark log record %d for %s", i, DEFAULT_URLS[i % len(DEFAULT_URLS)])
+    enqueued = time.perf_counter() - started
+    wv.stop_logging()
+    drained = time.perf_counter() - started
+    return {
+        "records": records,
+        "call_us": enqueued / records * 1e6,
+        "records_per_second": records / drained if drained > 0 else 0.0,
+    }
+
+def run_benchmark(options):
+    workdir = tempfile.mkdtemp(prefix="wv_bench_")
+    url_list = os.path.join(workdir, "urls.txt")
+    with open(url_list, "w", encoding="utf-8") as f:
+        f.write("\n".join(DEFAULT_URLS) + "\n")
+
+    wv = import_website_visitor(url_list, os.path.join(workdir, "website_visitor.log"), options.sleep_seconds, options.log_format, options.verbose)
+    wv.time = ScaledTime(options.time_scale)
+
+    timer = PhaseTimer()
+    timer.wrap(wv, "wait_for_page_load_complete", "wait_for_page_load")
+    timer.wrap(wv, "run_domain_script", "js")
+    timer.wrap(wv, "handle_cookies", "fallbacks")
+    timer.wrap(wv, "handle_play_buttons", "fallbacks")
+    timer.wrap(wv, "run_interaction", "interaction")
+    timer.wrap(wv, "random_long_sleep", "pauses")
+
+    server = start_fixture_server()
+    server_url = f"http://127.0.0.1:{server.server_address[1]}"
+    driver = FakeDriver(server_url, options.rtt_ms, options.time_scale, wv)
+    original_get = driver.get
+    def timed_get(url):
+        start = time.perf_counter()
+        try:
+            return original_get(url)
+        finally:
+            if url != "about:blank":
+                timer.current["load"] = timer.current.get("load", 0.0) + time.perf_counter() - start
+    driver.get = timed_get
+
+    visits = []
+    started = time.perf_counter()
+    for i in range(options.visits):
+        url = DEFAULT_URLS[i % len(DEFAULT_URLS)]
+        timer.current = {}
+        round_trips_before = driver.round_trips
+        visit_start = time.perf_counter()
+        output = contextlib.nullcontext() if options.verbose else contextlib.redirect_stdout(io.StringIO())
+        with output:
+            action = wv.process_url(driver, url)
+        visits.append({
+            "url": url,
+            "action": action or "success",
+            "total": time.perf_counter() - visit_start,
+            "round_trips": driver.round_trips - round_trips_before,
+            "phases": dict(timer.current),
+        })
+    elapsed = time.perf_counter() - started
+    server.shutdown()
+    log_results = measure_log_throughput(wv, options.log_records)
+
+    results = {
+        "visits": len(visits),
+        "visits_per_minute": len(visits) * 60.0 / elapsed if elapsed > 0 else 0.0,
+        "round_trips_per_visit": statistics.mean(v["round_trips"] for v in visits) if visits else 0.0,
+        "outcomes": {},
+        "phases": {},
+        "logging": log_results,
+        "settings": {"time_scale": options.time_scale, "sleep_seconds": options.sleep_seconds, "rtt_ms": options.rtt_ms, "log_format": options.log_format},
+    }
+    for visit in visits:
+        results["outcomes"][visit["action"]] = results["outcomes"].get(visit["action"], 0) + 1
+    for phase in PHASES + ["total"]:
+        values = [v["total"] if phase == "total" else v["phases"].get(phase, 0.0) for v in visits]
+        results["phases"][phase] = {
+            "mean": statistics.mean(values) if values else 0.0,
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+        }
+    return results
+
+def print_results(results):
+    print(f"\n{'='*60}")
+    print(f"📊 Benchmark: {results['visits']} Besuche, {results['visits_per_minute']:.1f} Besuche/Minute, "
+          f"{results['round_trips_per_visit']:.1f} WebDriver-Round-Trips/Besuch")
+    print(f"   Ergebnisse: {results['outcomes']}")
+    if results.get("logging"):
+        log = results["logging"]
+        print(f"   Logging: {log['records']} Zeilen, {log['call_us']:.1f} µs/Aufruf, {log['records_per_second']:.0f} Zeilen/s bis zur Datei")
+    print(f"{'='*60}")
+    print(f"{'Phase':<22}{'mean (ms)':>12}{'p50 (ms)':>12}{'p95 (ms)':>12}")
+    for phase, values in results["phases"].items():
+        print(f"{phase:<22}{values['mean'] * 1000:>12.1f}{values['p50'] * 1000:>12.1f}{values['p95'] * 1000:>12.1f}")
+
+def compare_results(results, baseline, tolerance):
+    """
+    Returns:
+      Liste der Regressionen (leer, wenn alles innerhalb der Toleranz liegt).
+    """
+    regressions = []
+    for phase, values in baseline.get("phases", {}).items():
+        old = values.get("mean", 0.0)
+        new = results["phases"].get(phase, {}).get("mean", 0.0)
+        # Sehr kleine Phasen (< 5 ms) schwanken zu stark, um sinnvoll verglichen zu werden
+        if old > 0.005 and new > old * (1 + tolerance):
+            regressions.append(f"{phase}: {old * 1000:.1f} ms -> {new * 1000:.1f} ms")
+    old_rt = baseline.get("round_trips_per_visit", 0.0)
+    if old_rt and results["round_trips_per_visit"] > old_rt * (1 + tolerance):
+        regressions.append(f"round_trips_per_visit: {old_rt:.1f} -> {results['round_trips_per_visit']:.1f}")
+    old_lps = baseline.get("logging", {}).get("records_per_second", 0.0)
+    new_lps = results.get("logging", {}).get("records_per_second", 0.0)
+    if old_lps and new_lps and new_lps < old_lps * (1 - tolerance):
+        regressions.append(f"log records_per_second: {old_lps:.0f} -> {new_lps:.0f}")
+    old_vpm = baseline.get("visits_per_minute", 0.0)
+    if old_vpm and results["visits_per_minute"] < old_vpm * (1 - tolerance):
+        regressions.append(f"visits_per_minute: {old_vpm:.1f} -> {results['visits_per_minute']:.1f}")
+    return regressions
+
+def main():
+    options = parser.parse_args()
+    results = run_benchmark(options)
+    print_results(results)
+
+    if options.json:
+        with open(options.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if options.compare:
+        with open(options.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline, options.tolerance)
+        if regressions:
+            print("❌ Regressionen gegenüber " + options.compare + ":")
+            for line in regressions:
+                print("   -> " + line)
+            sys.exit(1)
+        print("✅ Keine Regressionen gegenüber " + options.compare + ".")
+
+if __name__ == "__main__":
+    main()